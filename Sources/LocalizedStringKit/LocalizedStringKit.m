@@ -14,6 +14,9 @@
 
 static NSMutableDictionary *bundleMap = nil;
 
+// Bundle Name: Key Lookup Function (registered at load time, then only read)
+static NSMutableDictionary<NSString *, NSValue *> *keyLookupMap = nil;
+
 #pragma mark - Public
 
 NSString *_Nonnull LSKPrimaryBundleName = @"LocalizedStringKit.bundle";
@@ -49,8 +52,14 @@ NSBundle * _Nullable getLocalizedStringKitBundle(NSString *_Nullable bundleName)
 
 + (NSString *)localizeWithValue:(NSString *_Nonnull)value comment:(NSString *_Nonnull)comment keyExtension:(NSString *_Nullable)keyExtension bundleName:(NSString *_Nullable)bundleName
 {
+  if (bundleName == nil)
+  {
+    // Default to primary strings bundle
+    bundleName = LSKPrimaryBundleName;
+  }
+
   // Key
-  NSString *key = [self keyWithValue:value keyExtension:keyExtension];
+  NSString *key = [self keyWithValue:value keyExtension:keyExtension bundleName:bundleName];
 
   // Table: This does not change between bundles
   NSString *table = @"LocalizedStringKit";
@@ -61,12 +70,6 @@ NSBundle * _Nullable getLocalizedStringKitBundle(NSString *_Nullable bundleName)
     bundleMap = [[NSMutableDictionary alloc] init];
   });
 
-  if (bundleName == nil)
-  {
-    // Default to primary strings bundle
-    bundleName = LSKPrimaryBundleName;
-  }
-
   NSBundle *bundle = [bundleMap objectForKey:bundleName];
 
   if (bundle == nil)
@@ -91,6 +94,23 @@ NSBundle * _Nullable getLocalizedStringKitBundle(NSString *_Nullable bundleName)
   return NSLocalizedStringWithDefaultValue(key, table, bundle, value, comment);
 }
 
++ (NSString *)keyWithValue:(NSString *_Nonnull)value keyExtension:(NSString *)keyExtension bundleName:(NSString *_Nonnull)bundleName
+{
+  // Look the key up in the bundle's generated key table, if it has one
+  LSKKeyLookup lookup = (LSKKeyLookup)[[keyLookupMap objectForKey:bundleName] pointerValue];
+
+  if (lookup != NULL)
+  {
+    NSString *key = lookup(value, keyExtension);
+    if (key != nil)
+    {
+      return key;
+    }
+  }
+
+  return [self keyWithValue:value keyExtension:keyExtension];
+}
+
 + (NSString *)keyWithValue:(NSString *_Nonnull)value keyExtension:(NSString *)keyExtension
 {
   // Generate the `key` which is equal to the `MD5(<value>)` or `MD5(<value>:<keyExtension>)`. This logic must stay in sync with `localize.py`.
@@ -104,7 +124,7 @@ NSBundle * _Nullable getLocalizedStringKitBundle(NSString *_Nullable bundleName)
   const char *inputCharacterArray = [hashInput UTF8String];
   unsigned char outputCharacterArray[CC_MD5_DIGEST_LENGTH];
 
-  CC_MD5(inputCharacterArray, (CC_LONG)strnlen(inputCharacterArray, sizeof inputCharacterArray), outputCharacterArray);
+  CC_MD5(inputCharacterArray, (CC_LONG)strlen(inputCharacterArray), outputCharacterArray);
 
   NSMutableString *key = [[NSMutableString alloc] init];
 
@@ -172,6 +192,15 @@ void LSKSetPrimaryBundleName(NSString *_Nonnull bundleName) {
   LSKPrimaryBundleName = bundleName;
 }
 
+void LSKRegisterKeyLookup(NSString *_Nonnull bundleName, LSKKeyLookup _Nonnull lookup) {
+  if (keyLookupMap == nil)
+  {
+    keyLookupMap = [[NSMutableDictionary alloc] init];
+  }
+
+  [keyLookupMap setObject:[NSValue valueWithPointer:(const void *)lookup] forKey:bundleName];
+}
+
 void LSKSetAlternateBundleSearchPath(NSURL *_Nonnull url) {
   LSKAlternateBundleSearchPath = url;
   [bundleMap removeAllObjects];
@@ -86,4 +86,15 @@ void LSKSetAlternateBundleSearchPath(NSURL *_Nonnull url);
 /// @param bundleName Name of bundle to search for
 NSBundle * _Nullable getLocalizedStringKitBundle(NSString *_Nullable bundleName);
 
+/// Looks up the precomputed key of a value and key extension, returning nil if it is not in the table
+typedef NSString *_Nullable (*LSKKeyLookup)(NSString *_Nonnull value, NSString *_Nullable keyExtension);
+
+/// Register a bundle's key table, so keys are looked up rather than hashed. The key table
+/// source files generated with `localizedstringkit --key-table` call this when they are loaded,
+/// which must happen before any strings are localized.
+///
+/// @param bundleName The bundle name as passed to the localization functions
+/// @param lookup The function which looks keys up in the table
+void LSKRegisterKeyLookup(NSString *_Nonnull bundleName, LSKKeyLookup _Nonnull lookup);
+
 NS_ASSUME_NONNULL_END
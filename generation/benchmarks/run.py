@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+
+"""Time the main stages of the tool against a synthetic codebase.
+
+Run from the generation folder with `python -m benchmarks.run`. The results
+are printed as a table and can be written as JSON with `--output` for
+comparison across commits.
+"""
+
+import argparse
+import dataclasses
+import functools
+import json
+import logging
+import os
+import platform
+import plistlib
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+from dotstrings import DotStringsDictEntry
+
+import localizedstringkit
+from localizedstringkit import detection
+from localizedstringkit.files import _is_ripgrep_available
+
+from benchmarks.synthetic import TreeConfig, generate_tree
+
+# pylint: enable=wrong-import-position
+
+
+def _time(function: Callable[[], Any], repeats: int, setup: Optional[Callable[[], Any]] = None):
+    """Time a function.
+
+    :param Callable[[], Any] function: The function to time
+    :param int repeats: The number of times to run it
+    :param Optional[Callable[[], Any]] setup: Run (untimed) before each repeat
+
+    :returns: The timings in seconds
+    """
+
+    timings = []
+
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeats": repeats,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the commit being benchmarked.
+
+    :returns: The commit hash, or None if it cannot be determined
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _existing_stringsdict(path: str, entries: List[DotStringsDictEntry]) -> None:
+    """Write a stringsdict file for the entries to be merged into.
+
+    :param str path: The path to write the file to
+    :param List[DotStringsDictEntry] entries: The entries the file should contain
+    """
+
+    contents = {}
+
+    for entry in entries:
+        formatted = entry.stringsdict_format()
+        for name, variable in formatted.items():
+            if isinstance(variable, dict):
+                variable.setdefault("NSStringFormatValueTypeKey", "d")
+                variable.setdefault("other", name)
+        contents[entry.key] = formatted
+
+    with open(path, "wb") as stringsdict_file:
+        plistlib.dump(contents, stringsdict_file, sort_keys=True)
+
+
+def _benchmark_discovery(root_path: str, repeats: int) -> Dict[str, Any]:
+    """Time finding the code files with each available walker.
+
+    :param str root_path: The root of the codebase
+    :param int repeats: The number of times to run each benchmark
+
+    :returns: The results keyed by benchmark name
+    """
+
+    walkers = ["python", "find"] + (["rg"] if _is_ripgrep_available() else [])
+
+    return {
+        f"discovery.{walker}": _time(
+            functools.partial(
+                localizedstringkit.localizable_files, root_path=root_path, walker=walker
+            ),
+            repeats,
+        )
+        for walker in walkers
+    }
+
+
+def _benchmark_extraction(
+    code_files: List[str], cache_directory: str, repeats: int
+) -> Dict[str, Any]:
+    """Time extracting the strings from the code files.
+
+    :param List[str] code_files: The code files to scan
+    :param str cache_directory: A scratch folder for the extraction cache
+    :param int repeats: The number of times to run each benchmark
+
+    :returns: The results keyed by benchmark name
+    """
+
+    results = {
+        "extraction.sequential": _time(
+            lambda: detection.strings_in_code_files(code_files, parallel=False), repeats
+        ),
+        "extraction.parallel": _time(
+            lambda: detection.strings_in_code_files(code_files, parallel=True), repeats
+        ),
+        "extraction.lexer_sequential": _time(
+            lambda: detection.strings_in_code_files(code_files, parallel=False, engine="lexer"),
+            repeats,
+        ),
+        "extraction.lexer_parallel": _time(
+            lambda: detection.strings_in_code_files(code_files, parallel=True, engine="lexer"),
+            repeats,
+        ),
+    }
+
+    # Fill the cache, then time runs which can use all of it
+    detection.strings_in_code_files(
+        code_files, cache=localizedstringkit.ExtractionCache(cache_directory)
+    )
+    results["extraction.cached"] = _time(
+        lambda: detection.strings_in_code_files(
+            code_files, cache=localizedstringkit.ExtractionCache(cache_directory)
+        ),
+        repeats,
+    )
+
+    return results
+
+
+def _benchmark_generation(
+    code_files: List[str], output_directory: str, repeats: int
+) -> Dict[str, Any]:
+    """Time processing the extracted strings and writing the output files.
+
+    :param List[str] code_files: The code files to scan
+    :param str output_directory: A scratch folder for the output files
+    :param int repeats: The number of times to run each benchmark
+
+    :returns: The results keyed by benchmark name
+    """
+
+    strings = detection.unique_strings_in_code_files(code_files, parallel=False)
+    extracted_strings = localizedstringkit.ExtractedStrings(strings)
+    normal_strings, plural_strings = extracted_strings.by_bundle(True)
+    all_normal_strings = [string for bundle in normal_strings.values() for string in bundle]
+    all_plural_strings = [entry for bundle in plural_strings.values() for entry in bundle]
+
+    stringsdict_path = os.path.join(output_directory, "Benchmark.stringsdict")
+    localized_string_kit_path = os.path.join(output_directory, "LocalizedStringKit")
+
+    def remove_stringsdict() -> None:
+        if os.path.exists(stringsdict_path):
+            os.remove(stringsdict_path)
+
+    def write_existing_stringsdict() -> None:
+        # Merging adds the existing data to the entries, so start from fresh ones
+        _existing_stringsdict(stringsdict_path, all_plural_strings)
+        plural_entries[:] = [
+            entry for bundle in extracted_strings.by_bundle(True)[1].values() for entry in bundle
+        ]
+
+    plural_entries: List[DotStringsDictEntry] = []
+
+    results = {
+        "strings.dedupe_and_sort": _time(
+            lambda: localizedstringkit.ExtractedStrings(strings).by_bundle(True), repeats
+        ),
+        "write.strings_file": _time(
+            lambda: localizedstringkit._write_strings_file(  # pylint: disable=protected-access
+                output_directory, all_normal_strings
+            ),
+            repeats,
+        ),
+        "write.stringsdict_create": _time(
+            lambda: localizedstringkit.create_or_merge_stringsdict_file(
+                stringsdict_path, all_plural_strings
+            ),
+            repeats,
+            setup=remove_stringsdict,
+        ),
+        "write.stringsdict_merge": _time(
+            lambda: localizedstringkit.create_or_merge_stringsdict_file(
+                stringsdict_path, plural_entries
+            ),
+            repeats,
+            setup=write_existing_stringsdict,
+        ),
+    }
+
+    localizedstringkit.generate_files(
+        localized_string_kit_path=localized_string_kit_path,
+        generate_stringsdict_files=False,
+        extracted_strings=extracted_strings,
+    )
+    results["has_changes"] = _time(
+        lambda: localizedstringkit.has_changes(
+            localized_string_kit_path=localized_string_kit_path,
+            extracted_strings=extracted_strings,
+        ),
+        repeats,
+    )
+
+    return results
+
+
+def run_benchmarks(config: TreeConfig, repeats: int) -> Dict[str, Any]:
+    """Generate a synthetic codebase and run every benchmark against it.
+
+    :param TreeConfig config: The shape of the codebase
+    :param int repeats: The number of times to run each benchmark
+
+    :returns: The benchmark results, along with details of the environment
+    """
+
+    working_directory = tempfile.mkdtemp(prefix="lsk_benchmark_")
+
+    try:
+        root_path = os.path.join(working_directory, "project")
+        code_files = sorted(generate_tree(root_path, config))
+
+        results: Dict[str, Any] = {}
+        results.update(_benchmark_discovery(root_path, repeats))
+        results.update(
+            _benchmark_extraction(code_files, os.path.join(working_directory, "cache"), repeats)
+        )
+        results.update(
+            _benchmark_generation(code_files, os.path.join(working_directory, "output"), repeats)
+        )
+    finally:
+        shutil.rmtree(working_directory)
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": dataclasses.asdict(config),
+        "results": results,
+    }
+
+
+def _parse_arguments() -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    :returns: The parsed arguments
+    """
+
+    defaults = TreeConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+
+    for field in dataclasses.fields(TreeConfig):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            dest=field.name,
+            type=type(getattr(defaults, field.name)),
+            default=getattr(defaults, field.name),
+            help=f"(default: {getattr(defaults, field.name)})",
+        )
+
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Number of times to run each benchmark"
+    )
+    parser.add_argument("--output", type=str, help="Write the results as JSON to this path")
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the benchmarks from the command line.
+
+    :returns: An exit code
+    """
+
+    args = _parse_arguments()
+    localizedstringkit.logger.get().setLevel(logging.WARNING)
+
+    config = TreeConfig(
+        **{field.name: getattr(args, field.name) for field in dataclasses.fields(TreeConfig)}
+    )
+
+    report = run_benchmarks(config, args.repeats)
+
+    for name, timings in report["results"].items():
+        print(
+            f"{name:<28} min {timings['min'] * 1000:10.2f}ms  median {timings['median'] * 1000:10.2f}ms"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
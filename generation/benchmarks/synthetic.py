@@ -0,0 +1,222 @@
+"""Generate synthetic Swift/Objective-C codebases to benchmark against."""
+
+import dataclasses
+import os
+import random
+from typing import List, Tuple
+
+
+@dataclasses.dataclass
+class TreeConfig:
+    """The shape of a synthetic codebase.
+
+    :param int files: The number of code files to generate
+    :param int strings_per_file: The number of Localized calls in each code file
+    :param float duplicate_ratio: The fraction of calls which reuse an existing value
+    :param int bundle_count: The number of bundles the strings are spread over (0 for none)
+    :param float stringsdict_ratio: The fraction of calls with plural (%#@...@) values
+    :param float objc_ratio: The fraction of code files which are Objective-C
+    :param float empty_ratio: The fraction of code files without any Localized calls
+    :param int files_per_folder: The number of code files in each folder
+    :param int seed: The random seed, so that the same config always gives the same tree
+    """
+
+    files: int = 2000
+    strings_per_file: int = 10
+    duplicate_ratio: float = 0.2
+    bundle_count: int = 3
+    stringsdict_ratio: float = 0.05
+    objc_ratio: float = 0.3
+    empty_ratio: float = 0.3
+    files_per_folder: int = 20
+    seed: int = 0
+
+
+# 2020-01-01
+_MODIFICATION_TIME = 1577836800
+
+_WORDS = (
+    "account calendar inbox message event meeting reply forward archive delete "
+    + "settings folder attachment contact search notification sync signature "
+    + "draft schedule reminder invite accept decline tentative focused other"
+).split()
+
+
+class _StringFactory:
+    """Creates the Localized calls for a tree, reusing values at the configured ratio.
+
+    :param TreeConfig config: The shape of the tree
+    :param random.Random randomizer: The source of randomness
+    """
+
+    config: TreeConfig
+    randomizer: random.Random
+    values: List[Tuple[str, str]]
+
+    def __init__(self, config: TreeConfig, randomizer: random.Random) -> None:
+        self.config = config
+        self.randomizer = randomizer
+        self.values = []
+
+    def _new_value(self) -> Tuple[str, str]:
+        """Create a value and comment which have not been used before.
+
+        :returns: The value and comment
+        """
+
+        words = self.randomizer.sample(_WORDS, 4)
+        index = len(self.values)
+
+        if self.randomizer.random() < self.config.stringsdict_ratio:
+            value = f"{words[0].title()} %#@count{index}@ {words[1]}"
+        else:
+            value = f"{words[0].title()} {words[1]} {words[2]} {index}"
+
+        return value, f"The {words[3]} label {index}."
+
+    def call(self, is_objc: bool) -> str:
+        """Create a Localized call.
+
+        :param bool is_objc: Whether the call is for an Objective-C file
+
+        :returns: The source code of the call
+        """
+
+        if self.values and self.randomizer.random() < self.config.duplicate_ratio:
+            value, comment = self.randomizer.choice(self.values)
+        else:
+            value, comment = self._new_value()
+            self.values.append((value, comment))
+
+        prefix = "@" if is_objc else ""
+
+        if self.config.bundle_count > 0:
+            bundle = f"bundle{self.randomizer.randrange(self.config.bundle_count)}"
+            return (
+                f'LocalizedWithBundle({prefix}"{value}", {prefix}"{comment}", {prefix}"{bundle}")'
+            )
+
+        return f'Localized({prefix}"{value}", {prefix}"{comment}")'
+
+
+def _swift_file(name: str, calls: List[str]) -> str:
+    """Create the contents of a Swift file.
+
+    :param str name: The name of the type in the file
+    :param List[str] calls: The Localized calls to include
+
+    :returns: The contents of the file
+    """
+
+    lines = ["import UIKit", "", f"final class {name}: UIViewController {{"]
+
+    for index, call in enumerate(calls):
+        lines.extend(
+            [
+                f"    func configureLabel{index}(_ label: UILabel) {{",
+                f"        // Configure label {index} for display",
+                f"        label.text = {call}",
+                "        label.numberOfLines = 0",
+                "    }",
+                "",
+            ]
+        )
+
+    lines.extend(["    override func viewDidLoad() {", "        super.viewDidLoad()", "    }", "}"])
+    return "\n".join(lines) + "\n"
+
+
+def _objc_file(name: str, calls: List[str]) -> str:
+    """Create the contents of an Objective-C file.
+
+    :param str name: The name of the class in the file
+    :param List[str] calls: The Localized calls to include
+
+    :returns: The contents of the file
+    """
+
+    lines = [f'#import "{name}.h"', "", f"@implementation {name}", ""]
+
+    for index, call in enumerate(calls):
+        lines.extend(
+            [
+                f"- (void)configureLabel{index}:(UILabel *)label",
+                "{",
+                f"    // Configure label {index} for display",
+                f"    label.text = {call};",
+                "    label.numberOfLines = 0;",
+                "}",
+                "",
+            ]
+        )
+
+    lines.append("@end")
+    return "\n".join(lines) + "\n"
+
+
+def _write_code_file(folder: str, name: str, is_objc: bool, calls: List[str]) -> str:
+    """Write a code file and the non-code file which accompanies it.
+
+    :param str folder: The folder to write the files to
+    :param str name: The name of the type in the file
+    :param bool is_objc: Whether to write an Objective-C file rather than a Swift one
+    :param List[str] calls: The Localized calls to include
+
+    :returns: The path of the code file
+    """
+
+    if is_objc:
+        code_file = os.path.join(folder, f"{name}.m")
+        contents = _objc_file(name, calls)
+        other_file = os.path.join(folder, f"{name}.h")
+    else:
+        code_file = os.path.join(folder, f"{name}.swift")
+        contents = _swift_file(name, calls)
+        other_file = os.path.join(folder, f"{name}.png")
+
+    with open(code_file, "w", encoding="utf-8") as output_file:
+        output_file.write(contents)
+
+    with open(other_file, "w", encoding="utf-8") as output_file:
+        output_file.write("\n")
+
+    # Date the file well outside the extraction cache's race window
+    os.utime(code_file, (_MODIFICATION_TIME, _MODIFICATION_TIME))
+
+    return code_file
+
+
+def generate_tree(root_path: str, config: TreeConfig) -> List[str]:
+    """Write a synthetic codebase to a folder.
+
+    Each code file is accompanied by a non-code file (a header or asset) so
+    that file discovery has something to filter out. The code files are all
+    given the same modification time in the past, as if they had been checked
+    out a while ago.
+
+    :param str root_path: The folder to write the codebase to
+    :param TreeConfig config: The shape of the codebase
+
+    :returns: The paths of the code files which were written
+    """
+
+    randomizer = random.Random(config.seed)
+    factory = _StringFactory(config, randomizer)
+    code_files = []
+
+    for index in range(config.files):
+        folder_index = index // config.files_per_folder
+        folder = os.path.join(
+            root_path, f"Module{folder_index % 10}", f"Feature{folder_index}", "Views"
+        )
+        os.makedirs(folder, exist_ok=True)
+
+        is_objc = randomizer.random() < config.objc_ratio
+        has_calls = randomizer.random() >= config.empty_ratio
+        calls = [factory.call(is_objc) for _ in range(config.strings_per_file if has_calls else 0)]
+
+        code_files.append(
+            _write_code_file(folder, f"Feature{folder_index}View{index}", is_objc, calls)
+        )
+
+    return code_files
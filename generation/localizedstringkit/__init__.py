@@ -1,220 +1,755 @@
 """LocalizedStringKit handling tools."""
 
-import filecmp
+import importlib
 import os
-import plistlib
 import re
-import shutil
-import tempfile
 
 from collections import defaultdict
 
-from typing import Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
-from dotstrings import stringsdict_file_path
-from dotstrings import DotStringsDictEntry, Variable
-from dotstrings import load_dict
-from dotstrings.dot_strings_entry import DotStringsEntry
-
-from localizedstringkit import detection
 from localizedstringkit import logger
-from localizedstringkit.exceptions import InvalidLocalizedCallException
-from localizedstringkit.files import localizable_files
+from localizedstringkit.exceptions import (
+    BundleGenerationException,
+    InvalidLocalizedCallException,
+    ScanTimeoutException,
+    StringsDictConflictException,
+)
+from localizedstringkit.options import (
+    ENGINES,
+    KEY_TABLE_FORMATS,
+    OUTPUT_FORMATS,
+    TIMEOUT_ACTIONS,
+    WALKERS,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from dotstrings import DotStringsDictEntry, LocalizedString
+    from dotstrings.dot_strings_entry import DotStringsEntry
+
+    from localizedstringkit import detection
+    from localizedstringkit.budget import TimeBudget
+    from localizedstringkit.cache import DigestManifest, ExtractionCache, content_digest
+    from localizedstringkit.files import (
+        filter_localizable_files,
+        iter_listed_files,
+        iter_localizable_files,
+        localizable_files,
+        write_file_atomically,
+        write_file_if_changed,
+    )
+    from localizedstringkit.incremental import git_changed_files, incremental_code_files
+    from localizedstringkit.scanner import Scanner
+    from localizedstringkit.stats import Stats
+    from localizedstringkit.stringsdict import create_or_merge_stringsdict_file
+    from localizedstringkit.tasks import BundleTask
+
+# The names exported from each module which is only imported the first time one
+# of them is used, so that a command only loads the modules it needs. Each of the
+# modules is also available as an attribute of the package.
+_LAZY_EXPORTS = {
+    "budget": ["TimeBudget"],
+    "cache": ["DigestManifest", "ExtractionCache", "content_digest"],
+    "detection": [],
+    "files": [
+        "filter_localizable_files",
+        "iter_listed_files",
+        "iter_localizable_files",
+        "localizable_files",
+        "write_file_atomically",
+        "write_file_if_changed",
+    ],
+    "formats": [],
+    "incremental": ["git_changed_files", "incremental_code_files"],
+    "key_tables": [],
+    "scanner": ["Scanner"],
+    "stats": ["Stats"],
+    "stringsdict": ["create_or_merge_stringsdict_file"],
+    "tasks": [],
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily exported name (or module) the first time it is used.
+
+    :param name: The name of the attribute
+
+    :raises AttributeError: If the package has no such attribute
+
+    :returns: The value of the attribute
+    """
+
+    if name in _LAZY_EXPORTS:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        module_name = next(
+            (module for module, names in _LAZY_EXPORTS.items() if name in names), None
+        )
+        if module_name is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+
+    # Later uses don't need to come through here
+    globals()[name] = value
+    return value
 
 
+# The rest of the package is imported by the functions which use it (see _LAZY_EXPORTS)
+# pylint: disable=import-outside-toplevel
+
 log = logger.get()
 
 
-def get_strings(code_files: List[str], generate_stringsdict_entires: bool) -> Tuple[dict, dict]:
+class ExtractedStrings:
+    """The deduplicated strings extracted from a set of code files.
+
+    Scanning the code files is by far the most expensive step, so this can be
+    created once with `extract_strings` and passed to both `has_changes` and
+    `generate_files`.
+
+    :param List[LocalizedString] localized_strings: The strings found in the code files
+    """
+
+    localized_strings: List["LocalizedString"]
+
+    def __init__(self, localized_strings: List["LocalizedString"]) -> None:
+        self.localized_strings = list(set(localized_strings))
+        self.localized_strings.sort(
+            key=lambda string: (string.key, string.key_extension, string.comment)
+        )
+
+    def by_bundle(self, generate_stringsdict_entires: bool) -> Tuple[dict, dict]:
+        """Group the strings per bundle.
+
+        A new grouping is created on each call, as writing the stringsdict
+        files merges existing data into the entries.
+
+        :param bool generate_stringsdict_entires: Whether or not to generate stringsdict entries based on regex
+
+        :returns: A tuple with first value as the bundle name to normal strings list, the second value as the bundle name to plural strings
+        """
+
+        from dotstrings import DotStringsDictEntry, Variable
+
+        stringsdict_pattern = re.compile(r"%#@(.*?)@")
+
+        normal_strings = defaultdict(list)
+        plural_strings = defaultdict(list)
+
+        for localized_string in self.localized_strings:
+            matches = stringsdict_pattern.findall(localized_string.value)
+            if not generate_stringsdict_entires or matches is None or len(matches) == 0:
+                # No match for plural pattern or not asked to generate stringsdict entries, added to normal strings
+                normal_strings[localized_string.bundle].append(localized_string)
+                continue
+
+            variables = {}
+            for match in matches:
+                variables[match] = Variable()
+
+            stringsdict_entry = DotStringsDictEntry(
+                localized_string.key, localized_string.value, variables
+            )
+            plural_strings[localized_string.bundle].append(stringsdict_entry)
+
+        return (normal_strings, plural_strings)
+
+
+def extract_strings(
+    code_files: Iterable[str],
+    cache: Optional["ExtractionCache"] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    engine: str = "regex",
+    *,
+    stats: Optional["Stats"] = None,
+    budget: Optional["TimeBudget"] = None,
+    scanner: Optional["Scanner"] = None,
+) -> ExtractedStrings:
+    """Scan the code files for localized strings.
+
+    :param code_files: The file paths to scan. This may be a lazily evaluated iterable, such as
+                       `iter_localizable_files` or `iter_listed_files`, in which case scanning
+                       starts while files are still being found or read.
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[int] max_workers: Maximum number of parallel workers (default: CPU count)
+    :param Optional[int] chunk_size: Maximum number of files sent to a worker at once
+                                     (default: automatic)
+    :param str engine: The extraction engine to use, one of `ENGINES` (default: regex)
+    :param Optional[Stats] stats: The stats to record timings and counters in
+    :param Optional[TimeBudget] budget: The time each file's scan may take, and what to do
+                                        with files which run out of time (default: unlimited)
+    :param Optional[Scanner] scanner: The scanner to scan with, reusing its worker processes.
+                                      Its own settings are used instead of `max_workers`,
+                                      `chunk_size`, `engine` and `budget`.
+
+    :returns: The deduplicated strings found in the code files
+    """
+
+    from localizedstringkit import detection
+    from localizedstringkit.stats import phase
+
+    if scanner is None:
+        localized_strings = detection.unique_strings_in_code_files(
+            code_files,
+            max_workers=max_workers,
+            cache=cache,
+            chunk_size=chunk_size,
+            engine=engine,
+            stats=stats,
+            budget=budget,
+        )
+    else:
+        localized_strings = scanner.unique_strings(code_files, cache, stats=stats)
+
+    with phase(stats, "dedup"):
+        extracted_strings = ExtractedStrings(localized_strings)
+
+    if stats is not None:
+        stats.increment("strings", len(extracted_strings.localized_strings))
+
+    return extracted_strings
+
+
+def _resolve_extracted_strings(
+    code_files: Optional[List[str]],
+    extracted_strings: Optional["ExtractedStrings"],
+    cache: Optional["ExtractionCache"],
+    scanner: Optional["Scanner"] = None,
+) -> ExtractedStrings:
+    """Get the strings to operate on, scanning the code files if they were not already scanned.
+
+    :param Optional[List[str]] code_files: The list of file paths to scan
+    :param Optional[ExtractedStrings] extracted_strings: The result of a previous scan
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[Scanner] scanner: The scanner to scan the code files with
+
+    :raises ValueError: If neither or both of code_files and extracted_strings are set
+
+    :returns: The extracted strings
+    """
+
+    if (code_files is None) == (extracted_strings is None):
+        raise ValueError("Exactly one of code_files or extracted_strings should be set")
+
+    if extracted_strings is not None:
+        return extracted_strings
+
+    assert code_files is not None
+    return extract_strings(code_files, cache, scanner=scanner)
+
+
+def get_strings(
+    code_files: List[str],
+    generate_stringsdict_entires: bool,
+    cache: Optional["ExtractionCache"] = None,
+    scanner: Optional["Scanner"] = None,
+) -> Tuple[dict, dict]:
     """Scan and get strings per bundle.
 
     :param code_files: The list of file paths to generate the code strings for
     :param bool generate_stringsdict_entires: Whether or not to generate stringsdict entries based on regex
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[Scanner] scanner: The scanner to scan with, reusing its worker processes
 
     :returns: A tuple with first value as the bundle name to normal strings list, the second value as the bundle name to plural strings
     """
 
-    # Get & dedupe localized strings
-    localized_strings = detection.strings_in_code_files(code_files)
-    localized_strings = list(set(localized_strings))
-    localized_strings.sort(key=lambda string: (string.key, string.key_extension, string.comment))
+    return extract_strings(code_files, cache, scanner=scanner).by_bundle(
+        generate_stringsdict_entires
+    )
 
-    stringsdict_pattern = re.compile(r"%#@(.*?)@")
 
-    normal_strings = defaultdict(list)
-    plural_strings = defaultdict(list)
+def _write_temporary_source_files(normal_strings_by_bundle: dict) -> dict:
+    """Write a temporary code file with all strings for each bundle.
 
-    for localized_string in localized_strings:
-        matches = stringsdict_pattern.findall(localized_string.value)
-        if not generate_stringsdict_entires or matches is None or len(matches) == 0:
-            # No match for plural pattern or not asked to generate stringsdict entries, added to normal strings
-            normal_strings[localized_string.bundle].append(localized_string)
-            continue
+    :param dict normal_strings_by_bundle: The bundle name to normal strings list
+
+    :returns: The bundle name to the path to its temporary source code file
+    """
 
-        variables = {}
-        for match in matches:
-            variables[match] = Variable()
+    import tempfile
 
-        stringsdict_entry = DotStringsDictEntry(
-            localized_string.key, localized_string.value, variables
-        )
-        plural_strings[localized_string.bundle].append(stringsdict_entry)
+    output_paths: dict = {}
 
-    return (normal_strings, plural_strings)
+    for bundle, strings in normal_strings_by_bundle.items():
+        # Create the file securely, rather than picking a name another process could take first
+        file_descriptor, path = tempfile.mkstemp(suffix=".m")
+        output_paths[bundle] = path
+        log.debug(f"Writing temporary source file at {path} for bundle {bundle}")
+
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as temporary_source_file:
+            if strings is not None:
+                for localized_string in strings:
+                    temporary_source_file.write(localized_string.ns_localized_format())
+                    temporary_source_file.write("\n")
+
+    return output_paths
 
 
 def generate_code_strings_file(
-    code_files: List[str], generate_stringsdict_entires: bool
+    code_files: List[str],
+    generate_stringsdict_entires: bool,
+    cache: Optional["ExtractionCache"] = None,
 ) -> Tuple[dict, dict]:
     """Generate a single code file with all strings per bundle.
 
     :param code_files: The list of file paths to generate the code strings for
     :param bool generate_stringsdict_entires: Whether or not to generate stringsdict entries based on regex
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
 
     :returns: A tuple with first as the bundle name to the path to the temporary source code file with the standard NSLocalizedString, the second as the bundle name to plural strings
     """
 
     normal_strings_by_bundle, plural_strings_by_bundle = get_strings(
-        code_files, generate_stringsdict_entires
+        code_files, generate_stringsdict_entires, cache
     )
 
-    strings_bundles = normal_strings_by_bundle.keys()
+    return (_write_temporary_source_files(normal_strings_by_bundle), plural_strings_by_bundle)
 
-    # Create output bundle and path dictionary for each unique bundle
-    output_paths: dict = {}
-    for bundle in strings_bundles:
-        output_paths[bundle] = tempfile.mktemp(suffix=".m")
 
-    for bundle, path in output_paths.items():
-        log.debug(f"Writing temporary source file at {path} for bundle {bundle}")
+def _bundle_directory_name(bundle_name: str) -> str:
+    """Get the name of the directory a bundle's files are written to.
 
-        with open(path, "w", encoding="utf-8") as temporary_source_file:
-            strings: List = normal_strings_by_bundle[bundle]
-            if strings is not None:
-                for localized_string in strings:
-                    temporary_source_file.write(localized_string.ns_localized_format())
-                    temporary_source_file.write("\n")
+    :param str bundle_name: The bundle name used in code, with or without the .bundle suffix
+
+    :returns: The bundle directory name
+    """
+
+    if ".bundle" not in bundle_name:
+        return bundle_name + ".bundle"
+
+    return bundle_name
+
+
+def _source_strings_file_name(bundle_name: str) -> str:
+    """Get the name of the file used to track a bundle's strings.
+
+    :param str bundle_name: The bundle name used in code, with or without the .bundle suffix
+
+    :returns: The name of the tracking source file
+    """
+
+    return _bundle_directory_name(bundle_name).replace(".bundle", ".m")
+
+
+def _key_table_file_name(bundle_name: str) -> str:
+    """Get the name of the generated key table source file of a bundle.
+
+    :param str bundle_name: The bundle name used in code, with or without the .bundle suffix
+
+    :returns: The name of the key table source file
+    """
+
+    return _bundle_directory_name(bundle_name).replace(".bundle", "Keys.m")
+
+
+def _check_key_table_file_names(bundle_names: Iterable[str]) -> None:
+    """Check that no two bundles would have their key tables generated in the same file.
+
+    The library registers each table under the bundle name used in code, so a
+    bundle referred to both with and without the .bundle suffix needs a table
+    for each, but both would be generated in the same file.
+
+    :param Iterable[str] bundle_names: The bundle names used in code
+
+    :raises ValueError: If two bundle names have the same key table file
+    """
+
+    bundle_names_by_file: Dict[str, str] = {}
+
+    for bundle_name in bundle_names:
+        file_name = _key_table_file_name(bundle_name)
+        other_bundle_name = bundle_names_by_file.setdefault(file_name, bundle_name)
+        if other_bundle_name != bundle_name:
+            raise ValueError(
+                f"The key tables of the {other_bundle_name} and {bundle_name} bundles would both "
+                + f"be generated in {file_name}. Refer to the bundle by the same name everywhere."
+            )
 
-    return (output_paths, plural_strings_by_bundle)
 
+def _source_strings_contents(strings: List["LocalizedString"]) -> bytes:
+    """Render the tracking source file for a bundle.
 
-def create_or_merge_stringsdict_file(
-    existing_stringsdict_path: str, entries: List[DotStringsDictEntry]
-):
-    """Create (if not exists) or merge the local .stringsdict file with entries given.
+    The tracking file contains an NSLocalizedString call for every string in
+    the bundle so that changes between successive runs can be detected.
 
-    :param str existing_stringsdict_path: Path to the existing .stringsdict file to merge.
-                                          Will be created if not exists.
-    :param List[DotStringsDictEntry] entries: The list of .stringsdict entries to write.
+    :param List[LocalizedString] strings: The bundle's strings
 
-    :raises Exception: If the .stringsdict files has contradicting values/variables with entries
+    :returns: The contents of the tracking source file
     """
-    existing_entries = []
-
-    # Check if .stringsdict for given bundle exists
-    if os.path.exists(existing_stringsdict_path):
-        existing_entries = load_dict(existing_stringsdict_path)
-
-    results = {}
-    for entry in entries:
-        existing_entry = next(
-            (
-                potential_entry
-                for potential_entry in existing_entries
-                if potential_entry.key == entry.key
-            ),
-            None,
+
+    return "".join(
+        localized_string.ns_localized_format() + "\n" for localized_string in strings
+    ).encode("utf-8")
+
+
+def _generate_bundle(
+    localized_string_kit_path: str,
+    bundle_name: str,
+    strings: list,
+    output_format: str = "text",
+    key_table_format: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """Write the .strings files and the tracking code file for a bundle.
+
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param str bundle_name: The name of the bundle
+    :param list strings: The LocalizedString objects in the bundle
+    :param str output_format: The format to write the .strings files in
+    :param Optional[str] key_table_format: The form to write the key table source file in, if
+                                           one is generated
+
+    :returns: The digest of the tracking code file, and whether any file was written
+    """
+
+    from localizedstringkit.cache import content_digest
+    from localizedstringkit.files import write_file_if_changed
+
+    # Write .strings file directly from LocalizedString objects
+    written = _write_strings_file(
+        output_directory=os.path.join(
+            localized_string_kit_path, _bundle_directory_name(bundle_name)
+        ),
+        strings=strings,
+        output_format=output_format,
+    )
+
+    # We need to track the code file as well so that we can tell if things
+    # have changed or not between successive runs. It is the same whatever the
+    # output format, so switching formats doesn't count as a change.
+    source_code = _source_strings_contents(strings)
+    written |= write_file_if_changed(
+        os.path.join(localized_string_kit_path, _source_strings_file_name(bundle_name)),
+        source_code,
+    )
+
+    if key_table_format is not None:
+        from localizedstringkit.key_tables import bundle_key_table
+
+        written |= write_file_if_changed(
+            os.path.join(localized_string_kit_path, _key_table_file_name(bundle_name)),
+            bundle_key_table(bundle_name, strings, key_table_format),
         )
-        if existing_entry is not None:
-            sorted_variables_for_existing_entry = sorted(existing_entry.variables.keys())
-            sorted_variables_for_entry = sorted(entry.variables.keys())
 
-            if existing_entry.value != entry.value:
-                raise Exception("value names are inconsistent")
-            if sorted_variables_for_entry != sorted_variables_for_existing_entry:
-                raise Exception("variables names are inconsistent")
+    return content_digest(source_code), written
+
 
-            entry.merge(existing_entry)
-        results[entry.key] = entry.stringsdict_format()
+def _generate_stringsdict_bundle(
+    localized_string_kit_path: str,
+    bundle_name: str,
+    entries: List["DotStringsDictEntry"],
+    output_format: str = "text",
+) -> bool:
+    """Create or merge the .stringsdict file for a bundle.
 
-    with open(existing_stringsdict_path, "wb") as stringsdict_file:
-        plistlib.dump(results, stringsdict_file, sort_keys=True)
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param str bundle_name: The name of the bundle
+    :param List[DotStringsDictEntry] entries: The .stringsdict entries in the bundle
+    :param str output_format: The format to write the .stringsdict file in
 
+    :returns: True if the file was written, False if it was already up to date
+    """
 
-def generate_files(
+    from dotstrings import stringsdict_file_path
+
+    from localizedstringkit.stringsdict import create_or_merge_stringsdict_file
+
+    # Default path is en.lproj/LocalizedStringKit.stringsdict
+    file_path = stringsdict_file_path(
+        os.path.join(localized_string_kit_path, _bundle_directory_name(bundle_name)),
+        "en",
+        "LocalizedStringKit",
+    )
+
+    return create_or_merge_stringsdict_file(file_path, entries, output_format)
+
+
+def _record_bundle_stats(
+    stats: "Stats",
+    tasks: List["BundleTask"],
+    timed_results: List[Any],
+) -> List[Any]:
+    """Record the time taken by and the outcome of each bundle's generation.
+
+    :param Stats stats: The stats to record in
+    :param tasks: The description, function and arguments of each task
+    :param timed_results: The result of `timed_call` for each task (None for those which failed)
+
+    :returns: The result of each task (None for those which failed)
+    """
+
+    results: List[Any] = []
+
+    for (_, function, arguments), timed_result in zip(tasks, timed_results):
+        is_bundle = function is _generate_bundle
+        counter_prefix = "bundles" if is_bundle else "stringsdict"
+
+        if timed_result is None:
+            stats.increment(f"{counter_prefix}_failed")
+            results.append(None)
+            continue
+
+        result, wall, cpu = timed_result
+        phase_name = "write" if is_bundle else "stringsdict"
+        stats.add_time(f"{phase_name}:{_bundle_directory_name(arguments[1])}", wall, cpu)
+
+        written = result[1] if is_bundle else result
+        stats.increment(f"{counter_prefix}_written" if written else f"{counter_prefix}_skipped")
+        results.append(result)
+
+    return results
+
+
+def _record_digests(
+    digest_manifest: "DigestManifest",
+    localized_string_kit_path: str,
+    tasks: List["BundleTask"],
+    results: List[Any],
+) -> None:
+    """Record the digests of the tracking files written by the generation tasks.
+
+    :param DigestManifest digest_manifest: The manifest to record the digests in
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param tasks: The description, function and arguments of each task
+    :param results: The result of each task (None for those which failed)
+    """
+
+    for (_, function, arguments), result in zip(tasks, results):
+        if function is _generate_bundle and result is not None:
+            digest_manifest.record(
+                os.path.join(localized_string_kit_path, _source_strings_file_name(arguments[1])),
+                result[0],
+            )
+
+    digest_manifest.save()
+
+
+def _run_bundle_tasks(
+    tasks: List["BundleTask"],
+    executor: Optional["Executor"],
+    stats: Optional["Stats"],
+) -> Tuple[List[Any], Dict[str, BaseException]]:
+    """Run the generation task for each bundle, timing them if stats are being collected.
+
+    :param tasks: The description, function and arguments of each task
+    :param Optional[Executor] executor: The executor to run the tasks on, or None
+                                        to use a thread pool
+    :param Optional[Stats] stats: The stats to record each task in
+
+    :returns: The result of each task and the error of each failed task (see `tasks.run_for_bundles`)
+    """
+
+    from localizedstringkit.stats import timed_call
+    from localizedstringkit.tasks import run_for_bundles
+
+    if stats is None:
+        return run_for_bundles(tasks, executor)
+
+    # Time each task wherever it runs
+    timed_results, failures = run_for_bundles(
+        [
+            (description, timed_call, (function, *arguments))
+            for description, function, arguments in tasks
+        ],
+        executor,
+    )
+    return _record_bundle_stats(stats, tasks, timed_results), failures
+
+
+def generate_files(  # pylint: disable=too-many-arguments,too-many-locals
     *,
-    code_files: List[str],
+    code_files: Optional[List[str]] = None,
     localized_string_kit_path: str,
     generate_stringsdict_files: bool,
+    cache: Optional["ExtractionCache"] = None,
+    extracted_strings: Optional["ExtractedStrings"] = None,
+    digest_manifest: Optional["DigestManifest"] = None,
+    executor: Optional["Executor"] = None,
+    stats: Optional["Stats"] = None,
+    output_format: str = "text",
+    key_table_format: Optional[str] = None,
+    scanner: Optional["Scanner"] = None,
 ) -> None:
     """Run the localization substitution process.
 
-    :param List[str] code_files: The list of file paths to generate the .strings
-                                  and .stringsdict for.
+    The output for each bundle is generated concurrently.
+
+    :param Optional[List[str]] code_files: The list of file paths to generate the
+                                            .strings and .stringsdict for. _Note:_
+                                            Only this OR `extracted_strings` should
+                                            be set.
     :param str localized_string_kit_path: Path to the LocalizedStringsKit
                                            folder which contains the strings
                                            bundle and other library data.
     :param bool generate_stringsdict_files: Whether or not to generate stringsdict files.
-
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[ExtractedStrings] extracted_strings: The result of a previous scan to
+                                                         generate from instead of scanning
+                                                         `code_files`.
+    :param Optional[DigestManifest] digest_manifest: The manifest to record the digests of the
+                                                     written tracking files in.
+    :param Optional[Executor] executor: The executor to generate the bundles on. Defaults to
+                                        a thread pool, which suits the mostly I/O bound
+                                        writes. Pass a `ProcessPoolExecutor` when formatting
+                                        very large bundles dominates.
+    :param Optional[Stats] stats: The stats to record the time taken by each bundle, and
+                                  whether it was written, in.
+    :param str output_format: The format to write the .strings and .stringsdict files in, one
+                              of `OUTPUT_FORMATS` (default: text). Binary tables are smaller
+                              and faster to load, but leave out the comments. The tracking
+                              files are the same in every format, so `has_changes` doesn't
+                              report a switch of format.
+    :param Optional[str] key_table_format: The form of key table source file to generate for
+                                           each bundle, one of `KEY_TABLE_FORMATS`, so the
+                                           library can look keys up rather than hashing them
+                                           (default: none).
+    :param Optional[Scanner] scanner: The scanner to scan `code_files` with, reusing its
+                                      worker processes.
+
+    :raises ValueError: If the output or key table format is unknown
+    :raises BundleGenerationException: If any bundle could not be generated. Every other
+                                       bundle is still generated.
     :raises Exception: If we can't generate the .strings/.stringdict files
     """
 
+    from localizedstringkit.formats import check_output_format
+    from localizedstringkit.key_tables import check_key_table_format
+
+    check_output_format(output_format)
+    if key_table_format is not None:
+        check_key_table_format(key_table_format)
+
+    # Every file is only replaced (atomically) if its contents change, so
+    # regenerating unchanged bundles does not invalidate downstream builds.
+
     if generate_stringsdict_files:
         log.info("Generating LocalizedStringKit.strings and LocalizedStringKit.stringsdict...")
     else:
         log.info("Generating LocalizedStringKit.strings...")
 
     # Extract strings from code files
-    normal_strings_by_bundle, stringsdict_by_bundle = get_strings(
-        code_files, generate_stringsdict_files
+    normal_strings_by_bundle, stringsdict_by_bundle = _resolve_extracted_strings(
+        code_files, extracted_strings, cache, scanner
+    ).by_bundle(generate_stringsdict_files)
+
+    if key_table_format is not None:
+        _check_key_table_file_names(normal_strings_by_bundle)
+
+    tasks: List[BundleTask] = [
+        (
+            _bundle_directory_name(bundle_name),
+            _generate_bundle,
+            (localized_string_kit_path, bundle_name, strings, output_format, key_table_format),
+        )
+        for bundle_name, strings in normal_strings_by_bundle.items()
+    ]
+    tasks.extend(
+        (
+            f"{_bundle_directory_name(bundle_name)} stringsdict",
+            _generate_stringsdict_bundle,
+            (localized_string_kit_path, bundle_name, entries, output_format),
+        )
+        for bundle_name, entries in stringsdict_by_bundle.items()
     )
 
-    # Write .strings files directly for each bundle
-    for bundle_name, strings in normal_strings_by_bundle.items():
-        name = bundle_name
-        if ".bundle" not in name:
-            name = bundle_name + ".bundle"
+    results, failures = _run_bundle_tasks(tasks, executor, stats)
 
-        # Write .strings file directly from LocalizedString objects
-        _write_strings_file(
-            output_directory=os.path.join(localized_string_kit_path, name),
-            strings=strings,
-        )
+    if digest_manifest is not None:
+        # Record whatever was written, even if another bundle failed
+        _record_digests(digest_manifest, localized_string_kit_path, tasks, results)
 
-        # We need to track the code file as well so that we can tell if things
-        # have changed or not between successive runs
-        m_file_name = name.replace(".bundle", ".m")
-        source_code_file_path = os.path.join(localized_string_kit_path, m_file_name)
-        # Write the temporary .m file with NSLocalizedString calls for tracking
-        with open(source_code_file_path, "w", encoding="utf-8") as temporary_source_file:
-            for localized_string in strings:
-                temporary_source_file.write(localized_string.ns_localized_format())
-                temporary_source_file.write("\n")
-
-    for bundle_name, stringsdict_entries in stringsdict_by_bundle.items():
-        name = bundle_name
-        if ".bundle" not in name:
-            name = bundle_name + ".bundle"
-
-        # Default path is en.lproj/LocalizedStringKit.stringsdict
-        file_path = stringsdict_file_path(
-            os.path.join(localized_string_kit_path, name), "en", "LocalizedStringKit"
-        )
-
-        create_or_merge_stringsdict_file(file_path, stringsdict_entries)
+    if failures:
+        raise BundleGenerationException(failures)
 
     # Success
     log.info("Generation complete")
 
 
-def _write_strings_file(output_directory: str, strings: List[Any]) -> None:
+def _merged_entries(strings: List[Any]) -> Dict[str, "DotStringsEntry"]:
+    """Deduplicate a table's strings by key, merging their comments.
+
+    :param List[LocalizedString] strings: The strings in the table
+
+    :returns: The entry of each key
+    """
+
+    from dotstrings.dot_strings_entry import DotStringsEntry
+
+    # Deduplicate by key and merge comments
+    # Use a dictionary to track entries by key
+    entries_by_key: Dict[str, DotStringsEntry] = {}
+    for localized_string in strings:
+        key = localized_string.key
+
+        if key not in entries_by_key:
+            # First occurrence of this key
+            comments = []
+            if localized_string.comment:
+                comments = [localized_string.comment]
+
+            entries_by_key[key] = DotStringsEntry(
+                key=key,
+                value=localized_string.value,
+                comments=comments,
+            )
+        else:
+            # Key already exists, merge comments
+            existing_entry = entries_by_key[key]
+            if localized_string.comment and localized_string.comment not in existing_entry.comments:
+                existing_entry.comments.append(localized_string.comment)
+
+    return entries_by_key
+
+
+def _strings_table_contents(strings: List[Any], output_format: str) -> bytes:
+    """Render a .strings table.
+
+    :param List[LocalizedString] strings: The strings in the table
+    :param str output_format: The format to render in, one of `OUTPUT_FORMATS`
+
+    :returns: The contents of the .strings file
+    """
+
+    from localizedstringkit.formats import binary_strings_contents
+
+    entries_by_key = _merged_entries(strings)
+
+    if output_format == "binary":
+        return binary_strings_contents({key: entry.value for key, entry in entries_by_key.items()})
+
+    # Render in sorted order by key
+    contents = []
+    for key in sorted(entries_by_key.keys()):
+        entry = entries_by_key[key]
+        # Sort comments alphabetically
+        entry.comments.sort(key=str.lower)
+        contents.append(entry.strings_format())
+        contents.append("\n\n")
+
+    return "".join(contents).encode("utf-8")
+
+
+def _write_strings_file(
+    output_directory: str, strings: List[Any], output_format: str = "text"
+) -> bool:
     """Write a .strings file directly from LocalizedString objects.
 
+    Files whose contents would not change are left untouched.
+
     :param str output_directory: The directory to write the .strings file to (will contain en.lproj)
     :param List[LocalizedString] strings: The list of LocalizedString objects to write
+    :param str output_format: The format to write the file in, one of `OUTPUT_FORMATS`
 
     :raises Exception: If we can't write the .strings file
+
+    :returns: True if any file was written, False if they were all already up to date
     """
+
+    from localizedstringkit.files import write_file_if_changed
+
     # Create output directory
     english_strings_directory = os.path.join(output_directory, "en.lproj")
     os.makedirs(english_strings_directory, exist_ok=True)
@@ -224,44 +759,16 @@ def _write_strings_file(output_directory: str, strings: List[Any]) -> None:
     for localized_string in strings:
         strings_by_table[localized_string.table].append(localized_string)
 
-    # Write each table to its own .strings file
+    written = False
+
+    # Write each table to its own .strings file, only replacing it if it differs
     for table, table_strings in strings_by_table.items():
-        output_path = os.path.join(english_strings_directory, f"{table}.strings")
-
-        # Deduplicate by key and merge comments
-        # Use a dictionary to track entries by key
-        entries_by_key = {}
-        for localized_string in table_strings:
-            key = localized_string.key
-
-            if key not in entries_by_key:
-                # First occurrence of this key
-                comments = []
-                if localized_string.comment:
-                    comments = [localized_string.comment]
-
-                entries_by_key[key] = DotStringsEntry(
-                    key=key,
-                    value=localized_string.value,
-                    comments=comments,
-                )
-            else:
-                # Key already exists, merge comments
-                existing_entry = entries_by_key[key]
-                if (
-                    localized_string.comment
-                    and localized_string.comment not in existing_entry.comments
-                ):
-                    existing_entry.comments.append(localized_string.comment)
-
-        # Write to file in sorted order by key
-        with open(output_path, "w", encoding="utf-8") as strings_file:
-            for key in sorted(entries_by_key.keys()):
-                entry = entries_by_key[key]
-                # Sort comments alphabetically
-                entry.comments.sort(key=str.lower)
-                strings_file.write(entry.strings_format())
-                strings_file.write("\n\n")
+        written |= write_file_if_changed(
+            os.path.join(english_strings_directory, f"{table}.strings"),
+            _strings_table_contents(table_strings, output_format),
+        )
+
+    return written
 
 
 def generate_dot_strings_files(*, code_files: List[str], localized_string_kit_path: str) -> None:
@@ -295,12 +802,14 @@ def has_strings_dict_changes(localized_string_kit_path: str, stringsdict_by_bund
 
     :returns: True if there are changes, False otherwise
     """
+
+    from dotstrings import load_dict, stringsdict_file_path
+
     for bundle_name, entries in stringsdict_by_bundle.items():
-        name = bundle_name
-        if ".bundle" not in name:
-            name = bundle_name + ".bundle"
         existing_stringsdict_path = stringsdict_file_path(
-            os.path.join(localized_string_kit_path, name), "en", "LocalizedStringKit"
+            os.path.join(localized_string_kit_path, _bundle_directory_name(bundle_name)),
+            "en",
+            "LocalizedStringKit",
         )
 
         # Check if .stringsdict for given bundle exists
@@ -335,49 +844,145 @@ def has_strings_dict_changes(localized_string_kit_path: str, stringsdict_by_bund
     return False
 
 
-def has_changes(
+def has_changes(  # pylint: disable=too-many-arguments
     *,
     localized_string_kit_path: str,
-    code_files: List[str],
+    code_files: Optional[List[str]] = None,
     including_stringsdict_files=False,
+    cache: Optional["ExtractionCache"] = None,
+    extracted_strings: Optional["ExtractedStrings"] = None,
+    digest_manifest: Optional["DigestManifest"] = None,
+    stats: Optional["Stats"] = None,
+    key_table_format: Optional[str] = None,
+    scanner: Optional["Scanner"] = None,
 ) -> bool:
     """Check if there are outstanding LocalizedStringKit changes.
 
     :param str localized_string_kit_path: Path to the LocalizedStringsKit
                                           folder which contains the strings
                                           bundle and other library data.
-    :param List[str] code_files: The list of file paths to check for changes to.
+    :param Optional[List[str]] code_files: The list of file paths to check for changes
+                                            to. _Note:_ Only this OR
+                                            `extracted_strings` should be set.
     :param bool including_stringsdict_files: Whether or not to check stringsdict
                                              changes as well
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[ExtractedStrings] extracted_strings: The result of a previous scan to
+                                                         check instead of scanning
+                                                         `code_files`.
+    :param Optional[DigestManifest] digest_manifest: The manifest of stored digests of the
+                                                     tracking files, to avoid reading them.
+    :param Optional[Stats] stats: The stats to time the check in. Any scan of `code_files`
+                                  is not included.
+    :param Optional[str] key_table_format: The form of the key table source files, if they
+                                           are generated. Any which are missing or out of
+                                           date count as changes.
+    :param Optional[Scanner] scanner: The scanner to scan `code_files` with, reusing its
+                                      worker processes.
+
+    :raises ValueError: If the key table format is unknown
 
     :returns: True if there are changes, False otherwise
     """
 
+    from localizedstringkit.key_tables import check_key_table_format
+    from localizedstringkit.stats import phase
+
+    if key_table_format is not None:
+        check_key_table_format(key_table_format)
+
     log.info("Determining if localization needs run")
 
-    # Generate current code file paths; Dict of bundle: output_path
-    current_strings_paths, stringsdict_by_bundle = generate_code_strings_file(
-        code_files, including_stringsdict_files
-    )
+    resolved_strings = _resolve_extracted_strings(code_files, extracted_strings, cache, scanner)
 
-    for bundle, path in current_strings_paths.items():
-        m_file = bundle.replace(".bundle", ".m")
-        if not m_file:
-            # Localized calls with empty bundle get defaulted to this source file names
-            m_file = "source_strings.m"
+    with phase(stats, "check"):
+        return _has_changes(
+            localized_string_kit_path,
+            resolved_strings,
+            including_stringsdict_files,
+            digest_manifest,
+            key_table_format,
+        )
 
-        existing_strings_path = os.path.join(localized_string_kit_path, m_file)
 
-        # Check if .m for given bundle exists
-        if not os.path.exists(existing_strings_path):
-            return True
+def _key_table_changed(
+    localized_string_kit_path: str,
+    bundle_name: str,
+    strings: List["LocalizedString"],
+    key_table_format: str,
+) -> bool:
+    """Check if a bundle's key table source file is missing or out of date.
+
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param str bundle_name: The name of the bundle
+    :param List[LocalizedString] strings: The bundle's strings
+    :param str key_table_format: The form of the key table
+
+    :returns: True if the key table needs generating, False otherwise
+    """
+
+    from localizedstringkit.key_tables import bundle_key_table
+
+    try:
+        with open(
+            os.path.join(localized_string_kit_path, _key_table_file_name(bundle_name)), "rb"
+        ) as key_table_file:
+            existing_contents = key_table_file.read()
+    except FileNotFoundError:
+        return True
+
+    return existing_contents != bundle_key_table(bundle_name, strings, key_table_format)
+
+
+def _has_changes(
+    localized_string_kit_path: str,
+    extracted_strings: "ExtractedStrings",
+    including_stringsdict_files: bool,
+    digest_manifest: Optional["DigestManifest"],
+    key_table_format: Optional[str] = None,
+) -> bool:
+    """Check if the generated files are out of date with the extracted strings.
 
-        files_differ = not filecmp.cmp(existing_strings_path, path)
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param ExtractedStrings extracted_strings: The strings to check against
+    :param bool including_stringsdict_files: Whether or not to check stringsdict changes as well
+    :param Optional[DigestManifest] digest_manifest: The manifest of stored digests of the
+                                                     tracking files, to avoid reading them.
+    :param Optional[str] key_table_format: The form of the key table source files, if they
+                                           are generated
 
-        if os.path.exists(path):
-            os.remove(path)
+    :returns: True if there are changes, False otherwise
+    """
+
+    from localizedstringkit.cache import content_digest
+
+    normal_strings_by_bundle, stringsdict_by_bundle = extracted_strings.by_bundle(
+        including_stringsdict_files
+    )
+
+    if key_table_format is not None:
+        _check_key_table_file_names(normal_strings_by_bundle)
+
+    for bundle, strings in normal_strings_by_bundle.items():
+        existing_strings_path = os.path.join(
+            localized_string_kit_path, _source_strings_file_name(bundle)
+        )
+
+        if digest_manifest is not None:
+            existing_digest = digest_manifest.digest(existing_strings_path)
+        elif os.path.exists(existing_strings_path):
+            with open(existing_strings_path, "rb") as existing_strings_file:
+                existing_digest = content_digest(existing_strings_file.read())
+        else:
+            existing_digest = None
+
+        # Check if .m for given bundle exists and matches the current strings
+        if existing_digest != content_digest(_source_strings_contents(strings)):
+            return True
 
-        if files_differ:
+        if key_table_format is not None and _key_table_changed(
+            localized_string_kit_path, bundle, strings, key_table_format
+        ):
             return True
 
     if not including_stringsdict_files:
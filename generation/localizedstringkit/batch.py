@@ -0,0 +1,246 @@
+"""Extracting the strings of several targets which share code, in one run.
+
+A monorepo with several apps and extensions would otherwise run the tool
+once per target, searching and scanning any shared code once for each. A
+batch searches each distinct root once and scans every file it finds once,
+then gives each target the strings of its own files to check or generate.
+
+Targets are described in a JSON or TOML config file:
+
+    [[targets]]
+    name = "App"
+    roots = ["App", "Frameworks/Shared"]
+    localized_string_kit_path = "App/LocalizedStringKit"
+    exclude = ["Frameworks/Shared/Tests"]
+    exclude_patterns = ["*Tests.swift"]
+
+Paths are relative to the config file. `exclude` and `exclude_patterns` are
+optional.
+"""
+
+import json
+import os
+import tomllib
+from typing import Any, Dict, List, Optional, Tuple
+
+import localizedstringkit
+from localizedstringkit import detection
+from localizedstringkit import logger
+from localizedstringkit.stats import phase
+
+log = logger.get()
+
+# The settings of a target in the config, and whether each is required
+_TARGET_KEYS = {
+    "name": True,
+    "roots": True,
+    "localized_string_kit_path": True,
+    "exclude": False,
+    "exclude_patterns": False,
+}
+
+
+class BatchTarget:
+    """A target of a batch, whose strings are extracted from the code files under its roots.
+
+    :param str name: The name of the target, used in logs
+    :param List[str] roots: The paths to search for code files from
+    :param str localized_string_kit_path: Path to the target's LocalizedStringsKit folder
+    :param Optional[List[str]] excluded_folders: The paths to any folders to exclude
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of paths to exclude,
+                                                  relative to each root
+    """
+
+    name: str
+    roots: List[str]
+    localized_string_kit_path: str
+    excluded_folders: List[str]
+    excluded_patterns: List[str]
+
+    def __init__(
+        self,
+        name: str,
+        roots: List[str],
+        localized_string_kit_path: str,
+        excluded_folders: Optional[List[str]] = None,
+        excluded_patterns: Optional[List[str]] = None,
+    ) -> None:
+        self.name = name
+        self.roots = roots
+        self.localized_string_kit_path = localized_string_kit_path
+        self.excluded_folders = excluded_folders or []
+        self.excluded_patterns = excluded_patterns or []
+
+
+def _string_list(target: Dict[str, Any], key: str) -> List[str]:
+    """Get a setting of a target which is a list of strings.
+
+    :param target: The target's entry in the config
+    :param key: The name of the setting
+
+    :raises ValueError: If the setting is not a list of strings
+
+    :returns: The list, which is empty if the setting is not set
+    """
+
+    value = target.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"The {key} of target {target.get('name')} must be a list of strings")
+
+    return value
+
+
+def _parse_target(target: Any, base_path: str) -> BatchTarget:
+    """Create a target from its entry in the config.
+
+    :param target: The target's entry in the config
+    :param base_path: The path relative paths are relative to
+
+    :raises ValueError: If the entry is invalid
+
+    :returns: The target
+    """
+
+    if not isinstance(target, dict):
+        raise ValueError("Each target must be a table or object")
+
+    unknown_keys = sorted(set(target) - set(_TARGET_KEYS))
+    missing_keys = [key for key, required in _TARGET_KEYS.items() if required and key not in target]
+    if unknown_keys or missing_keys:
+        raise ValueError(
+            f"Target {target.get('name')} has unknown settings {unknown_keys} "
+            + f"or is missing settings {missing_keys}"
+        )
+
+    if not isinstance(target["name"], str) or not isinstance(
+        target["localized_string_kit_path"], str
+    ):
+        raise ValueError("The name and localized_string_kit_path of a target must be strings")
+
+    roots = _string_list(target, "roots")
+    if not roots:
+        raise ValueError(f"Target {target['name']} has no roots")
+
+    return BatchTarget(
+        target["name"],
+        [os.path.normpath(os.path.join(base_path, root)) for root in roots],
+        os.path.normpath(os.path.join(base_path, target["localized_string_kit_path"])),
+        excluded_folders=[
+            os.path.normpath(os.path.join(base_path, folder))
+            for folder in _string_list(target, "exclude")
+        ],
+        excluded_patterns=_string_list(target, "exclude_patterns"),
+    )
+
+
+def load_targets(config_path: str) -> List[BatchTarget]:
+    """Load the targets of a batch from a config file.
+
+    :param str config_path: The path to the config, which is read as TOML if its name ends with
+                            .toml, or as JSON otherwise
+
+    :raises ValueError: If the config is invalid
+
+    :returns: The targets, in the order they are listed
+    """
+
+    with open(config_path, "rb") as config_file:
+        if config_path.endswith(".toml"):
+            config = tomllib.load(config_file)
+        else:
+            config = json.load(config_file)
+
+    targets = config.get("targets") if isinstance(config, dict) else None
+    if not isinstance(targets, list) or not targets:
+        raise ValueError(f"{config_path} must list at least one target under 'targets'")
+
+    base_path = os.path.dirname(os.path.abspath(config_path))
+    parsed_targets = [_parse_target(target, base_path) for target in targets]
+
+    names = [target.name for target in parsed_targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"The names of the targets in {config_path} must be unique")
+
+    return parsed_targets
+
+
+def _files_by_target(targets: List[BatchTarget], walker: Optional[str]) -> Dict[str, List[str]]:
+    """Find the code files of each target, searching each distinct root once.
+
+    :param targets: The targets to find the files of
+    :param walker: The walker to search with, one of `WALKERS`
+
+    :returns: The code files of each target, by its name
+    """
+
+    # The files found by each search, by its root and exclusions
+    searches: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], List[str]] = {}
+    files_by_target = {}
+
+    for target in targets:
+        target_files: Dict[str, None] = {}
+
+        for root in target.roots:
+            search = (root, tuple(target.excluded_folders), tuple(target.excluded_patterns))
+            if search not in searches:
+                searches[search] = list(
+                    localizedstringkit.iter_localizable_files(
+                        root_path=root,
+                        excluded_folders=target.excluded_folders,
+                        excluded_patterns=target.excluded_patterns,
+                        walker=walker,
+                    )
+                )
+            target_files.update(dict.fromkeys(searches[search]))
+
+        files_by_target[target.name] = list(target_files)
+
+    log.debug(f"Searched {len(searches)} root(s) for {len(targets)} target(s)")
+    return files_by_target
+
+
+def extract_strings(
+    targets: List[BatchTarget],
+    *,
+    walker: Optional[str] = None,
+    cache: Optional[localizedstringkit.ExtractionCache] = None,
+    scanner: Optional[localizedstringkit.Scanner] = None,
+    stats: Optional[localizedstringkit.Stats] = None,
+) -> Dict[str, localizedstringkit.ExtractedStrings]:
+    """Scan the code files of every target, scanning files which targets share once.
+
+    The result for each target can be passed to `has_changes` and
+    `generate_files` with the target's `localized_string_kit_path`.
+
+    :param List[BatchTarget] targets: The targets to extract the strings of
+    :param Optional[str] walker: The walker to search with, one of `WALKERS` (default: auto)
+    :param Optional[ExtractionCache] cache: The cache to reuse unchanged files' strings from
+    :param Optional[Scanner] scanner: The scanner to scan with (default: the default settings)
+    :param Optional[Stats] stats: The stats to record timings and counters in
+
+    :returns: The strings of each target, by its name
+    """
+
+    with phase(stats, "discovery"):
+        files_by_target = _files_by_target(targets, walker)
+
+    unique_files = sorted({file for files in files_by_target.values() for file in files})
+    log.info(f"Scanning {len(unique_files)} file(s) for {len(targets)} target(s)...")
+
+    if scanner is None:
+        entries_by_file = detection.entries_by_code_file(unique_files, cache=cache, stats=stats)
+    else:
+        entries_by_file = scanner.entries_by_file(unique_files, cache, stats=stats)
+
+    extracted_strings = {}
+
+    with phase(stats, "dedup"):
+        for target_name, target_files in files_by_target.items():
+            unique_entries = dict.fromkeys(
+                entry for file in target_files for entry in entries_by_file.get(file, [])
+            )
+            extracted_strings[target_name] = localizedstringkit.ExtractedStrings(
+                [detection.localized_string_from_entry(entry) for entry in unique_entries]
+            )
+
+    return extracted_strings
@@ -0,0 +1,86 @@
+"""Per-file time budgets for scanning code files.
+
+A pattern which backtracks badly on some unusual input can take minutes on a
+single file, which stalls a whole build. A budget interrupts the scan of any
+file which takes too long, so it can be reported and either skipped or
+scanned again with the lexer, which runs in linear time.
+"""
+
+import contextlib
+import signal
+import threading
+from typing import Any, Iterator
+
+from localizedstringkit.exceptions import ScanTimeoutException
+from localizedstringkit.options import TIMEOUT_ACTIONS
+
+
+def _can_interrupt() -> bool:
+    """Check whether a scan in this thread can be interrupted by a timer.
+
+    Signals are only delivered to the main thread, and the interval timer
+    isn't available on Windows.
+
+    :returns: True if a budget can be enforced
+    """
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+class TimeBudget:
+    """The time each file may take to scan, and what to do when it runs out.
+
+    The budget is enforced with a timer signal, in whichever process scans
+    the file. It is only enforced on the main thread of a process (which is
+    where worker processes scan), and not at all on Windows.
+
+    :param float seconds: The maximum time to spend scanning a file, in seconds
+    :param str on_timeout: What to do with a file which runs out of time, one of
+                           `TIMEOUT_ACTIONS` (default: lexer)
+
+    :raises ValueError: If the time isn't positive, or the action is unknown
+    """
+
+    seconds: float
+    on_timeout: str
+
+    def __init__(self, seconds: float, on_timeout: str = "lexer") -> None:
+        if seconds <= 0:
+            raise ValueError(f"The time budget must be positive, not {seconds}")
+
+        if on_timeout not in TIMEOUT_ACTIONS:
+            raise ValueError(
+                f"Unknown timeout action: {on_timeout}. Expected one of {TIMEOUT_ACTIONS}"
+            )
+
+        self.seconds = seconds
+        self.on_timeout = on_timeout
+
+    @contextlib.contextmanager
+    def limit(self, file_path: str) -> Iterator[None]:
+        """Interrupt the enclosed scan if it runs out of time.
+
+        Any timer already running is paused, and resumed afterwards.
+
+        :param str file_path: The file being scanned
+
+        :raises ScanTimeoutException: If the scan runs out of time
+
+        :returns: A context manager enforcing the budget on its body
+        """
+
+        if not _can_interrupt():
+            yield
+            return
+
+        def timed_out(*_: Any) -> None:
+            raise ScanTimeoutException(file_path, self.seconds)
+
+        previous_handler = signal.signal(signal.SIGALRM, timed_out)
+        previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+            if previous_delay > 0:
+                signal.setitimer(signal.ITIMER_REAL, previous_delay, previous_interval)
@@ -0,0 +1,517 @@
+"""Per-file extraction cache handling tools."""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from localizedstringkit import detection
+from localizedstringkit.detection import StringEntry
+from localizedstringkit import logger
+from localizedstringkit.files import write_file_atomically
+
+log = logger.get()
+
+
+# Bump this whenever the layout of the cache file changes
+_CACHE_FORMAT_VERSION = 2
+
+_CACHE_FILE_NAME = "extraction_cache.json"
+
+# The modules whose code determines the strings extracted from a file
+_EXTRACTION_MODULES = ("detection.py", "lexer.py", "patterns.py")
+
+_MANIFEST_FILE_NAME = "source_digests.json"
+
+# Files modified this recently are not cached. Their mtime may not change again
+# if they are edited within the filesystem's timestamp granularity.
+_RACY_MODIFICATION_WINDOW_SECONDS = 2.0
+
+# (mtime in nanoseconds, size in bytes, content digest if verifying)
+_FileSignature = Tuple[int, int, Optional[str]]
+
+
+def search_description(
+    root_path: str,
+    *,
+    excluded_folders: Optional[List[str]] = None,
+    excluded_patterns: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Describe a search for files, so that searches with the same results compare equal.
+
+    :param str root_path: The path the search starts from
+    :param Optional[List[str]] excluded_folders: The paths to any folders to
+                                                 exclude, relative to the root
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                  paths to exclude
+
+    :returns: The description of the search, which can be stored as JSON
+    """
+
+    root_path = os.path.abspath(root_path)
+
+    return {
+        "root_path": root_path,
+        "excluded_folders": sorted(
+            {
+                os.path.normpath(os.path.join(root_path, folder.strip()))
+                for folder in excluded_folders or []
+                if folder.strip()
+            }
+        ),
+        "excluded_patterns": [pattern.strip() for pattern in excluded_patterns or []],
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _extraction_code_digest() -> str:
+    """Calculate a digest of the code which extracts the strings.
+
+    This changes with any release (or local edit) which changes extraction. It
+    is used rather than the installed version of the tool, as importing
+    `importlib.metadata` to look that up takes longer than the rest of the
+    start up put together.
+
+    :returns: The hex digest, or "unknown" if the code can't be read
+    """
+
+    hasher = hashlib.sha256()
+    package_path = os.path.dirname(os.path.abspath(detection.__file__))
+
+    try:
+        for module_name in _EXTRACTION_MODULES:
+            with open(os.path.join(package_path, module_name), "rb") as module_file:
+                hasher.update(module_file.read())
+    except OSError:
+        return "unknown"
+
+    return hasher.hexdigest()
+
+
+def cache_version(engine: str = "regex") -> str:
+    """Calculate the version identifier for cached extraction results.
+
+    Results are only valid for the exact detection patterns, engine and
+    extraction code which produced them, so all of them are part of the
+    identifier.
+
+    :param str engine: The extraction engine which produced the results
+
+    :returns: The version identifier
+    """
+
+    hasher = hashlib.sha256()
+    hasher.update(str(_CACHE_FORMAT_VERSION).encode("utf-8"))
+    hasher.update(_extraction_code_digest().encode("utf-8"))
+    hasher.update(engine.encode("utf-8"))
+    for source in detection.detection_pattern_sources():
+        hasher.update(source if isinstance(source, bytes) else source.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def content_digest(contents: bytes) -> str:
+    """Calculate the digest of some contents.
+
+    :param bytes contents: The contents to hash
+
+    :returns: The hex digest of the contents
+    """
+
+    return hashlib.sha256(contents).hexdigest()
+
+
+def _content_digest(file_path: str) -> str:
+    """Calculate the digest of a file's contents.
+
+    :param str file_path: The file to hash
+
+    :returns: The hex digest of the contents
+    """
+
+    with open(file_path, "rb") as input_file:
+        return hashlib.file_digest(input_file, "sha256").hexdigest()
+
+
+class ExtractionCache:
+    """An on-disk cache of the strings extracted from each code file.
+
+    Entries are keyed on the file path and validated against the file's mtime
+    and size. When `verify_contents` is set the entry is validated against a
+    digest of the contents instead, which survives checkouts that touch mtimes
+    but costs a read of every file.
+
+    The cache also remembers which files the last extraction covered, and the
+    search which found them, so an incremental run of the same search can start
+    from that list instead of searching the tree.
+    Results are only reused by the extraction engine which produced them.
+
+    :param str cache_directory: The directory to store the cache in
+    :param bool verify_contents: Whether to validate entries by content digest
+    :param str engine: The extraction engine the cached results are for
+    """
+
+    cache_directory: str
+    verify_contents: bool
+    engine: str
+    hits: int
+    misses: int
+
+    _entries: Dict[str, List[Any]]
+    _files: Optional[List[str]]
+    _previous_search: Optional[Dict[str, Any]]
+    _search: Optional[Dict[str, Any]]
+    _unchanged_files: FrozenSet[str]
+    _pending_signatures: Dict[str, _FileSignature]
+    _dirty: bool
+
+    def __init__(
+        self, cache_directory: str, *, verify_contents: bool = False, engine: str = "regex"
+    ) -> None:
+        self.cache_directory = cache_directory
+        self.verify_contents = verify_contents
+        self.engine = engine
+        self.hits = 0
+        self.misses = 0
+        self._files = None
+        self._previous_search = None
+        self._search = None
+        self._unchanged_files = frozenset()
+        self._pending_signatures = {}
+        self._dirty = False
+        self._entries = self._load()
+
+    @property
+    def path(self) -> str:
+        """The path to the cache file.
+
+        :returns: The path to the cache file
+        """
+        return os.path.join(self.cache_directory, _CACHE_FILE_NAME)
+
+    def _load(self) -> Dict[str, List[Any]]:
+        """Load the cached entries from disk.
+
+        Missing, unreadable or out of date caches are treated as empty.
+
+        :returns: The cached entries keyed by file path
+        """
+
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                contents = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            log.debug(f"Ignoring unreadable extraction cache at {self.path}: {ex}")
+            return {}
+
+        if not isinstance(contents, dict) or contents.get("version") != cache_version(self.engine):
+            log.debug(f"Ignoring out of date extraction cache at {self.path}")
+            return {}
+
+        entries = contents.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+
+        files = contents.get("files")
+        if isinstance(files, list):
+            self._files = files
+
+        search = contents.get("search")
+        if isinstance(search, dict):
+            self._previous_search = search
+
+        return entries
+
+    @property
+    def previous_files(self) -> Optional[List[str]]:
+        """The files covered by the last extraction which used this cache.
+
+        :returns: The file paths, or None if no extraction has been recorded
+        """
+        return self._files
+
+    @property
+    def previous_search(self) -> Optional[Dict[str, Any]]:
+        """The search which found the files covered by the last extraction.
+
+        :returns: The description of the search (see `search_description`), or None if the
+                  files were not found by a known search
+        """
+        return self._previous_search
+
+    def set_search(
+        self,
+        root_path: str,
+        *,
+        excluded_folders: Optional[List[str]] = None,
+        excluded_patterns: Optional[List[str]] = None,
+    ) -> None:
+        """Set the search which found the files of the next extraction.
+
+        This is recorded with the extracted files, so that a later incremental
+        run only starts from them if it is for the same search.
+
+        :param str root_path: The path the search starts from
+        :param Optional[List[str]] excluded_folders: The paths to any folders to
+                                                     exclude, relative to the root
+        :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                      paths to exclude
+        """
+
+        self._search = search_description(
+            root_path, excluded_folders=excluded_folders, excluded_patterns=excluded_patterns
+        )
+
+    def record_files(self, file_paths: List[str]) -> None:
+        """Record the files covered by an extraction, with the search set for it.
+
+        The entries of any other files, such as ones which were deleted or
+        renamed since the last extraction, are dropped. Files which were not
+        found by a search (see `set_search`), such as a listed subset or the
+        files of several targets, are not recorded and nothing is dropped, as
+        other runs which share the cache still need their entries.
+
+        :param List[str] file_paths: The file paths which were extracted from
+        """
+
+        if self._search is None:
+            return
+
+        if file_paths != self._files or self._search != self._previous_search:
+            self._files = list(file_paths)
+            self._previous_search = self._search
+            self._dirty = True
+
+        recorded_files = set(file_paths)
+        stale_files = [file_path for file_path in self._entries if file_path not in recorded_files]
+        for file_path in stale_files:
+            del self._entries[file_path]
+        if stale_files:
+            self._dirty = True
+
+    def assume_unchanged(self, file_paths: Iterable[str]) -> None:
+        """Trust the cached entries of some files without checking them on disk.
+
+        This is for incremental runs, where the set of changed files is
+        already known and checking every other file would defeat the point.
+
+        :param Iterable[str] file_paths: The file paths known not to have changed
+        """
+
+        self._unchanged_files = frozenset(file_paths)
+
+    def _signature(self, file_path: str) -> _FileSignature:
+        """Calculate the current signature of a file.
+
+        :param str file_path: The file to calculate the signature for
+
+        :returns: The signature of the file
+        """
+
+        stat_result = os.stat(file_path)
+        digest = _content_digest(file_path) if self.verify_contents else None
+        return (stat_result.st_mtime_ns, stat_result.st_size, digest)
+
+    def get(self, file_path: str) -> Optional[List[StringEntry]]:
+        """Get the cached entries for a file if they are still valid.
+
+        :param str file_path: The file to get the entries for
+
+        :returns: The cached entries, or None if the file needs scanning
+        """
+
+        if file_path in self._unchanged_files and file_path in self._entries:
+            self.hits += 1
+            return [tuple(cached_entry) for cached_entry in self._entries[file_path][3]]
+
+        try:
+            signature = self._signature(file_path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        entry = self._entries.get(file_path)
+
+        if entry is not None:
+            mtime_ns, size, digest, cached_entries = entry
+            if self.verify_contents:
+                valid = digest is not None and digest == signature[2]
+            else:
+                valid = (mtime_ns, size) == signature[:2]
+
+            if valid:
+                self.hits += 1
+                if (mtime_ns, size) != signature[:2]:
+                    # The contents matched but the file was touched
+                    self._store(file_path, signature, cached_entries)
+                return [tuple(cached_entry) for cached_entry in cached_entries]
+
+        self.misses += 1
+        self._pending_signatures[file_path] = signature
+        return None
+
+    def set(self, file_path: str, entries: List[StringEntry]) -> None:
+        """Store the entries extracted from a file.
+
+        This must follow a `get` miss for the same file so that the entry is
+        recorded against the file signature from before it was scanned.
+
+        :param str file_path: The file the entries were extracted from
+        :param List[StringEntry] entries: The entries extracted from the file
+        """
+
+        signature = self._pending_signatures.pop(file_path, None)
+        if signature is None:
+            return
+
+        if time.time() - signature[0] / 1e9 < _RACY_MODIFICATION_WINDOW_SECONDS:
+            return
+
+        self._store(file_path, signature, [list(entry) for entry in entries])
+
+    def _store(self, file_path: str, signature: _FileSignature, entries: List[Any]) -> None:
+        """Store a raw entry in the cache.
+
+        :param str file_path: The file the entry is for
+        :param _FileSignature signature: The signature of the file
+        :param List[Any] entries: The serialized entries for the file
+        """
+
+        mtime_ns, size, digest = signature
+        self._entries[file_path] = [mtime_ns, size, digest, entries]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk if it has changed."""
+
+        if not self._dirty:
+            return
+
+        log.debug(f"Writing extraction cache to {self.path}")
+
+        contents = {
+            "version": cache_version(self.engine),
+            "files": self._files,
+            "search": self._previous_search,
+            "entries": self._entries,
+        }
+        write_file_atomically(
+            self.path, json.dumps(contents, separators=(",", ":")).encode("utf-8")
+        )
+        self._dirty = False
+
+
+class DigestManifest:
+    """A stored record of the digests of the generated tracking files.
+
+    Each digest is stored alongside the file's mtime and size, so it can be
+    reused without reading the file as long as neither has changed since. As
+    with the extraction cache, files modified too recently for their mtime to
+    be trusted are not recorded.
+
+    :param str cache_directory: The directory to store the manifest in
+    """
+
+    cache_directory: str
+
+    _entries: Dict[str, List[Any]]
+    _dirty: bool
+
+    def __init__(self, cache_directory: str) -> None:
+        self.cache_directory = cache_directory
+        self._dirty = False
+        self._entries = self._load()
+
+    @property
+    def path(self) -> str:
+        """The path to the manifest file.
+
+        :returns: The path to the manifest file
+        """
+        return os.path.join(self.cache_directory, _MANIFEST_FILE_NAME)
+
+    def _load(self) -> Dict[str, List[Any]]:
+        """Load the stored digests from disk.
+
+        Missing or unreadable manifests are treated as empty.
+
+        :returns: The stored digests keyed by file path
+        """
+
+        try:
+            with open(self.path, encoding="utf-8") as manifest_file:
+                contents = json.load(manifest_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            log.debug(f"Ignoring unreadable digest manifest at {self.path}: {ex}")
+            return {}
+
+        if not isinstance(contents, dict):
+            return {}
+
+        return contents
+
+    def digest(self, file_path: str) -> Optional[str]:
+        """Get the digest of a file, reading it only if the stored digest is stale.
+
+        :param str file_path: The file to get the digest of
+
+        :returns: The hex digest of the file, or None if it does not exist
+        """
+
+        file_path = os.path.abspath(file_path)
+
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[:2] == [stat_result.st_mtime_ns, stat_result.st_size]:
+            return entry[2]
+
+        digest = _content_digest(file_path)
+        self._store(file_path, stat_result, digest)
+        return digest
+
+    def record(self, file_path: str, digest: str) -> None:
+        """Record the digest of a file which was just written.
+
+        :param str file_path: The file which was written
+        :param str digest: The hex digest of the written contents
+        """
+
+        file_path = os.path.abspath(file_path)
+        self._store(file_path, os.stat(file_path), digest)
+
+    def _store(self, file_path: str, stat_result: os.stat_result, digest: str) -> None:
+        """Store the digest of a file, unless its mtime can't be trusted yet.
+
+        :param str file_path: The absolute path of the file
+        :param os.stat_result stat_result: The status of the file the digest is of
+        :param str digest: The hex digest of the file
+        """
+
+        if time.time() - stat_result.st_mtime_ns / 1e9 < _RACY_MODIFICATION_WINDOW_SECONDS:
+            # Another write within the mtime's granularity would look unchanged
+            if self._entries.pop(file_path, None) is not None:
+                self._dirty = True
+            return
+
+        self._entries[file_path] = [stat_result.st_mtime_ns, stat_result.st_size, digest]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest back to disk if it has changed."""
+
+        if not self._dirty:
+            return
+
+        write_file_atomically(
+            self.path, json.dumps(self._entries, separators=(",", ":")).encode("utf-8")
+        )
+        self._dirty = False
@@ -0,0 +1,91 @@
+"""Tools for splitting code files into chunks for worker processes."""
+
+import math
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Below this much source the cost of starting worker processes outweighs the
+# benefit of scanning in parallel
+_PARALLEL_MINIMUM_FILES = 100
+_PARALLEL_MINIMUM_BYTES = 4 * 1024 * 1024
+
+# Files are sent to workers in chunks to amortize the cost of each round trip.
+# Chunks are closed at whichever limit is reached first.
+_MAXIMUM_CHUNK_FILES = 512
+_MAXIMUM_CHUNK_BYTES = 8 * 1024 * 1024
+_CHUNKS_PER_WORKER = 4
+
+# Chunk size used when the total number of files isn't known up front
+_STREAMING_CHUNK_FILES = 64
+
+
+def file_size(file_path: str) -> int:
+    """Get the size of a file.
+
+    :param file_path: The file to get the size of
+    :returns: The size of the file in bytes (0 if it can't be read)
+    """
+
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def should_scan_in_parallel(file_count: int, total_bytes: int, max_workers: Optional[int]) -> bool:
+    """Decide whether scanning in parallel is worth the cost of starting workers.
+
+    :param file_count: The number of files to scan
+    :param total_bytes: The total size of the files to scan
+    :param max_workers: Maximum number of parallel workers (None for CPU count)
+    :returns: True if the files should be scanned in parallel
+    """
+
+    if max_workers is not None and max_workers <= 1:
+        return False
+
+    if (os.cpu_count() or 1) <= 1 and max_workers is None:
+        return False
+
+    return file_count > _PARALLEL_MINIMUM_FILES and total_bytes >= _PARALLEL_MINIMUM_BYTES
+
+
+def automatic_chunk_size(file_count: Optional[int], workers: int) -> int:
+    """Choose how many files to send to a worker at once.
+
+    :param file_count: The total number of files, or None if they are still being discovered
+    :param workers: The number of workers the chunks will be shared between
+    :returns: The maximum number of files per chunk
+    """
+
+    if file_count is None:
+        return _STREAMING_CHUNK_FILES
+
+    chunk_size = math.ceil(file_count / (workers * _CHUNKS_PER_WORKER))
+    return max(1, min(_MAXIMUM_CHUNK_FILES, chunk_size))
+
+
+def chunk_files(sized_files: Iterable[Tuple[str, int]], chunk_size: int) -> Iterator[List[str]]:
+    """Split the files into chunks to send to the workers.
+
+    :param sized_files: The files to split, with the size of each
+    :param chunk_size: The maximum number of files per chunk
+    :returns: An iterator of the chunks of files, in the original order
+    """
+
+    current_chunk: List[str] = []
+    current_bytes = 0
+
+    for file_path, size in sized_files:
+        if current_chunk and (
+            len(current_chunk) >= chunk_size or current_bytes + size > _MAXIMUM_CHUNK_BYTES
+        ):
+            yield current_chunk
+            current_chunk = []
+            current_bytes = 0
+
+        current_chunk.append(file_path)
+        current_bytes += size
+
+    if current_chunk:
+        yield current_chunk
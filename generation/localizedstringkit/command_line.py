@@ -5,6 +5,7 @@
 import argparse
 import os
 import sys
+from typing import Dict, Iterable, List, Optional
 
 try:
     import localizedstringkit
@@ -15,12 +16,12 @@ except ImportError:
 log = localizedstringkit.logger.get()
 
 
-def _handle_arguments() -> int:
-    """Handle the command line arguments.
+def _parse_arguments() -> argparse.Namespace:
+    """Parse and validate the command line arguments.
 
     :raises Exception: If any conflicting arguments are passed in
 
-    :returns: An exit code
+    :returns: The parsed arguments
     """
 
     parser = argparse.ArgumentParser()
@@ -49,14 +50,47 @@ def _handle_arguments() -> int:
         help="Generate stringsdict file based on the string content or not",
     )
 
+    parser.add_argument(
+        "--output-format",
+        dest="output_format",
+        choices=localizedstringkit.OUTPUT_FORMATS,
+        default="text",
+        help=(
+            "Set the format of the generated .strings and .stringsdict files. 'binary' writes binary property lists, which are smaller "
+            + "and faster to load but have no comments. Use --force when switching, as the format is not tracked as a change (default: text)"
+        ),
+    )
+
+    parser.add_argument(
+        "--key-table",
+        dest="key_table",
+        choices=localizedstringkit.KEY_TABLE_FORMATS,
+        required=False,
+        help=(
+            "Also generate a source file for each bundle with the precomputed key of every string, so the library can look keys up "
+            + "rather than hashing them. 'dictionary' writes an Objective-C dictionary literal, 'array' a sorted C array which is binary searched"
+        ),
+    )
+
     parser.add_argument(
         "-p",
         "--path",
         dest="path",
         type=str,
         action="store",
-        required=True,
-        help="Set the root code path to search for code files from",
+        required=False,
+        help="Set the root code path to search for code files from. Required unless --batch is set",
+    )
+
+    parser.add_argument(
+        "--batch",
+        dest="batch",
+        type=str,
+        required=False,
+        help=(
+            "Check or generate every target listed in this JSON or TOML config, each with its own roots, exclusions and "
+            + "LocalizedStringKit path, searching and scanning the files which targets share only once"
+        ),
     )
 
     parser.add_argument(
@@ -72,6 +106,60 @@ def _handle_arguments() -> int:
         ),
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        required=False,
+        help="Set the maximum number of processes used to scan files. Defaults to the CPU count. Use 1 to scan sequentially",
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        dest="chunk_size",
+        type=int,
+        required=False,
+        help="Set the maximum number of files sent to a scanning process at once. Defaults to a size based on the number of files and processes",
+    )
+
+    parser.add_argument(
+        "--generate-in-processes",
+        dest="generate_in_processes",
+        action="store_true",
+        default=False,
+        help="Generate the output for each bundle in separate processes rather than threads. This can help when there are very large bundles",
+    )
+
+    cache_group = parser.add_mutually_exclusive_group()
+
+    cache_group.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        help=(
+            "Set the directory to cache the strings extracted from each file in, so unchanged files are not scanned again. "
+            + "If not defined, the LOCALIZED_STRING_KIT_CACHE_DIR environment variable will be used instead. If neither are defined no cache is used."
+        ),
+    )
+
+    cache_group.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        default=False,
+        help="Scan every file, ignoring any cache directory set in the environment",
+    )
+
+    parser.add_argument(
+        "--verify-cache-contents",
+        dest="verify_cache_contents",
+        action="store_true",
+        default=False,
+        help="Validate cached files by a hash of their contents rather than their modification time and size",
+    )
+
     exclusion_group = parser.add_mutually_exclusive_group()
 
     exclusion_group.add_argument(
@@ -90,59 +178,654 @@ def _handle_arguments() -> int:
         help="Set folders to exclude (paths should be relative to root path)",
     )
 
+    parser.add_argument(
+        "--exclude-pattern",
+        dest="exclude_patterns",
+        nargs="+",
+        type=str,
+        required=False,
+        help="Set .gitignore style patterns of files or folders to exclude (e.g. 'Pods/' or '*Tests.swift')",
+    )
+
+    parser.add_argument(
+        "--walker",
+        dest="walker",
+        choices=localizedstringkit.WALKERS,
+        default="auto",
+        help=(
+            "Set how code files are searched for. 'python' walks the folders in process, 'find' and 'rg' use the respective commands "
+            + "(ripgrep also skips hidden and .gitignore'd files). 'auto' currently uses 'python'."
+        ),
+    )
+
+    parser.add_argument(
+        "--engine",
+        dest="engine",
+        choices=localizedstringkit.ENGINES,
+        default="regex",
+        help=(
+            "Set how Localized calls are found in code files. 'regex' uses the pattern based detectors, 'lexer' tokenizes the code, "
+            + "so calls in comments are ignored and Swift raw and multi-line string literals are supported."
+        ),
+    )
+
+    parser.add_argument(
+        "--file-timeout",
+        dest="file_timeout",
+        type=float,
+        required=False,
+        help="Set the maximum number of seconds to spend scanning a single file. By default there is no limit",
+    )
+
+    parser.add_argument(
+        "--on-timeout",
+        dest="on_timeout",
+        choices=localizedstringkit.TIMEOUT_ACTIONS,
+        default="lexer",
+        help=(
+            "Set what to do with a file which takes longer than --file-timeout to scan. 'lexer' scans it again with the lexer engine, "
+            + "'skip' leaves its strings out, and 'fail' stops the run (default: lexer)"
+        ),
+    )
+
+    parser.add_argument(
+        "--daemon",
+        dest="daemon",
+        action="store_true",
+        default=False,
+        help=(
+            "Run as a daemon which keeps the strings of the root path in memory, polling it for changes, "
+            + "and answers check and generate requests from clients on the --socket path"
+        ),
+    )
+
+    parser.add_argument(
+        "--socket",
+        dest="socket",
+        type=str,
+        required=False,
+        help=(
+            "The Unix socket of the daemon. Without --daemon, the check or generation is sent to the daemon listening on it, "
+            + "falling back to running in this process if there is none."
+        ),
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        dest="poll_interval",
+        type=float,
+        default=localizedstringkit.options.DEFAULT_POLL_INTERVAL,
+        help="Set the number of seconds between the daemon's polls for changes (default: %(default)g)",
+    )
+
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        action="store_true",
+        default=False,
+        help="Log a summary of the time spent in each phase of the run, and counts of the files, strings and bundles processed",
+    )
+
+    parser.add_argument(
+        "--stats-json",
+        dest="stats_json",
+        type=str,
+        required=False,
+        help="Write the timings and counts of the run, including those of each scanning process, to this path as JSON",
+    )
+
+    parser.add_argument(
+        "--slowest-files",
+        dest="slowest_files",
+        type=int,
+        required=False,
+        help="Profile each scanned file, and include this many of the slowest in the --stats summary (implied) and JSON report",
+    )
+
+    parser.add_argument(
+        "--cprofile",
+        dest="cprofile",
+        type=str,
+        required=False,
+        help=(
+            "Run cProfile in this process and in every scanning process, and write the results to parent.prof and workers.prof "
+            + "(all the scanning processes combined) in this directory"
+        ),
+    )
+
+    incremental_group = parser.add_mutually_exclusive_group()
+
+    incremental_group.add_argument(
+        "--changed-files",
+        dest="changed_files",
+        type=str,
+        required=False,
+        help=(
+            "Only scan the files listed in this file (one per line, relative to the root path), reusing the previous run's results "
+            + "for every other file. Listed files which no longer exist are treated as deleted. Requires a cache directory."
+        ),
+    )
+
+    incremental_group.add_argument(
+        "--files-from",
+        dest="files_from",
+        type=str,
+        required=False,
+        help=(
+            "Scan the files listed in this file ('-' for stdin) instead of searching the root path, e.g. the sources of a build target. "
+            + "Paths are separated by newlines or NULs, relative paths are relative to the root path, and exclusions do not apply"
+        ),
+    )
+
+    incremental_group.add_argument(
+        "--since",
+        dest="since",
+        type=str,
+        required=False,
+        help="Like --changed-files, but use git to find the files which changed since the merge base with this ref (e.g. origin/main)",
+    )
+
     args = parser.parse_args()
 
-    if args.localized_string_kit_path is None:
+    _check_target_arguments(args)
+
+    for name, value in [
+        ("--jobs", args.jobs),
+        ("--chunk-size", args.chunk_size),
+        ("--slowest-files", args.slowest_files),
+    ]:
+        if value is not None and value < 1:
+            raise Exception(f"{name} must be at least 1")
+
+    if args.localized_string_kit_path is None and args.batch is None:
         args.localized_string_kit_path = os.environ.get("LOCALIZED_STRING_KIT_PATH")
 
-    if args.localized_string_kit_path is None:
+        if args.localized_string_kit_path is None:
+            raise Exception(
+                "Neither the --localized-string-kit-path flag was passed in, nor the LOCALIZED_STRING_KIT_PATH environment variable set."
+            )
+
+    if args.cache_dir is None and not args.no_cache:
+        args.cache_dir = os.environ.get("LOCALIZED_STRING_KIT_CACHE_DIR")
+
+    if (args.changed_files is not None or args.since is not None) and args.cache_dir is None:
+        raise Exception("--changed-files and --since require a cache directory to be set")
+
+    if args.daemon and args.socket is None:
+        raise Exception("--daemon requires --socket to be set")
+
+    if args.files_from is not None and args.socket is not None:
         raise Exception(
-            "Neither the --localized-string-kit-path flag was passed in, nor the LOCALIZED_STRING_KIT_PATH environment variable set."
+            "--files-from can't be used with --socket, as the daemon scans the root path"
         )
 
+    if args.poll_interval <= 0:
+        raise Exception("--poll-interval must be positive")
+
+    if args.file_timeout is not None and args.file_timeout <= 0:
+        raise Exception("--file-timeout must be positive")
+
+    return args
+
+
+def _check_target_arguments(args: argparse.Namespace) -> None:
+    """Check that the code to scan is set either with --path or by a batch config, not both.
+
+    :param argparse.Namespace args: The parsed arguments
+
+    :raises Exception: If there is no path or batch config, or options which are set per target
+                       in a batch config were passed in with one
+    """
+
+    if args.batch is None:
+        if args.path is None:
+            raise Exception("--path is required unless --batch is set")
+        return
+
+    conflicting_options = [
+        name
+        for name, value in [
+            ("--path", args.path),
+            ("--localized-string-kit-path", args.localized_string_kit_path),
+            ("--exclude", args.exclude),
+            ("--exclusion-file", args.exclusion_file),
+            ("--exclude-pattern", args.exclude_patterns),
+            ("--changed-files", args.changed_files),
+            ("--files-from", args.files_from),
+            ("--since", args.since),
+            ("--daemon", args.daemon or None),
+            ("--socket", args.socket),
+        ]
+        if value is not None
+    ]
+
+    if conflicting_options:
+        raise Exception(
+            f"--batch can't be used with {', '.join(conflicting_options)}. "
+            + "Set the roots, exclusions and paths of each target in the config instead."
+        )
+
+
+def _incremental_code_files(
+    args: argparse.Namespace, cache: "localizedstringkit.ExtractionCache", exclusions: List[str]
+) -> Optional[List[str]]:
+    """Work out the files to scan from the changed files passed in.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param localizedstringkit.ExtractionCache cache: The cache holding the previous run's results
+    :param List[str] exclusions: The folders to exclude, relative to the root path
+
+    :returns: The files to scan, or None if a full search is needed
+    """
+
+    if args.since is not None:
+        changed_files = localizedstringkit.git_changed_files(args.path, args.since)
+    else:
+        with open(args.changed_files, encoding="utf-8") as changed_files_file:
+            changed_files = [
+                os.path.join(args.path, line.strip()) for line in changed_files_file if line.strip()
+            ]
+
+    code_files = localizedstringkit.incremental_code_files(
+        cache=cache,
+        root_path=args.path,
+        changed_files=changed_files,
+        excluded_folders=exclusions,
+        excluded_patterns=args.exclude_patterns,
+    )
+
+    if code_files is None:
+        log.info(
+            "No previous run of the same search was found in the cache, so every file will be scanned"
+        )
+    else:
+        log.info(f"Scanning {len(changed_files)} changed file(s)...")
+
+    return code_files
+
+
+def _generate_files(
+    args: argparse.Namespace,
+    localized_string_kit_path: str,
+    extracted_strings: localizedstringkit.ExtractedStrings,
+    digest_manifest: Optional["localizedstringkit.DigestManifest"],
+    stats: Optional["localizedstringkit.Stats"],
+) -> None:
+    """Generate the output files on the executor chosen on the command line.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder to generate in
+    :param localizedstringkit.ExtractedStrings extracted_strings: The strings to generate from
+    :param Optional[localizedstringkit.DigestManifest] digest_manifest: The manifest to record
+                                                                         digests in
+    :param Optional[localizedstringkit.Stats] stats: The stats to record the generation in
+    """
+
+    if not args.generate_in_processes:
+        localizedstringkit.generate_files(
+            localized_string_kit_path=localized_string_kit_path,
+            generate_stringsdict_files=args.generate_stringsdict_files,
+            extracted_strings=extracted_strings,
+            digest_manifest=digest_manifest,
+            stats=stats,
+            output_format=args.output_format,
+            key_table_format=args.key_table,
+        )
+        return
+
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        localizedstringkit.generate_files(
+            localized_string_kit_path=localized_string_kit_path,
+            generate_stringsdict_files=args.generate_stringsdict_files,
+            extracted_strings=extracted_strings,
+            digest_manifest=digest_manifest,
+            executor=executor,
+            stats=stats,
+            output_format=args.output_format,
+            key_table_format=args.key_table,
+        )
+
+
+def _check_or_generate(
+    args: argparse.Namespace,
+    localized_string_kit_path: str,
+    extracted_strings: localizedstringkit.ExtractedStrings,
+    digest_manifest: Optional["localizedstringkit.DigestManifest"],
+    stats: Optional["localizedstringkit.Stats"],
+) -> bool:
+    """Check the generated files against the strings, or regenerate them if they are out of date.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param str localized_string_kit_path: Path to the LocalizedStringsKit folder
+    :param localizedstringkit.ExtractedStrings extracted_strings: The strings in the code
+    :param Optional[localizedstringkit.DigestManifest] digest_manifest: The manifest of the
+                                                                         tracking files' digests
+    :param Optional[localizedstringkit.Stats] stats: The stats to record the run in
+
+    :returns: True if checking and there are changes, False otherwise
+    """
+
+    if args.check:
+        return localizedstringkit.has_changes(
+            localized_string_kit_path=localized_string_kit_path,
+            extracted_strings=extracted_strings,
+            including_stringsdict_files=args.generate_stringsdict_files,
+            digest_manifest=digest_manifest,
+            stats=stats,
+            key_table_format=args.key_table,
+        )
+
+    if args.force or localizedstringkit.has_changes(
+        localized_string_kit_path=localized_string_kit_path,
+        extracted_strings=extracted_strings,
+        including_stringsdict_files=args.generate_stringsdict_files,
+        digest_manifest=digest_manifest,
+        stats=stats,
+        key_table_format=args.key_table,
+    ):
+        _generate_files(args, localized_string_kit_path, extracted_strings, digest_manifest, stats)
+
+    return False
+
+
+def _budget(args: argparse.Namespace) -> Optional["localizedstringkit.TimeBudget"]:
+    """Get the per file time budget set on the command line.
+
+    :param argparse.Namespace args: The parsed arguments
+
+    :returns: The budget, or None if scans are not limited
+    """
+
+    if args.file_timeout is None:
+        return None
+
+    return localizedstringkit.TimeBudget(args.file_timeout, args.on_timeout)
+
+
+def _exclusions(args: argparse.Namespace) -> List[str]:
+    """Get the folders to exclude passed on the command line.
+
+    :param argparse.Namespace args: The parsed arguments
+
+    :returns: The folders to exclude, relative to the root path
+    """
+
     if args.exclusion_file is not None:
         with open(args.exclusion_file, encoding="utf-8") as exclusion_file:
-            exclusions = list(map(lambda s: s.strip(), exclusion_file.readlines()))
-    elif args.exclude is not None:
-        exclusions = args.exclude
-    else:
-        exclusions = []
+            return list(map(lambda s: s.strip(), exclusion_file.readlines()))
+
+    if args.exclude is not None:
+        return args.exclude
+
+    return []
+
+
+def _run_daemon(args: argparse.Namespace, exclusions: List[str]) -> int:
+    """Run the daemon until a client shuts it down.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param List[str] exclusions: The folders to exclude, relative to the root path
+
+    :returns: An exit code
+    """
 
-    exclusions = [os.path.join(args.path, path) for path in exclusions]
+    # pylint: disable=import-outside-toplevel
+    from localizedstringkit import daemon
 
-    log.info("Searching for code files...")
-    code_files = localizedstringkit.localizable_files(
-        root_path=args.path, excluded_folders=exclusions
+    index = daemon.StringIndex(
+        args.path,
+        excluded_folders=exclusions,
+        excluded_patterns=args.exclude_patterns,
+        walker=args.walker,
+        engine=args.engine,
     )
-    log.info(f"{len(code_files)} file(s) found")
+    daemon.serve(args.socket, index, args.poll_interval)
+    return 0
+
+
+def _request_from_daemon(args: argparse.Namespace) -> Optional[int]:
+    """Send the check or generation to the daemon.
+
+    :param argparse.Namespace args: The parsed arguments
+
+    :raises DaemonException: If the daemon could not handle the request
+
+    :returns: An exit code, or None if no daemon is running
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from localizedstringkit import daemon
+
+    request = {
+        "command": "check" if args.check else "generate",
+        "root_path": os.path.abspath(args.path),
+        "localized_string_kit_path": os.path.abspath(args.localized_string_kit_path),
+        "generate_stringsdict_files": args.generate_stringsdict_files,
+        "output_format": args.output_format,
+        "key_table_format": args.key_table,
+        "force": args.force,
+    }
 
     try:
-        if args.check:
-            if localizedstringkit.has_changes(
-                localized_string_kit_path=args.localized_string_kit_path,
-                code_files=code_files,
-                including_stringsdict_files=args.generate_stringsdict_files,
-            ):
-                log.info("There are string changes. Please run `olm localize`")
-                return 1
-        else:
-            if args.force or localizedstringkit.has_changes(
-                localized_string_kit_path=args.localized_string_kit_path,
-                code_files=code_files,
-                including_stringsdict_files=args.generate_stringsdict_files,
-            ):
-                localizedstringkit.generate_files(
-                    code_files=code_files,
-                    localized_string_kit_path=args.localized_string_kit_path,
-                    generate_stringsdict_files=args.generate_stringsdict_files,
-                )
-    except localizedstringkit.InvalidLocalizedCallException as ex:
+        response = daemon.send_request(args.socket, request)
+    except OSError as ex:
+        log.warning(f"Could not reach the daemon on {args.socket} ({ex}), running without it")
+        return None
+
+    log.info(f"{response['strings']} string(s) found")
+
+    if args.check and response["changes"]:
+        log.info("There are string changes. Please run `olm localize`")
+        return 1
+
+    return 0
+
+
+def _report_stats(args: argparse.Namespace, stats: "localizedstringkit.Stats") -> None:
+    """Output the stats in the forms asked for on the command line.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param localizedstringkit.Stats stats: The stats of the run
+    """
+
+    if args.stats or args.slowest_files is not None:
+        for line in stats.summary().splitlines():
+            log.info(line)
+
+    if args.stats_json is not None:
+        stats.write_json(args.stats_json)
+
+    if args.cprofile is not None:
+        for path in stats.write_call_profiles(args.cprofile):
+            log.info(f"Wrote profile to {path}")
+
+
+def _run(
+    args: argparse.Namespace,
+    cache: Optional["localizedstringkit.ExtractionCache"],
+    digest_manifest: Optional["localizedstringkit.DigestManifest"],
+    exclusions: List[str],
+    stats: Optional["localizedstringkit.Stats"],
+) -> int:
+    """Check or generate the strings in this process.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param Optional[localizedstringkit.ExtractionCache] cache: The extraction cache to use
+    :param Optional[localizedstringkit.DigestManifest] digest_manifest: The manifest of the
+                                                                         tracking files' digests
+    :param List[str] exclusions: The folders to exclude, relative to the root path
+    :param Optional[localizedstringkit.Stats] stats: The stats to record the run in
+
+    :returns: An exit code
+    """
+
+    if args.batch is not None:
+        return _run_batch(args, cache, digest_manifest, stats)
+
+    code_files: Optional[Iterable[str]] = None
+    if args.files_from is not None:
+        log.info("Scanning the listed code files...")
+        code_files = localizedstringkit.iter_listed_files(args.files_from, root_path=args.path)
+    elif cache is not None and (args.changed_files is not None or args.since is not None):
+        code_files = _incremental_code_files(args, cache, exclusions)
+
+    if code_files is None:
+        log.info("Searching for and scanning code files...")
+        if cache is not None:
+            cache.set_search(
+                args.path, excluded_folders=exclusions, excluded_patterns=args.exclude_patterns
+            )
+        code_files = localizedstringkit.iter_localizable_files(
+            root_path=args.path,
+            excluded_folders=exclusions,
+            walker=args.walker,
+            excluded_patterns=args.exclude_patterns,
+        )
+
+    try:
+        # Scan once and share the result between the check and the generation. Files
+        # are scanned as they are found.
+        extracted_strings = localizedstringkit.extract_strings(
+            code_files,
+            cache=cache,
+            max_workers=args.jobs,
+            chunk_size=args.chunk_size,
+            engine=args.engine,
+            stats=stats,
+            budget=_budget(args),
+        )
+        log.info(f"{len(extracted_strings.localized_strings)} string(s) found")
+
+        if _check_or_generate(
+            args, args.localized_string_kit_path, extracted_strings, digest_manifest, stats
+        ):
+            log.info("There are string changes. Please run `olm localize`")
+            return 1
+    except (
+        localizedstringkit.InvalidLocalizedCallException,
+        localizedstringkit.ScanTimeoutException,
+    ) as ex:
         log.error(ex)
         return 1
 
     return 0
 
 
+def _run_batch(
+    args: argparse.Namespace,
+    cache: Optional["localizedstringkit.ExtractionCache"],
+    digest_manifest: Optional["localizedstringkit.DigestManifest"],
+    stats: Optional["localizedstringkit.Stats"],
+) -> int:
+    """Check or generate the strings of every target in the batch config.
+
+    :param argparse.Namespace args: The parsed arguments
+    :param Optional[localizedstringkit.ExtractionCache] cache: The extraction cache to use
+    :param Optional[localizedstringkit.DigestManifest] digest_manifest: The manifest of the
+                                                                         tracking files' digests
+    :param Optional[localizedstringkit.Stats] stats: The stats to record the run in
+
+    :raises BundleGenerationException: If any target's bundles could not be generated. Every
+                                       other target is still generated.
+
+    :returns: An exit code
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from localizedstringkit import batch
+
+    targets = batch.load_targets(args.batch)
+
+    try:
+        with localizedstringkit.Scanner(
+            max_workers=args.jobs,
+            chunk_size=args.chunk_size,
+            engine=args.engine,
+            budget=_budget(args),
+        ) as scanner:
+            strings_by_target = batch.extract_strings(
+                targets, walker=args.walker, cache=cache, scanner=scanner, stats=stats
+            )
+    except (
+        localizedstringkit.InvalidLocalizedCallException,
+        localizedstringkit.ScanTimeoutException,
+    ) as ex:
+        log.error(ex)
+        return 1
+
+    changed_targets = []
+    failures: Dict[str, BaseException] = {}
+
+    for target in targets:
+        extracted_strings = strings_by_target[target.name]
+        log.info(f"{target.name}: {len(extracted_strings.localized_strings)} string(s) found")
+
+        try:
+            if _check_or_generate(
+                args, target.localized_string_kit_path, extracted_strings, digest_manifest, stats
+            ):
+                changed_targets.append(target.name)
+        except localizedstringkit.BundleGenerationException as ex:
+            failures.update(
+                (f"{target.name}: {bundle}", error) for bundle, error in ex.failures.items()
+            )
+
+    if failures:
+        raise localizedstringkit.BundleGenerationException(failures)
+
+    if changed_targets:
+        log.info(
+            f"There are string changes in {', '.join(changed_targets)}. Please run `olm localize`"
+        )
+        return 1
+
+    return 0
+
+
+def _handle_arguments() -> int:
+    """Handle the command line arguments.
+
+    :returns: An exit code
+    """
+
+    args = _parse_arguments()
+
+    cache = None
+    digest_manifest = None
+    if args.cache_dir is not None and not args.no_cache:
+        cache = localizedstringkit.ExtractionCache(
+            args.cache_dir, verify_contents=args.verify_cache_contents, engine=args.engine
+        )
+        digest_manifest = localizedstringkit.DigestManifest(args.cache_dir)
+
+    exclusions = _exclusions(args)
+
+    if args.daemon:
+        return _run_daemon(args, exclusions)
+
+    if args.socket is not None:
+        exit_code = _request_from_daemon(args)
+        if exit_code is not None:
+            return exit_code
+
+    if not args.stats and all(
+        option is None for option in [args.stats_json, args.slowest_files, args.cprofile]
+    ):
+        return _run(args, cache, digest_manifest, exclusions, None)
+
+    stats = localizedstringkit.Stats(
+        slowest_files=args.slowest_files or 0, profile_calls=args.cprofile is not None
+    )
+    try:
+        with stats.profiling():
+            return _run(args, cache, digest_manifest, exclusions, stats)
+    finally:
+        _report_stats(args, stats)
+
+
 def run() -> int:
     """Entry point for poetry generated command line tool.
 
@@ -0,0 +1,395 @@
+"""A long running daemon which keeps the strings of a codebase in memory.
+
+Running the tool from a build phase pays for starting Python, searching the
+tree and scanning every file on each build. The daemon does that once, then
+polls the tree in the background and only rescans the files which changed.
+Clients send it check and generate requests over a Unix socket, as one line
+of JSON, and get one line of JSON back.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotstrings import LocalizedString
+
+import localizedstringkit
+from localizedstringkit import detection
+from localizedstringkit import logger
+from localizedstringkit.cache import _RACY_MODIFICATION_WINDOW_SECONDS
+from localizedstringkit.exceptions import (
+    DaemonException,
+    InvalidLocalizedCallException,
+    UnsupportedFileTypeError,
+)
+from localizedstringkit.options import DEFAULT_POLL_INTERVAL
+
+log = logger.get()
+
+# Requests and responses are single lines, so this only guards against garbage
+_MAXIMUM_MESSAGE_BYTES = 1024 * 1024
+
+# (mtime in nanoseconds, size in bytes), or None if the file was modified too
+# recently for its mtime to be trusted
+_FileSignature = Optional[Tuple[int, int]]
+
+
+class StringIndex:
+    """The strings found in each code file under a root path.
+
+    :param str root_path: The path to search for code files from
+    :param Optional[List[str]] excluded_folders: The paths to any folders to exclude, relative to
+                                                 the root path
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of paths to exclude
+    :param Optional[str] walker: How to search for files, one of `WALKERS`
+    :param str engine: The extraction engine to use, one of `ENGINES`
+    """
+
+    root_path: str
+    excluded_folders: Optional[List[str]]
+    excluded_patterns: Optional[List[str]]
+    walker: Optional[str]
+    engine: str
+
+    _signatures: Dict[str, _FileSignature]
+    _strings: Dict[str, List[LocalizedString]]
+    _invalid_calls: Dict[str, str]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        root_path: str,
+        *,
+        excluded_folders: Optional[List[str]] = None,
+        excluded_patterns: Optional[List[str]] = None,
+        walker: Optional[str] = None,
+        engine: str = "regex",
+    ) -> None:
+        self.root_path = root_path
+        self.excluded_folders = excluded_folders
+        self.excluded_patterns = excluded_patterns
+        self.walker = walker
+        self.engine = engine
+        self._signatures = {}
+        self._strings = {}
+        self._invalid_calls = {}
+        self._lock = threading.Lock()
+
+    def _scan(self, file_path: str) -> List[LocalizedString]:
+        """Scan a file, logging rather than raising any errors.
+
+        Invalid calls are also recorded, so requests fail until they are fixed.
+
+        :param str file_path: The file to scan
+
+        :returns: The strings in the file, or an empty list if it could not be scanned
+        """
+
+        self._invalid_calls.pop(file_path, None)
+
+        try:
+            return detection.strings_in_code_file(file_path, self.engine)
+        except InvalidLocalizedCallException as exception:
+            log.error("Error processing %s: %s", file_path, exception)
+            self._invalid_calls[file_path] = str(exception)
+            return []
+        except (IOError, UnsupportedFileTypeError) as exception:
+            log.error("Error processing %s: %s", file_path, exception)
+            return []
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the files on disk.
+
+        The tree is searched again, but only new files and files whose mtime
+        or size changed are scanned. Files which no longer exist are dropped.
+
+        :returns: The number of files which were scanned or dropped
+        """
+
+        with self._lock:
+            code_files = localizedstringkit.localizable_files(
+                root_path=self.root_path,
+                excluded_folders=self.excluded_folders,
+                excluded_patterns=self.excluded_patterns,
+                walker=self.walker,
+            )
+
+            existing_files = set()
+            changed_count = 0
+            racy_time_ns = time.time_ns() - int(_RACY_MODIFICATION_WINDOW_SECONDS * 1e9)
+
+            for file_path in code_files:
+                try:
+                    stat_result = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+
+                existing_files.add(file_path)
+
+                signature: _FileSignature = (stat_result.st_mtime_ns, stat_result.st_size)
+                if signature == self._signatures.get(file_path):
+                    continue
+
+                self._strings[file_path] = self._scan(file_path)
+                # Recently modified files are scanned again on every refresh until
+                # their mtime can be trusted
+                self._signatures[file_path] = (
+                    None if stat_result.st_mtime_ns > racy_time_ns else signature
+                )
+                changed_count += 1
+
+            for file_path in set(self._strings) - existing_files:
+                del self._strings[file_path]
+                del self._signatures[file_path]
+                self._invalid_calls.pop(file_path, None)
+                changed_count += 1
+
+            if changed_count:
+                log.debug("Refreshed %d file(s), %d in total", changed_count, len(self._strings))
+
+            return changed_count
+
+    def extracted_strings(self) -> localizedstringkit.ExtractedStrings:
+        """Get the strings currently in the index.
+
+        :raises InvalidLocalizedCallException: If any file has an invalid call, as scanning
+                                               the tree without the daemon would
+
+        :returns: The deduplicated strings from every file
+        """
+
+        with self._lock:
+            if self._invalid_calls:
+                raise InvalidLocalizedCallException(self._invalid_calls[min(self._invalid_calls)])
+
+            return localizedstringkit.ExtractedStrings(
+                [string for strings in self._strings.values() for string in strings]
+            )
+
+
+def _handle_request(index: StringIndex, request: Any) -> Dict[str, Any]:
+    """Answer a check or generate request.
+
+    :param StringIndex index: The index of the codebase
+    :param Any request: The decoded request
+
+    :raises DaemonException: If the request is invalid
+
+    :returns: The response
+    """
+
+    if not isinstance(request, dict):
+        raise DaemonException("The request must be a JSON object")
+
+    command = request.get("command")
+    if command not in ("check", "generate"):
+        raise DaemonException(f"Unknown command: {command}")
+
+    root_path = request.get("root_path")
+    if root_path is not None and os.path.realpath(root_path) != os.path.realpath(index.root_path):
+        raise DaemonException(f"The daemon is watching {index.root_path}, not {root_path}")
+
+    localized_string_kit_path = request.get("localized_string_kit_path")
+    if not isinstance(localized_string_kit_path, str):
+        raise DaemonException("The request has no localized_string_kit_path")
+
+    generate_stringsdict_files = bool(request.get("generate_stringsdict_files", False))
+
+    output_format = request.get("output_format", "text")
+    if output_format not in localizedstringkit.OUTPUT_FORMATS:
+        raise DaemonException(f"Unknown output format: {output_format}")
+
+    key_table_format = request.get("key_table_format")
+    if (
+        key_table_format is not None
+        and key_table_format not in localizedstringkit.KEY_TABLE_FORMATS
+    ):
+        raise DaemonException(f"Unknown key table format: {key_table_format}")
+
+    # Pick up any changes made since the last poll
+    index.refresh()
+    extracted_strings = index.extracted_strings()
+
+    changes = localizedstringkit.has_changes(
+        localized_string_kit_path=localized_string_kit_path,
+        extracted_strings=extracted_strings,
+        including_stringsdict_files=generate_stringsdict_files,
+        key_table_format=key_table_format,
+    )
+
+    generated = False
+    if command == "generate" and (changes or request.get("force", False)):
+        localizedstringkit.generate_files(
+            localized_string_kit_path=localized_string_kit_path,
+            generate_stringsdict_files=generate_stringsdict_files,
+            extracted_strings=extracted_strings,
+            output_format=output_format,
+            key_table_format=key_table_format,
+        )
+        generated = True
+
+    return {
+        "status": "ok",
+        "strings": len(extracted_strings.localized_strings),
+        "changes": changes,
+        "generated": generated,
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers a single client connection."""
+
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        """Read a request line and write the response line."""
+
+        response: Dict[str, Any]
+
+        try:
+            request = json.loads(self.rfile.readline(_MAXIMUM_MESSAGE_BYTES))
+
+            if isinstance(request, dict) and request.get("command") == "shutdown":
+                response = {"status": "ok"}
+                # Shutting down waits for this request to finish, so it can't happen here
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                response = _handle_request(self.server.index, request)
+        except Exception as exception:  # pylint: disable=broad-except
+            log.error("Request failed: %s", exception)
+            response = {"status": "error", "message": str(exception)}
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    """A Unix socket server which answers requests from an index.
+
+    :param str socket_path: The path of the socket to listen on
+    :param StringIndex index: The index to answer requests from
+    """
+
+    index: StringIndex
+
+    def __init__(self, socket_path: str, index: StringIndex) -> None:
+        self.index = index
+        super().__init__(socket_path, _RequestHandler)
+
+
+def _poll(index: StringIndex, interval: float, stopped: threading.Event) -> None:
+    """Refresh the index periodically until stopped.
+
+    :param StringIndex index: The index to refresh
+    :param float interval: The number of seconds between refreshes
+    :param threading.Event stopped: Set to stop polling
+    """
+
+    while not stopped.wait(interval):
+        try:
+            index.refresh()
+        except Exception as exception:  # pylint: disable=broad-except
+            log.error("Failed to refresh the index: %s", exception)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a daemon which is no longer running.
+
+    :param str socket_path: The path of the socket
+
+    :raises DaemonException: If the path is not a socket, or a daemon is still listening on it
+    """
+
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise DaemonException(f"{socket_path} already exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+
+    raise DaemonException(f"A daemon is already listening on {socket_path}")
+
+
+def serve(
+    socket_path: str,
+    index: StringIndex,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ready: Optional[threading.Event] = None,
+) -> None:
+    """Run the daemon until a client asks it to shut down.
+
+    The index is filled before the socket starts listening, so the first
+    request doesn't pay for scanning the whole tree.
+
+    :param str socket_path: The path of the Unix socket to listen on
+    :param StringIndex index: The index of the codebase to keep up to date
+    :param float poll_interval: The number of seconds between polls of the tree for changes
+    :param Optional[threading.Event] ready: Set once the daemon is accepting requests
+
+    :raises DaemonException: If another daemon is already listening on the socket
+    """
+
+    _remove_stale_socket(socket_path)
+
+    log.info(f"Indexing {index.root_path}...")
+    index.refresh()
+
+    stopped = threading.Event()
+    poller = threading.Thread(target=_poll, args=(index, poll_interval, stopped), daemon=True)
+
+    with _DaemonServer(socket_path, index) as server:
+        try:
+            poller.start()
+            log.info(f"Listening on {socket_path}")
+            if ready is not None:
+                ready.set()
+            server.serve_forever()
+        finally:
+            stopped.set()
+            poller.join()
+            os.remove(socket_path)
+
+
+def send_request(
+    socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Send a request to a running daemon.
+
+    :param str socket_path: The path of the daemon's Unix socket
+    :param dict request: The request, with a command of check, generate or shutdown
+    :param Optional[float] timeout: The number of seconds to wait for a response (default: forever)
+
+    :raises OSError: If no daemon is listening on the socket
+    :raises DaemonException: If the daemon could not handle the request
+
+    :returns: The response
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        with client.makefile("rb") as response_file:
+            line = response_file.readline(_MAXIMUM_MESSAGE_BYTES)
+
+    if not line:
+        raise DaemonException("The daemon closed the connection without responding")
+
+    response = json.loads(line)
+    if response.get("status") != "ok":
+        raise DaemonException(response.get("message", "Unknown error"))
+
+    return response
@@ -1,44 +1,243 @@
 """Detection methods handling tools."""
 
+import collections
+import functools
+import itertools
+import mmap
+import os
 import re
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import ClassVar, List, Optional, Pattern
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Sized,
+    Tuple,
+    Type,
+    Union,
+)
 
 from dotstrings import LocalizedString
 
+from localizedstringkit import chunking
 from localizedstringkit import logger
-from localizedstringkit.exceptions import InvalidLocalizedCallException, UnsupportedFileTypeError
+from localizedstringkit import patterns
+from localizedstringkit.exceptions import (
+    InvalidLocalizedCallException,
+    ScanTimeoutException,
+    UnsupportedFileTypeError,
+)
+from localizedstringkit.options import ENGINES
+from localizedstringkit.stats import Stats, phase
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from localizedstringkit.budget import TimeBudget
+    from localizedstringkit.cache import ExtractionCache
 
 log = logger.get()
 
 
-# Swift combined pattern - matches both VALID and INVALID calls in one pattern
-# Valid calls populate named groups, invalid calls populate the 'invalid' group
-_SWIFT_COMBINED_PATTERN: Pattern = re.compile(
-    r"(?:"
-    # Valid patterns with named groups
-    r'LocalizedWithKeyExtensionAndBundle\(\s*"(?P<ext_bundle_value>.+?)",\s*"(?P<ext_bundle_comment>.*?)",\s*"(?P<ext_bundle_extension>.*?)",\s*"(?P<ext_bundle_bundle>.*?)"\s*\)|'
-    r'LocalizedWithBundle\(\s*"(?P<bundle_value>.+?)",\s*"(?P<bundle_comment>.*?)",\s*"(?P<bundle_bundle>.*?)"\s*\)|'
-    r'LocalizedWithKeyExtension\(\s*"(?P<ext_value>.+?)",\s*"(?P<ext_comment>.*?)",\s*"(?P<ext_extension>.*?)"\s*\)|'
-    r'Localized\(\s*"(?P<basic_value>.+?)",\s*"(?P<basic_comment>.*?)"\s*\)|'
-    # Invalid pattern - catch any Localized call that doesn't match above
-    r"(?P<invalid>Localized(?:WithKeyExtension|WithBundle|WithKeyExtensionAndBundle)?\([^)]+\))"
-    r")"
-)
+# Files at least this large are memory mapped rather than read into memory
+_MMAP_MINIMUM_BYTES = 1024 * 1024
 
-# Objective-C combined pattern - matches both VALID and INVALID calls
-# Valid calls populate named groups, invalid calls populate the 'invalid' group
-_OBJC_COMBINED_PATTERN: Pattern = re.compile(
-    r"(?:"
-    # Valid patterns with named groups
-    r'LocalizedWithKeyExtensionAndBundle\(\s*@"(?P<ext_bundle_value>.+?)",\s*@"(?P<ext_bundle_comment>.*?)",\s*@"(?P<ext_bundle_extension>.*?)",\s*@"(?P<ext_bundle_bundle>.*?)"\s*\)|'
-    r'LocalizedWithBundle\(\s*@"(?P<bundle_value>.+?)",\s*@"(?P<bundle_comment>.*?)",\s*@"(?P<bundle_bundle>.*?)"\s*\)|'
-    r'LocalizedWithKeyExtension\(\s*@"(?P<ext_value>.+?)",\s*@"(?P<ext_comment>.*?)",\s*@"(?P<ext_extension>.*?)"\s*\)|'
-    r'Localized\(\s*@"(?P<basic_value>.+?)",\s*@"(?P<basic_comment>.*?)"\s*\)|'
-    # Invalid pattern - catch any Localized call that doesn't match above
-    r"(?P<invalid>Localized(?:WithKeyExtension|WithBundle|WithKeyExtensionAndBundle)?\([^)]+\))"
-    r")"
-)
+# Every call the patterns above can match (valid or invalid) contains this
+# token, so files without it can skip pattern matching entirely
+_LOCALIZED_TOKEN = b"Localized"
+
+
+# The fields of a detected string: (value, comment, key_extension, bundle).
+# The language and table are the same for every detected string and the key is
+# derived from the value and key extension, so this is all that needs to be
+# stored or sent between processes.
+StringEntry = Tuple[str, Optional[str], Optional[str], str]
+
+# The result of scanning one file: its entries and whether it was skipped by
+# the prefilter. None if the file could not be processed or was skipped.
+_FileResult = Optional[Tuple[List[StringEntry], bool]]
+
+
+def localized_string_from_entry(entry: StringEntry) -> LocalizedString:
+    """Create the localized string for a detected entry.
+
+    :param entry: The detected entry
+
+    :returns: The localized string
+    """
+
+    value, comment, key_extension, bundle = entry
+    return LocalizedString(
+        key=None,
+        value=value,
+        language="en",
+        table="LocalizedStringKit",
+        comment=comment,
+        key_extension=key_extension,
+        bundle=bundle,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled(source: Any) -> Pattern:
+    """Compile a detection pattern, once.
+
+    :param source: The source of the pattern, as text or bytes
+
+    :returns: The compiled pattern
+    """
+    return re.compile(source)
+
+
+def detection_pattern_sources() -> Tuple[Any, ...]:
+    """Get the sources of the patterns used to detect localized calls, without compiling them.
+
+    :returns: The source of the detection patterns for every supported language
+    """
+    return (
+        patterns.SWIFT_COMBINED,
+        patterns.OBJC_COMBINED,
+        patterns.SWIFT_BYTES,
+        patterns.OBJC_BYTES,
+    )
+
+
+def detection_patterns() -> Tuple[Pattern, ...]:
+    """Get the patterns used to detect localized calls.
+
+    :returns: The detection patterns for every supported language
+    """
+    return tuple(_compiled(source) for source in detection_pattern_sources())
+
+
+def _collect_entries(
+    file_path: str,
+    contents: Union[str, bytes, mmap.mmap],
+    combined_pattern: Pattern,
+    decode: Callable[[Any], str],
+) -> List[StringEntry]:
+    """Find all matching localized calls using a combined pattern with named groups.
+
+    This makes a single pass through the contents. The pattern matches both
+    valid calls (with proper string literals) and invalid calls (with variables/expressions).
+    Valid calls populate specific named groups, while invalid calls populate the 'invalid' group.
+
+    The contents may be text (with a text pattern) or bytes, including a memory
+    mapped file (with a bytes pattern). Only the matched groups are decoded.
+
+    :param file_path: The path of the file the contents are from
+    :param contents: The contents to search
+    :param combined_pattern: Combined pattern with named groups for all variants
+    :param decode: Converts a matched group to the final text
+
+    :returns: The list of localized string entries
+
+    :raises InvalidLocalizedCallException: If there are Localized calls with non-string arguments
+    """
+
+    results: List[StringEntry] = []
+    invalid_calls = []
+    # Text and bytes contents need separators of their own type
+    is_text = isinstance(contents, str)
+    newline: Any = "\n" if is_text else b"\n"
+    function_prefix: Any = "func " if is_text else b"func "
+
+    # Extract valid calls AND detect invalid calls in one iteration
+    for match in combined_pattern.finditer(contents):
+        groupdict = match.groupdict()
+
+        if groupdict.get("invalid"):
+            # Skip function definitions (check the line for 'func')
+            line_start = contents.rfind(newline, 0, match.start()) + 1
+            line_end = contents.find(newline, match.start())
+            if line_end == -1:
+                line_end = len(contents)
+            line = contents[line_start:line_end].strip()
+
+            if not line.startswith(function_prefix):
+                invalid_calls.append(decode(groupdict["invalid"]))
+        elif groupdict.get("ext_bundle_value") is not None:
+            # LocalizedWithKeyExtensionAndBundle - 4 params
+            results.append(
+                (
+                    decode(groupdict["ext_bundle_value"]),
+                    decode(groupdict["ext_bundle_comment"]),
+                    decode(groupdict["ext_bundle_extension"]),
+                    decode(groupdict["ext_bundle_bundle"]),
+                )
+            )
+        elif groupdict.get("bundle_value") is not None:
+            # LocalizedWithBundle - 3 params (value, comment, bundle)
+            results.append(
+                (
+                    decode(groupdict["bundle_value"]),
+                    decode(groupdict["bundle_comment"]),
+                    None,
+                    decode(groupdict["bundle_bundle"]),
+                )
+            )
+        elif groupdict.get("ext_value") is not None:
+            # LocalizedWithKeyExtension - 3 params (value, comment, extension)
+            results.append(
+                (
+                    decode(groupdict["ext_value"]),
+                    decode(groupdict["ext_comment"]),
+                    decode(groupdict["ext_extension"]),
+                    "LocalizedStringKit.bundle",
+                )
+            )
+        elif groupdict.get("basic_value") is not None:
+            # Localized - 2 params (value, comment)
+            results.append(
+                (
+                    decode(groupdict["basic_value"]),
+                    decode(groupdict["basic_comment"]),
+                    None,
+                    "LocalizedStringKit.bundle",
+                )
+            )
+
+    # After the single pass, check if we found any invalid calls
+    _check_invalid_calls(file_path, invalid_calls)
+
+    return results
+
+
+def _check_invalid_calls(file_path: str, invalid_calls: List[str]) -> None:
+    """Fail if any invalid calls were found in a file.
+
+    :param file_path: The path of the file the calls are from
+    :param invalid_calls: The source of the invalid calls
+
+    :raises InvalidLocalizedCallException: If there are any invalid calls
+    """
+
+    if invalid_calls:
+        raise InvalidLocalizedCallException(
+            f"Found invalid calls to Localized in file: {file_path}. "
+            f"Ensure all arguments are string literals (not variables or expressions). "
+            f"Invalid calls: {invalid_calls[:3]}"  # Show first 3 to avoid overwhelming output
+        )
+
+
+def _check_engine(engine: str) -> None:
+    """Check that an extraction engine is supported.
+
+    :param engine: The name of the engine
+
+    :raises ValueError: If the engine is unknown
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown extraction engine: {engine}. Expected one of {ENGINES}")
 
 
 class Detector:
@@ -51,29 +250,40 @@ class Detector:
     contents: str
     sanitized_contents: str
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, contents: Optional[str] = None) -> None:
         """Create a new detector.
 
         :param file_path: The path to the file to detect the strings in
+        :param contents: The contents of the file, if already read (default: None)
         """
         self.file_path = file_path
 
-        with open(file_path, "r", encoding="utf-8") as file_contents:
-            self.contents = file_contents.read()
+        if contents is None:
+            with open(file_path, "r", encoding="utf-8") as file_contents:
+                contents = file_contents.read()
+
+        self.contents = contents
 
         self.sanitized_contents = self.contents.replace(
             Detector.QUOTE_ESCAPE_SEQUENCE, Detector.TEMPORARY_ESCAPE_SEQUENCE
         )
 
-    def find_strings(self) -> List[LocalizedString]:
-        """Method which finds localized strings in files.
+    def find_entries(self) -> List[StringEntry]:
+        """Method which finds localized string entries in files.
 
         This should be overridden by each subclass.
 
-        :returns: List of localized strings in the code file
+        :returns: List of localized string entries in the code file
         """
         raise NotImplementedError()
 
+    def find_strings(self) -> List[LocalizedString]:
+        """Find the localized strings in the file.
+
+        :returns: List of localized strings in the code file
+        """
+        return [localized_string_from_entry(entry) for entry in self.find_entries()]
+
     def restore_quotes(self, text: str) -> Optional[str]:
         """Restore original quotes in the text by replacing the temporary escape sequence.
 
@@ -83,205 +293,584 @@ class Detector:
         """
         if text is None:
             return None
+        return Detector._restore(text)
+
+    @staticmethod
+    def _restore(text: str) -> str:
+        """Restore original quotes in a matched group.
+
+        :param text: The text to restore quotes in
+
+        :returns: The text with quotes restored
+        """
         return text.replace(
             Detector.TEMPORARY_ESCAPE_SEQUENCE,
             Detector.QUOTE_ESCAPE_SEQUENCE,
         )
 
-    def _detect_strings(self, combined_pattern: Pattern) -> List[LocalizedString]:
+    def _detect_entries(self, combined_pattern: Pattern) -> List[StringEntry]:
         """Find all matching localized calls using a combined pattern with named groups.
 
-        This method makes a single pass through the file. The pattern matches both
-        valid calls (with proper string literals) and invalid calls (with variables/expressions).
-        Valid calls populate specific named groups, while invalid calls populate the 'invalid' group.
-
         :param combined_pattern: Combined pattern with named groups for all variants
 
-        :returns: The list of localized strings
+        :returns: The list of localized string entries
 
         :raises InvalidLocalizedCallException: If there are Localized calls with non-string arguments
         """
 
-        results = []
-        invalid_calls = []
-
-        # Extract valid calls AND detect invalid calls in one iteration
-        for match in combined_pattern.finditer(self.sanitized_contents):
-            groupdict = match.groupdict()
-
-            if groupdict.get("invalid"):
-                # Skip function definitions (check the line for 'func')
-                line_start = self.sanitized_contents.rfind("\n", 0, match.start()) + 1
-                line_end = self.sanitized_contents.find("\n", match.start())
-                if line_end == -1:
-                    line_end = len(self.sanitized_contents)
-                line = self.sanitized_contents[line_start:line_end].strip()
-
-                if not line.startswith("func "):
-                    invalid_calls.append(groupdict["invalid"])
-            elif groupdict.get("ext_bundle_value") is not None:
-                # LocalizedWithKeyExtensionAndBundle - 4 params
-                results.append(
-                    LocalizedString(
-                        key=None,
-                        value=self.restore_quotes(groupdict["ext_bundle_value"]),
-                        language="en",
-                        table="LocalizedStringKit",
-                        comment=self.restore_quotes(groupdict["ext_bundle_comment"]),
-                        key_extension=self.restore_quotes(groupdict["ext_bundle_extension"]),
-                        bundle=self.restore_quotes(groupdict["ext_bundle_bundle"]),
-                    )
-                )
-            elif groupdict.get("bundle_value") is not None:
-                # LocalizedWithBundle - 3 params (value, comment, bundle)
-                results.append(
-                    LocalizedString(
-                        key=None,
-                        value=self.restore_quotes(groupdict["bundle_value"]),
-                        language="en",
-                        table="LocalizedStringKit",
-                        comment=self.restore_quotes(groupdict["bundle_comment"]),
-                        key_extension=None,
-                        bundle=self.restore_quotes(groupdict["bundle_bundle"]),
-                    )
-                )
-            elif groupdict.get("ext_value") is not None:
-                # LocalizedWithKeyExtension - 3 params (value, comment, extension)
-                results.append(
-                    LocalizedString(
-                        key=None,
-                        value=self.restore_quotes(groupdict["ext_value"]),
-                        language="en",
-                        table="LocalizedStringKit",
-                        comment=self.restore_quotes(groupdict["ext_comment"]),
-                        key_extension=self.restore_quotes(groupdict["ext_extension"]),
-                        bundle="LocalizedStringKit.bundle",
-                    )
-                )
-            elif groupdict.get("basic_value") is not None:
-                # Localized - 2 params (value, comment)
-                results.append(
-                    LocalizedString(
-                        key=None,
-                        value=self.restore_quotes(groupdict["basic_value"]),
-                        language="en",
-                        table="LocalizedStringKit",
-                        comment=self.restore_quotes(groupdict["basic_comment"]),
-                        key_extension=None,
-                        bundle="LocalizedStringKit.bundle",
-                    )
-                )
-
-        # After the single pass, check if we found any invalid calls
-        if invalid_calls:
-            raise InvalidLocalizedCallException(
-                f"Found invalid calls to Localized in file: {self.file_path}. "
-                f"Ensure all arguments are string literals (not variables or expressions). "
-                f"Invalid calls: {invalid_calls[:3]}"  # Show first 3 to avoid overwhelming output
-            )
-
-        return results
+        return _collect_entries(
+            self.file_path, self.sanitized_contents, combined_pattern, Detector._restore
+        )
 
 
 class SwiftDetector(Detector):
     """Detect localized strings in Swift code files."""
 
-    def find_strings(self) -> List[LocalizedString]:
+    def find_entries(self) -> List[StringEntry]:
         """Find all matching localized calls with a key specified in the buffer.
 
         Uses a combined pattern with named groups for optimal performance -
         single pass through the file instead of multiple passes.
 
-        :returns: The list of localized strings
+        :returns: The list of localized string entries
         """
-        return self._detect_strings(_SWIFT_COMBINED_PATTERN)
+        return self._detect_entries(_compiled(patterns.SWIFT_COMBINED))
 
 
 class ObjcDetector(Detector):
     """Detect localized strings in Objective-C code files."""
 
-    def find_strings(self) -> List[LocalizedString]:
+    def find_entries(self) -> List[StringEntry]:
         """Find all matching localized calls with a key specified in the buffer.
 
         Uses a combined pattern with named groups for optimal performance -
         single pass through the file instead of multiple passes.
 
-        :returns: The list of localized strings
+        :returns: The list of localized string entries
         """
-        return self._detect_strings(_OBJC_COMBINED_PATTERN)
+        return self._detect_entries(_compiled(patterns.OBJC_COMBINED))
+
+
+def _detector_class(file_path: str) -> Type[Detector]:
+    """Get the detector to use for a file.
+
+    :param file_path: The file to get the detector for
+
+    :returns: The detector class for the file's language
+
+    :raises UnsupportedFileTypeError: If the file is an unknown type
+    """
+
+    if file_path.endswith(".swift"):
+        return SwiftDetector
+    if file_path.endswith(".m"):
+        return ObjcDetector
+
+    raise UnsupportedFileTypeError(f"Unknown file type: {file_path}")
+
+
+def _decode_group(group: bytes) -> str:
+    """Decode a group matched by one of the bytes patterns.
+
+    :param group: The matched group
+
+    :returns: The decoded text
+    """
+    return group.decode("utf-8")
+
+
+def _scan_contents(
+    file_path: str,
+    contents: Union[bytes, mmap.mmap],
+    engine: str,
+    stats: Optional[Stats] = None,
+) -> Tuple[List[StringEntry], bool]:
+    """Find all tokens we should localize in the raw contents of a file.
+
+    :param file_path: The file the contents are from
+    :param contents: The raw contents of the file
+    :param engine: The extraction engine to use (see `ENGINES`)
+    :param stats: The stats to time the prefilter and matching in
+
+    :returns: The list of found entries, and whether the file was skipped by the prefilter
+    """
+
+    with phase(stats, "prefilter"):
+        if contents.find(_LOCALIZED_TOKEN) == -1:
+            return [], True
+
+    is_swift = _detector_class(file_path) is SwiftDetector
+
+    with phase(stats, "match"):
+        if engine == "lexer":
+            # pylint: disable=import-outside-toplevel
+            from localizedstringkit import lexer
+
+            entries, invalid_calls = lexer.find_entries(
+                bytes(contents).decode("utf-8"), not is_swift
+            )
+            _check_invalid_calls(file_path, invalid_calls)
+            return entries, False
+
+        pattern = _compiled(patterns.SWIFT_BYTES if is_swift else patterns.OBJC_BYTES)
+        return _collect_entries(file_path, contents, pattern, _decode_group), False
+
+
+def _read_and_scan_file(
+    file_path: str, engine: str, stats: Optional[Stats]
+) -> Tuple[List[StringEntry], bool]:
+    """Find all tokens we should localize, skipping files which can't contain any.
+
+    With the regex engine the file is scanned as bytes, so only the matched
+    groups are decoded. Large files are memory mapped rather than read into
+    memory, so their reads are timed as part of the prefilter.
+
+    :param file_path: The file to scan for localized strings
+    :param engine: The extraction engine to use (see `ENGINES`)
+    :param stats: The stats to time the scan and count the bytes read in, if any
 
+    :returns: The list of found entries, and whether the file was skipped by the prefilter
+    """
+
+    log.debug("Finding localized strings in file: %s", file_path)
+
+    # Fail early for unsupported files, before opening them
+    _detector_class(file_path)
+
+    with open(file_path, "rb") as code_file:
+        file_size = os.fstat(code_file.fileno()).st_size
+        if stats is not None:
+            stats.increment("bytes_read", file_size)
+
+        if file_size < _MMAP_MINIMUM_BYTES:
+            with phase(stats, "read"):
+                contents = code_file.read()
+            return _scan_contents(file_path, contents, engine, stats)
 
-def strings_in_code_file(file_path: str) -> List[LocalizedString]:
+        with mmap.mmap(code_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_contents:
+            return _scan_contents(file_path, mapped_contents, engine, stats)
+
+
+def _scan_file(
+    file_path: str, engine: str = "regex", stats: Optional[Stats] = None
+) -> Tuple[List[StringEntry], bool]:
+    """Find all tokens we should localize, profiling the file if asked to.
+
+    :param file_path: The file to scan for localized strings
+    :param engine: The extraction engine to use (see `ENGINES`)
+    :param stats: The stats to time the scan in, and record the file's profile in if they
+                  report the slowest files
+
+    :returns: The list of found entries, and whether the file was skipped by the prefilter
+    """
+
+    if stats is None or stats.slowest_files <= 0:
+        return _read_and_scan_file(file_path, engine, stats)
+
+    # Stats are only collected by one thread per process, so the changes in the
+    # totals are this file's
+    read_time = stats.wall_time("read")
+    bytes_read = stats.counters.get("bytes_read", 0)
+    started = time.perf_counter()
+
+    entries, skipped = _read_and_scan_file(file_path, engine, stats)
+
+    elapsed = time.perf_counter() - started
+    read_time = stats.wall_time("read") - read_time
+    stats.record_file(
+        file_path,
+        size=stats.counters.get("bytes_read", 0) - bytes_read,
+        read=read_time,
+        scan=elapsed - read_time,
+        matches=len(entries),
+    )
+    return entries, skipped
+
+
+def strings_in_code_file(file_path: str, engine: str = "regex") -> List[LocalizedString]:
     """Find all tokens we should localize.
 
     :param file_path: The file to scan for localized strings
+    :param engine: The extraction engine to use, one of `ENGINES` (default: regex). The lexer
+                   ignores calls in comments and supports Swift raw and multi-line literals.
 
     :returns: The list of found localized strings
 
     :raises UnsupportedFileTypeError: If the file is an unknown type
+    :raises ValueError: If the engine is unknown
     """
 
-    log.debug("Finding localized strings in file: %s", file_path)
+    _check_engine(engine)
+    entries, _ = _scan_file(file_path, engine)
+    return [localized_string_from_entry(entry) for entry in entries]
 
-    file_detector: Optional[Detector] = None
 
-    if file_path.endswith(".swift"):
-        file_detector = SwiftDetector(file_path)
-    elif file_path.endswith(".m"):
-        file_detector = ObjcDetector(file_path)
+def _scan_file_within_budget(
+    file_path: str, engine: str, stats: Optional[Stats], budget: Optional["TimeBudget"]
+) -> _FileResult:
+    """Scan a file, handling it as the time budget says if it takes too long.
+
+    :param file_path: The file to scan
+    :param engine: The extraction engine to use
+    :param stats: The stats to time the scan in
+    :param budget: The time the scan may take, if it is limited
+
+    :raises ScanTimeoutException: If the scan ran out of time and the budget says to fail
+
+    :returns: The list of found entries and whether the file was skipped by the
+              prefilter, or None if the scan ran out of time and the file was skipped
+    """
+
+    if budget is None:
+        return _scan_file(file_path, engine, stats)
+
+    try:
+        with budget.limit(file_path):
+            return _scan_file(file_path, engine, stats)
+    except ScanTimeoutException as exception:
+        if stats is not None:
+            stats.increment("files_timed_out")
+
+        if budget.on_timeout == "fail":
+            raise
+
+        # The lexer runs in linear time, so it can't get stuck like a pattern can
+        if budget.on_timeout == "lexer" and engine != "lexer":
+            log.warning("%s, scanning it with the lexer instead", exception)
+            return _scan_file(file_path, "lexer", stats)
+
+        log.warning("%s, skipping it", exception)
+        return None
+
+
+def _uncached_files(
+    code_files: Iterable[str],
+    cache: "ExtractionCache",
+    entries_by_file: Dict[str, List[StringEntry]],
+) -> Iterator[str]:
+    """Filter out the files with valid cached results.
+
+    :param code_files: The file paths to look up
+    :param cache: The extraction cache to look the files up in
+    :param entries_by_file: Receives the cached entries of each filtered out file
+
+    :returns: An iterator of the files which need scanning
+    """
+
+    for file_path in code_files:
+        cached_entries = cache.get(file_path)
+        if cached_entries is None:
+            yield file_path
+        else:
+            entries_by_file[file_path] = cached_entries
+
+    log.debug("Extraction cache: %d hit(s), %d miss(es)", cache.hits, cache.misses)
+
+
+def _scan_files(
+    file_paths: Iterable[str],
+    parallel: bool,
+    max_workers: Optional[int],
+    chunk_size: Optional[int],
+    engine: str,
+    *,
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+    worker_pool: Optional[Callable[[], "Executor"]] = None,
+) -> Iterator[Tuple[str, _FileResult]]:
+    """Scan files, sequentially or in parallel depending on the amount of code.
+
+    The file paths may be a lazily evaluated iterable, such as the output of a
+    file search which is still running. In that case scanning starts as soon
+    as enough files have been found to make parallel processing worthwhile.
+
+    :param file_paths: The files to scan
+    :param parallel: Whether parallel processing is allowed
+    :param max_workers: Maximum number of parallel workers (None for CPU count)
+    :param chunk_size: Maximum number of files sent to a worker at once (None for automatic)
+    :param engine: The extraction engine to use
+    :param stats: The stats to time the scans in
+    :param budget: The time each file's scan may take, if it is limited
+    :param worker_pool: Get the long lived pool of workers to scan in, rather than starting
+                        workers for this scan. Only called if there is enough code to scan
+                        in parallel.
+
+    :returns: An iterator of each file path with its scan result (see `_process_single_file`),
+              in the original order of the files
+    """
+
+    file_iterator = iter(file_paths)
+
+    if not parallel:
+        for file_path in file_iterator:
+            yield file_path, _scan_file_within_budget(file_path, engine, stats, budget)
+        return
+
+    # Buffer files until there is enough code to be worth scanning in parallel
+    buffered_files: List[Tuple[str, int]] = []
+    total_bytes = 0
+
+    for file_path in file_iterator:
+        file_size = chunking.file_size(file_path)
+        buffered_files.append((file_path, file_size))
+        total_bytes += file_size
+
+        if chunking.should_scan_in_parallel(len(buffered_files), total_bytes, max_workers):
+            break
     else:
-        raise UnsupportedFileTypeError(f"Unknown file type: {file_path}")
+        # For small amounts of code, sequential is faster due to no overhead
+        for file_path, _ in buffered_files:
+            yield file_path, _scan_file_within_budget(file_path, engine, stats, budget)
+        return
+
+    sized_files = itertools.chain(
+        buffered_files, ((file_path, chunking.file_size(file_path)) for file_path in file_iterator)
+    )
+
+    # The worker pool needs multiprocessing, which is slow to import and not
+    # needed for small or fully cached runs
+    # pylint: disable=import-outside-toplevel
+    from localizedstringkit import parallel as parallel_scanning
+
+    yield from parallel_scanning.scan_files_in_parallel(
+        sized_files,
+        len(file_paths) if isinstance(file_paths, Sized) else None,
+        max_workers,
+        chunk_size,
+        engine,
+        stats=stats,
+        budget=budget,
+        executor=None if worker_pool is None else worker_pool(),
+    )
+
+
+def _record_scan_counts(stats: Stats, counts: Dict[str, int], match_count: int) -> None:
+    """Record the counts of a scan of code files.
+
+    :param stats: The stats to record the counts in
+    :param counts: The number of files in each state (scanned, prefiltered, failed or cached)
+    :param match_count: The number of entries found, including duplicates
+    """
 
-    return file_detector.find_strings()
+    for state, count in counts.items():
+        stats.increment(f"files_{state}", count)
+    stats.increment("matches", match_count)
 
 
-def _process_single_file(file_path: str) -> List[LocalizedString]:
-    """Process a single file for parallel execution.
+def _ordered_entries(
+    code_files: Iterable[str], entries_by_file: Dict[str, List[StringEntry]]
+) -> List[StringEntry]:
+    """Combine the entries of each file, in the order of the files.
 
-    :param file_path: The file to scan
-    :returns: The list of found localized strings
+    :param code_files: The file paths which were scanned
+    :param entries_by_file: The entries found in each file (see `entries_by_code_file`)
+
+    :returns: The entries, in the order of `code_files` if it is a sequence, or otherwise in
+              the sorted order of the files (as the order of a streamed file search is not
+              deterministic)
     """
-    try:
-        return strings_in_code_file(file_path)
-    except (IOError, InvalidLocalizedCallException, UnsupportedFileTypeError) as exception:
-        log.error("Error processing %s: %s", file_path, exception)
-        return []
 
+    ordered_files = code_files if isinstance(code_files, Sequence) else sorted(entries_by_file)
+    return [entry for file_path in ordered_files for entry in entries_by_file.get(file_path, [])]
+
+
+def entries_by_code_file(  # pylint: disable=too-many-arguments
+    code_files: Iterable[str],
+    parallel: bool = True,
+    max_workers: Optional[int] = None,
+    cache: Optional["ExtractionCache"] = None,
+    chunk_size: Optional[int] = None,
+    *,
+    engine: str = "regex",
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+    worker_pool: Optional[Callable[[], "Executor"]] = None,
+) -> Dict[str, List[StringEntry]]:
+    """Return the entries found in each of a list of code files.
+
+    This is the basis of `strings_in_code_files`, for callers which need to
+    know which file each entry came from, such as to share one scan between
+    several sets of files.
+
+    :param code_files: The file paths to find the entries in. This may be a lazily evaluated
+                       iterable, such as `files.iter_localizable_files`
+    :param parallel: Whether to process files in parallel (default: True)
+    :param max_workers: Maximum number of parallel workers (default: CPU count)
+    :param cache: The extraction cache to reuse unchanged files' results from (default: None)
+    :param chunk_size: Maximum number of files sent to a worker at once (default: automatic)
+    :param engine: The extraction engine to use, one of `ENGINES` (default: regex)
+    :param stats: The stats to record timings and counters in (default: None)
+    :param budget: The time each file's scan may take, if it is limited (default: unlimited)
+    :param worker_pool: Get the long lived pool of workers to scan in (see `_scan_files`)
+
+    :returns: The entries found in each file, in the order they appear in it. Files which
+              could not be scanned are left out.
+
+    :raises ValueError: If the engine is unknown, or the cache holds another engine's results
+    """
+
+    _check_engine(engine)
+    if cache is not None and cache.engine != engine:
+        raise ValueError(f"The cache holds {cache.engine} engine results, not {engine}")
+
+    entries_by_file: Dict[str, List[StringEntry]] = {}
+    # Time spent waiting for a lazy file search is the cost of discovering the files
+    files_to_scan = code_files if stats is None else stats.timed("discovery", code_files)
+
+    if cache is not None:
+        files_to_scan = _uncached_files(files_to_scan, cache, entries_by_file)
+
+    # The number of files scanned, skipped by the prefilter and which failed
+    counts = collections.Counter({"scanned": 0, "prefiltered": 0, "failed": 0})
+
+    for file_path, result in _scan_files(
+        files_to_scan,
+        parallel,
+        max_workers,
+        chunk_size,
+        engine,
+        stats=stats,
+        budget=budget,
+        worker_pool=worker_pool,
+    ):
+        counts["scanned"] += 1
+        if result is None:
+            counts["failed"] += 1
+            continue
+
+        entries_by_file[file_path] = result[0]
+        counts["prefiltered"] += result[1]
+        if cache is not None:
+            cache.set(file_path, result[0])
+
+    if counts["scanned"]:
+        log.debug(
+            "Prefilter skipped %d of %d scanned file(s) (%.1f%%)",
+            counts["prefiltered"],
+            counts["scanned"],
+            100.0 * counts["prefiltered"] / counts["scanned"],
+        )
 
-def strings_in_code_files(
-    code_files: List[str], parallel: bool = True, max_workers: Optional[int] = None
+    if cache is not None:
+        cache.record_files(
+            list(code_files) if isinstance(code_files, Sequence) else sorted(entries_by_file)
+        )
+        cache.save()
+
+    if stats is not None:
+        counts["cached"] = len(entries_by_file) - (counts["scanned"] - counts["failed"])
+        _record_scan_counts(
+            stats, counts, sum(len(entries) for entries in entries_by_file.values())
+        )
+
+    return entries_by_file
+
+
+def strings_in_code_files(  # pylint: disable=too-many-arguments
+    code_files: Iterable[str],
+    parallel: bool = True,
+    max_workers: Optional[int] = None,
+    cache: Optional["ExtractionCache"] = None,
+    chunk_size: Optional[int] = None,
+    *,
+    engine: str = "regex",
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+    worker_pool: Optional[Callable[[], "Executor"]] = None,
 ) -> List[LocalizedString]:
     """Return the localized strings in a list of code files.
 
-    :param code_files: The list of file paths to generate the localized strings for
+    The strings are returned in the order of the files they were found in (or
+    the sorted order of the files if `code_files` is not a sequence),
+    regardless of the order in which parallel workers complete.
+
+    :param code_files: The file paths to generate the localized strings for. This may be a
+                       lazily evaluated iterable, such as `files.iter_localizable_files`
     :param parallel: Whether to process files in parallel (default: True)
     :param max_workers: Maximum number of parallel workers (default: CPU count)
+    :param cache: The extraction cache to reuse unchanged files' results from (default: None)
+    :param chunk_size: Maximum number of files sent to a worker at once (default: automatic)
+    :param engine: The extraction engine to use, one of `ENGINES` (default: regex). A cache
+                   only holds the results of the engine it was created for.
+    :param stats: The stats to record timings and counters in (default: None)
+    :param budget: The time each file's scan may take, and what to do with files which run
+                   out of time (default: unlimited)
+    :param worker_pool: Get the long lived pool of workers to scan in, such as that of a
+                        `scanner.Scanner`, rather than starting workers for this scan
+                        (default: None)
 
     :returns: The list of localized strings from the codebase
     """
 
-    strings: List[LocalizedString] = []
-
-    # For small number of files, sequential is faster due to no overhead
-    if len(code_files) <= 100 or not parallel:
-        for file_path in code_files:
-            strings += strings_in_code_file(file_path)
-        return strings
-
-    # Parallel processing for larger file sets
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all files for processing
-        future_to_file = {
-            executor.submit(_process_single_file, file_path): file_path for file_path in code_files
-        }
-
-        # Collect results as they complete
-        for future in as_completed(future_to_file):
-            file_path = future_to_file[future]
-            try:
-                file_strings = future.result()
-                strings += file_strings
-            except (IOError, InvalidLocalizedCallException, UnsupportedFileTypeError) as exception:
-                log.error("Error processing %s: %s", file_path, exception)
-
-    return strings
+    entries = _ordered_entries(
+        code_files,
+        entries_by_code_file(
+            code_files,
+            parallel,
+            max_workers,
+            cache,
+            chunk_size,
+            engine=engine,
+            stats=stats,
+            budget=budget,
+            worker_pool=worker_pool,
+        ),
+    )
+    return [localized_string_from_entry(entry) for entry in entries]
+
+
+def unique_strings_in_code_files(  # pylint: disable=too-many-arguments
+    code_files: Iterable[str],
+    parallel: bool = True,
+    max_workers: Optional[int] = None,
+    cache: Optional["ExtractionCache"] = None,
+    chunk_size: Optional[int] = None,
+    *,
+    engine: str = "regex",
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+    worker_pool: Optional[Callable[[], "Executor"]] = None,
+) -> List[LocalizedString]:
+    """Return the distinct localized strings in a list of code files.
+
+    This is equivalent to deduplicating the result of `strings_in_code_files`,
+    but only creates a localized string for each distinct entry.
+
+    :param code_files: The file paths to generate the localized strings for. This may be a
+                       lazily evaluated iterable, such as `files.iter_localizable_files`
+    :param parallel: Whether to process files in parallel (default: True)
+    :param max_workers: Maximum number of parallel workers (default: CPU count)
+    :param cache: The extraction cache to reuse unchanged files' results from (default: None)
+    :param chunk_size: Maximum number of files sent to a worker at once (default: automatic)
+    :param engine: The extraction engine to use, one of `ENGINES` (default: regex). A cache
+                   only holds the results of the engine it was created for.
+    :param stats: The stats to record timings and counters in (default: None)
+    :param budget: The time each file's scan may take, and what to do with files which run
+                   out of time (default: unlimited)
+    :param worker_pool: Get the long lived pool of workers to scan in, such as that of a
+                        `scanner.Scanner`, rather than starting workers for this scan
+                        (default: None)
+
+    :returns: The distinct localized strings from the codebase, in order of first appearance
+    """
+
+    entries = _ordered_entries(
+        code_files,
+        entries_by_code_file(
+            code_files,
+            parallel,
+            max_workers,
+            cache,
+            chunk_size,
+            engine=engine,
+            stats=stats,
+            budget=budget,
+            worker_pool=worker_pool,
+        ),
+    )
+
+    with phase(stats, "dedup"):
+        unique_entries = dict.fromkeys(entries)
+        if stats is not None:
+            stats.increment("duplicates", len(entries) - len(unique_entries))
+        return [localized_string_from_entry(entry) for entry in unique_entries]
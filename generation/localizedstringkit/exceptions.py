@@ -1,5 +1,7 @@
 """Localization exceptions."""
 
+from typing import Dict, List, Tuple
+
 
 class InvalidLocalizedCallException(Exception):
     """Raised if there is an invalid call to Localized."""
@@ -7,3 +9,68 @@ class InvalidLocalizedCallException(Exception):
 
 class UnsupportedFileTypeError(ValueError):
     """Raised when attempting to process an unsupported file type."""
+
+
+class StringsDictConflictException(Exception):
+    """Raised if new .stringsdict entries contradict the existing ones.
+
+    :param str file_path: The .stringsdict file with the conflicts
+    :param List[str] conflicts: A description of each conflicting entry
+    """
+
+    file_path: str
+    conflicts: List[str]
+
+    def __init__(self, file_path: str, conflicts: List[str]) -> None:
+        self.file_path = file_path
+        self.conflicts = conflicts
+        super().__init__(
+            f"{len(conflicts)} conflicting entries in {file_path}:\n" + "\n".join(conflicts)
+        )
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, List[str]]]:
+        # Raised when generating bundles in other processes, so it must survive being sent back
+        return (StringsDictConflictException, (self.file_path, self.conflicts))
+
+
+class BundleGenerationException(Exception):
+    """Raised if the output for one or more bundles could not be generated.
+
+    :param Dict[str, BaseException] failures: The error for each bundle which failed
+    """
+
+    failures: Dict[str, BaseException]
+
+    def __init__(self, failures: Dict[str, BaseException]) -> None:
+        self.failures = failures
+        super().__init__(
+            f"Failed to generate {len(failures)} bundle(s):\n"
+            + "\n".join(f"{bundle}: {error}" for bundle, error in failures.items())
+        )
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, BaseException]]]:
+        return (BundleGenerationException, (self.failures,))
+
+
+class DaemonException(Exception):
+    """Raised if the daemon can't be started or can't handle a request."""
+
+
+class ScanTimeoutException(Exception):
+    """Raised if scanning a file takes longer than its time budget.
+
+    :param str file_path: The file which was being scanned
+    :param float seconds: The time budget which was exceeded, in seconds
+    """
+
+    file_path: str
+    seconds: float
+
+    def __init__(self, file_path: str, seconds: float) -> None:
+        self.file_path = file_path
+        self.seconds = seconds
+        super().__init__(f"Scanning {file_path} took longer than {seconds:g} second(s)")
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, float]]:
+        # Raised in worker processes, so it must survive being sent to the parent
+        return (ScanTimeoutException, (self.file_path, self.seconds))
@@ -1,22 +1,41 @@
 """Utilities for dealing with localized strings."""
 
+import fnmatch
 import os
+import queue
 import shutil
 import subprocess
-from typing import List, Optional
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from localizedstringkit import logger
+from localizedstringkit.options import WALKERS
 
 log = logger.get()
 
 
+_SOURCE_FILE_EXTENSIONS = (".swift", ".m")
+
+# Maximum number of threads the Python walker uses to walk top level folders
+_MAXIMUM_WALKER_THREADS = 8
+
+# The most read from a file list at once. Reads return whatever is available,
+# so paths streamed through a pipe are used as soon as they are written.
+_FILE_LIST_BLOCK_SIZE = 64 * 1024
+
+
 def _is_ripgrep_available() -> bool:
     """Check if ripgrep is available on the system."""
 
     return shutil.which("rg") is not None
 
 
-def _build_ripgrep_command(root_path: str, excluded_folders: List[str]) -> List[str]:
+def _build_ripgrep_command(
+    root_path: str, excluded_folders: List[str], excluded_patterns: List[str]
+) -> List[str]:
     """Build a ripgrep command to find source files."""
 
     rg_cmd = ["rg", "--files", "--glob", "*.swift", "--glob", "*.m"]
@@ -27,21 +46,45 @@ def _build_ripgrep_command(root_path: str, excluded_folders: List[str]) -> List[
         # Exclude the directory and all its contents
         rg_cmd.extend(["--glob", f"!{rel_path}/"])
 
+    for pattern in excluded_patterns:
+        # ripgrep globs already follow .gitignore semantics
+        rg_cmd.extend(["--glob", f"!{pattern}"])
+
     rg_cmd.append(root_path)
     return rg_cmd
 
 
-def _build_find_command(root_path: str, excluded_folders: List[str]) -> List[str]:
+def _build_find_command(
+    root_path: str, excluded_folders: List[str], ignore_patterns: "_IgnorePatterns"
+) -> List[str]:
     """Build a find command that prunes excluded folders before file matching."""
 
     find_cmd = ["find", root_path]
 
-    if excluded_folders:
+    exclusions = [["-path", folder] for folder in excluded_folders]
+
+    for pattern, directories_only in ignore_patterns.name_patterns:
+        exclusions.append((["-type", "d"] if directories_only else []) + ["-name", pattern])
+
+    # find's -path lets wildcards match slashes, so only patterns without any
+    # are pruned here. The results are filtered by the rest (see `excludes`).
+    for pattern, directories_only in ignore_patterns.path_patterns:
+        if _is_glob(pattern):
+            continue
+        exclusions.append(
+            (["-type", "d"] if directories_only else [])
+            + ["-path", os.path.join(root_path, pattern)]
+        )
+
+    if exclusions:
         find_cmd.extend(["("])
-        for index, folder in enumerate(excluded_folders):
+        for index, exclusion in enumerate(exclusions):
             if index > 0:
                 find_cmd.extend(["-o"])
-            find_cmd.extend(["-path", folder])
+            if len(exclusion) > 2:
+                find_cmd.extend(["("] + exclusion + [")"])
+            else:
+                find_cmd.extend(exclusion)
         find_cmd.extend([")", "-prune", "-o"])
 
     find_cmd.extend(["-type", "f", "(", "-name", "*.swift", "-o", "-name", "*.m", ")", "-print"])
@@ -49,12 +92,580 @@ def _build_find_command(root_path: str, excluded_folders: List[str]) -> List[str
     return find_cmd
 
 
+def _is_glob(pattern: str) -> bool:
+    """Check if a pattern has any wildcards.
+
+    :param str pattern: The pattern to check
+
+    :returns: True if the pattern has wildcards, False if it only matches itself
+    """
+
+    return any(character in pattern for character in "*?[")
+
+
+def _matches_segments(pattern_segments: List[str], path_segments: List[str]) -> bool:
+    """Check if a path matches a pattern, one folder or file name at a time.
+
+    :param List[str] pattern_segments: The pattern split on slashes
+    :param List[str] path_segments: The path split on slashes
+
+    :returns: True if the path matches the pattern, False otherwise
+    """
+
+    if not pattern_segments:
+        return not path_segments
+
+    pattern_segment, remaining_segments = pattern_segments[0], pattern_segments[1:]
+
+    if pattern_segment == "**":
+        if not remaining_segments:
+            # A trailing ** matches everything inside the folder, but not the folder
+            return bool(path_segments)
+        return any(
+            _matches_segments(remaining_segments, path_segments[index:])
+            for index in range(len(path_segments) + 1)
+        )
+
+    return (
+        bool(path_segments)
+        and fnmatch.fnmatchcase(path_segments[0], pattern_segment)
+        and _matches_segments(remaining_segments, path_segments[1:])
+    )
+
+
+class _IgnorePatterns:
+    """A set of .gitignore style patterns to exclude paths with.
+
+    Patterns without a slash match a file or folder name at any depth.
+    Patterns containing a slash are matched against the path relative to the
+    root (a leading slash anchors them explicitly). Patterns ending in a slash
+    only match folders. As in .gitignore files, `*`, `?` and `[...]` never
+    match a slash, and a `**` segment matches any number of folders (e.g.
+    `**/Generated` or `Sources/**/*.m`). Negated patterns are not supported.
+
+    :param List[str] patterns: The patterns to exclude
+    """
+
+    name_patterns: List[Tuple[str, bool]]
+    path_patterns: List[Tuple[str, bool]]
+
+    _path_segments: List[Tuple[List[str], bool]]
+
+    def __init__(self, patterns: List[str]) -> None:
+        self.name_patterns = []
+        self.path_patterns = []
+        self._path_segments = []
+
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+
+            if pattern.startswith("!"):
+                raise ValueError(f"Negated exclusion patterns are not supported: {pattern}")
+
+            directories_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+
+            if "/" in pattern:
+                pattern = pattern.lstrip("/")
+                self.path_patterns.append((pattern, directories_only))
+                self._path_segments.append((pattern.split("/"), directories_only))
+            else:
+                self.name_patterns.append((pattern, directories_only))
+
+    def __bool__(self) -> bool:
+        return bool(self.name_patterns or self.path_patterns)
+
+    @property
+    def has_path_globs(self) -> bool:
+        """Whether any of the patterns containing a slash have wildcards.
+
+        :returns: True if any path pattern has wildcards, False otherwise
+        """
+        return any(_is_glob(pattern) for pattern, _ in self.path_patterns)
+
+    def matches(self, name: str, relative_path: str, is_directory: bool) -> bool:
+        """Check if a path is excluded by any of the patterns.
+
+        :param str name: The name of the file or folder
+        :param str relative_path: The path relative to the root, using / separators
+        :param bool is_directory: Whether the path is a folder
+
+        :returns: True if the path is excluded, False otherwise
+        """
+
+        for pattern, directories_only in self.name_patterns:
+            if (is_directory or not directories_only) and fnmatch.fnmatchcase(name, pattern):
+                return True
+
+        if not self._path_segments:
+            return False
+
+        path_segments = relative_path.split("/")
+
+        for pattern_segments, directories_only in self._path_segments:
+            if (is_directory or not directories_only) and _matches_segments(
+                pattern_segments, path_segments
+            ):
+                return True
+
+        return False
+
+    def excludes(self, relative_path: str) -> bool:
+        """Check if a file, or any of the folders it is in, is excluded by the patterns.
+
+        :param str relative_path: The path of the file relative to the root, using / separators
+
+        :returns: True if the file is excluded, False otherwise
+        """
+
+        components = relative_path.split("/")
+
+        return any(
+            self.matches(component, "/".join(components[: index + 1]), index < len(components) - 1)
+            for index, component in enumerate(components)
+        )
+
+
+def _list_folder(
+    root_path: str,
+    folder: str,
+    excluded_folders: FrozenSet[str],
+    ignore_patterns: _IgnorePatterns,
+) -> Tuple[List[str], List[str]]:
+    """List the source files and the folders to descend into in a folder.
+
+    Like `find -type f`, symbolic links are not followed or returned.
+
+    :param str root_path: The normalized root of the search
+    :param str folder: The normalized folder to list
+    :param FrozenSet[str] excluded_folders: The normalized paths of the folders to skip
+    :param _IgnorePatterns ignore_patterns: The patterns of paths to skip
+
+    :returns: A tuple of the source files and the folders which are not excluded
+    """
+
+    source_files: List[str] = []
+    folders: List[str] = []
+
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                is_directory = entry.is_dir(follow_symlinks=False)
+
+                if is_directory:
+                    if entry.path in excluded_folders:
+                        continue
+                elif not entry.name.endswith(_SOURCE_FILE_EXTENSIONS):
+                    continue
+                elif not entry.is_file(follow_symlinks=False):
+                    continue
+
+                if ignore_patterns:
+                    relative_path = ""
+                    if ignore_patterns.path_patterns:
+                        relative_path = os.path.relpath(entry.path, root_path).replace(os.sep, "/")
+                    if ignore_patterns.matches(entry.name, relative_path, is_directory):
+                        continue
+
+                if is_directory:
+                    folders.append(entry.path)
+                else:
+                    source_files.append(entry.path)
+    except OSError as ex:
+        log.debug(f"Unable to read folder {folder}: {ex}")
+
+    return source_files, folders
+
+
+def _walk_folder(
+    root_path: str,
+    folder: str,
+    excluded_folders: FrozenSet[str],
+    ignore_patterns: _IgnorePatterns,
+) -> Iterator[str]:
+    """Walk a folder with os.scandir, pruning excluded folders as they are reached.
+
+    :param str root_path: The normalized root of the search
+    :param str folder: The normalized folder to walk
+    :param FrozenSet[str] excluded_folders: The normalized paths of the folders to skip
+    :param _IgnorePatterns ignore_patterns: The patterns of paths to skip
+
+    :returns: An iterator of the source files in the folder
+    """
+
+    pending_folders = [folder]
+
+    while pending_folders:
+        source_files, folders = _list_folder(
+            root_path, pending_folders.pop(), excluded_folders, ignore_patterns
+        )
+        yield from source_files
+        pending_folders.extend(folders)
+
+
+def _walk(
+    root_path: str, excluded_folders: FrozenSet[str], ignore_patterns: _IgnorePatterns
+) -> Iterator[str]:
+    """Find source files with os.scandir, walking each top level folder in its own thread.
+
+    :param str root_path: The normalized path to start the search from
+    :param FrozenSet[str] excluded_folders: The normalized paths of the folders to skip
+    :param _IgnorePatterns ignore_patterns: The patterns of paths to skip
+
+    :raises FileNotFoundError: If the root path is not a folder
+
+    :returns: An iterator of the source files which are not excluded
+    """
+
+    if not os.path.isdir(root_path):
+        raise FileNotFoundError(f"The root path is not a folder: {root_path}")
+
+    source_files, top_level_folders = _list_folder(
+        root_path, root_path, excluded_folders, ignore_patterns
+    )
+    yield from source_files
+
+    if len(top_level_folders) <= 1:
+        for folder in top_level_folders:
+            yield from _walk_folder(root_path, folder, excluded_folders, ignore_patterns)
+        return
+
+    # Each thread sends batches of files, then None once it has finished
+    found_files: "queue.Queue[Optional[List[str]]]" = queue.Queue()
+    stop = threading.Event()
+
+    def walk_top_level_folder(folder: str) -> None:
+        batch: List[str] = []
+        try:
+            for file_path in _walk_folder(root_path, folder, excluded_folders, ignore_patterns):
+                if stop.is_set():
+                    return
+                batch.append(file_path)
+                if len(batch) >= 64:
+                    found_files.put(batch)
+                    batch = []
+            found_files.put(batch)
+        finally:
+            found_files.put(None)
+
+    thread_count = min(_MAXIMUM_WALKER_THREADS, len(top_level_folders))
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        futures = [executor.submit(walk_top_level_folder, folder) for folder in top_level_folders]
+
+        try:
+            remaining = len(futures)
+            while remaining:
+                batch = found_files.get()
+                if batch is None:
+                    remaining -= 1
+                else:
+                    yield from batch
+        finally:
+            # Stop the threads early if the caller stops iterating
+            stop.set()
+
+
+def _normalized_exclusions(root_path: str, excluded_folders: List[str]) -> List[str]:
+    """Normalize the excluded folders against a normalized root path.
+
+    The root prefix is kept exactly as the walkers print it so that a plain
+    string comparison matches (e.g. "./Folder" rather than "Folder" for a root
+    of ".").
+
+    :param str root_path: The normalized root of the search
+    :param List[str] excluded_folders: The folders to exclude, relative to the root
+
+    :returns: The normalized paths of the excluded folders
+    """
+
+    return [
+        os.path.join(
+            root_path, os.path.relpath(os.path.normpath(os.path.join(root_path, folder)), root_path)
+        )
+        for folder in excluded_folders
+        if folder.strip()
+    ]
+
+
+def filter_localizable_files(
+    file_paths: Iterable[str],
+    *,
+    root_path: str,
+    excluded_folders: Optional[List[str]] = None,
+    excluded_patterns: Optional[List[str]] = None,
+) -> List[str]:
+    """Filter a list of files down to those a search of the root path would find.
+
+    This applies the same rules as `localizable_files` with the Python walker
+    without walking the tree, which is useful when the set of changed files is
+    already known. Files which do not exist are dropped.
+
+    :param Iterable[str] file_paths: The file paths to filter
+    :param str root_path: The path the search would start from
+    :param Optional[List[str]] excluded_folders: The paths to any folders to
+                                                 exclude, relative to the root
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                  paths to exclude
+
+    :returns: The file paths which should be processed, in their original order
+    """
+
+    root_path = os.path.normpath(root_path)
+    excluded = frozenset(
+        os.path.normpath(folder)
+        for folder in _normalized_exclusions(root_path, excluded_folders or [])
+    )
+    ignore_patterns = _IgnorePatterns(excluded_patterns or [])
+
+    results = []
+
+    for file_path in file_paths:
+        if not file_path.endswith(_SOURCE_FILE_EXTENSIONS):
+            continue
+
+        if not os.path.isfile(file_path) or os.path.islink(file_path):
+            continue
+
+        relative_path = os.path.relpath(os.path.normpath(file_path), root_path)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            continue
+
+        components = relative_path.split(os.sep)
+        current_path = root_path
+        is_excluded = False
+
+        for index, component in enumerate(components):
+            current_path = os.path.normpath(os.path.join(current_path, component))
+            is_directory = index < len(components) - 1
+            if (is_directory and current_path in excluded) or ignore_patterns.matches(
+                component, "/".join(components[: index + 1]), is_directory
+            ):
+                is_excluded = True
+                break
+
+        if not is_excluded:
+            results.append(file_path)
+
+    return results
+
+
+def _select_walker(walker: Optional[str], use_ripgrep: bool) -> str:
+    """Decide which walker to search for files with.
+
+    :param Optional[str] walker: The requested walker, if any
+    :param bool use_ripgrep: Whether ripgrep was requested the legacy way
+
+    :raises ValueError: If the walker is unknown or unavailable
+
+    :returns: One of "python", "find" or "rg"
+    """
+
+    if walker is None:
+        return "rg" if use_ripgrep and _is_ripgrep_available() else "find"
+
+    if walker not in WALKERS:
+        raise ValueError(f"Unknown walker: {walker}")
+
+    if walker == "auto":
+        # ripgrep also applies .gitignore files and skips hidden files, which
+        # would change the results, so it is only used when asked for
+        return "python"
+
+    if walker == "rg" and not _is_ripgrep_available():
+        raise ValueError("The rg walker was requested but ripgrep is not installed")
+
+    return walker
+
+
+def _run_walker_command(cmd: List[str]) -> Iterator[str]:
+    """Run a file search command, yielding the paths it prints as they arrive.
+
+    :param List[str] cmd: The command to run
+
+    :raises CalledProcessError: If the command fails
+
+    :returns: An iterator of the printed paths
+    """
+
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    ) as process:
+        assert process.stdout is not None
+
+        for line in process.stdout:
+            file_path = line.rstrip("\n")
+            if file_path:
+                yield file_path
+
+        return_code = process.wait()
+        if return_code != 0:
+            stderr = ""
+            if process.stderr is not None:
+                stderr = process.stderr.read()
+            raise subprocess.CalledProcessError(return_code, cmd, stderr=stderr)
+
+
+def iter_localizable_files(
+    *,
+    root_path: str,
+    excluded_folders: Optional[List[str]] = None,
+    exclusion_file_path: Optional[str] = None,
+    use_ripgrep: bool = False,
+    walker: Optional[str] = None,
+    excluded_patterns: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """Find all source files which should be processed, yielding them as they are found.
+
+    The files are yielded in the order the search finds them, which is not
+    deterministic. See `localizable_files` for the parameters.
+
+    :param str root_path: The path to start the search from
+    :param Optional[List[str]] excluded_folders: The paths to any folders to
+                                                 exclude from the results.
+    :param Optional[str] exclusion_file_path: The paths to the exclusion file
+                                              which contains all the excluded
+                                              paths.
+    :param bool use_ripgrep: Whether to use ripgrep for finding files.
+    :param Optional[str] walker: The walker to search with (one of `WALKERS`).
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                  paths to exclude.
+
+    :raises ValueError: If neither excluded_folders nor exclusion_file_path is set.
+    :raise CalledProcessError: If the find command fails.
+
+    :returns: An iterator of the files which should be processed
+    """
+
+    if excluded_folders is None and exclusion_file_path is None:
+        excluded_folders = []
+    elif excluded_folders is not None and exclusion_file_path is not None:
+        raise ValueError("Either excluded_folders or exclusion_file_path should be set")
+    elif exclusion_file_path is not None:
+        with open(exclusion_file_path, encoding="utf-8") as exclusion_file:
+            excluded_folders = list(map(lambda x: x.strip(), exclusion_file.readlines()))
+
+    assert excluded_folders is not None
+
+    root_path = os.path.normpath(root_path)
+
+    excluded_folders = _normalized_exclusions(root_path, excluded_folders)
+
+    excluded_patterns = excluded_patterns or []
+    ignore_patterns = _IgnorePatterns(excluded_patterns)
+
+    selected_walker = _select_walker(walker, use_ripgrep)
+
+    log.debug(f"Fetching localizable files with the {selected_walker} walker")
+
+    if selected_walker == "python":
+        yield from _walk(root_path, frozenset(excluded_folders), ignore_patterns)
+        return
+
+    if selected_walker == "rg":
+        cmd = _build_ripgrep_command(root_path, excluded_folders, excluded_patterns)
+    else:
+        cmd = _build_find_command(root_path, excluded_folders, ignore_patterns)
+
+    log.debug("Using command: %s", cmd)
+
+    if selected_walker == "rg" or not ignore_patterns.has_path_globs:
+        yield from _run_walker_command(cmd)
+        return
+
+    for file_path in _run_walker_command(cmd):
+        relative_path = os.path.relpath(file_path, root_path).replace(os.sep, "/")
+        if not ignore_patterns.excludes(relative_path):
+            yield file_path
+
+
+def _listed_paths(
+    entries: Iterable[bytes], root_path: Optional[str], seen: Set[bytes]
+) -> Iterator[str]:
+    """Turn the entries of a file list into the paths of the code files to scan.
+
+    :param entries: The entries read from the list
+    :param root_path: The path relative entries are relative to, if not the current directory
+    :param seen: The entries already yielded, which are skipped
+
+    :returns: An iterator of the paths of the code files which haven't been seen
+    """
+
+    for entry in entries:
+        entry = entry.rstrip(b"\r")
+        if not entry or entry in seen:
+            continue
+
+        seen.add(entry)
+        file_path = os.fsdecode(entry)
+        if not file_path.endswith(_SOURCE_FILE_EXTENSIONS):
+            continue
+
+        yield file_path if root_path is None else os.path.join(root_path, file_path)
+
+
+def iter_listed_files(
+    file_list: Union[str, BinaryIO], *, root_path: Optional[str] = None
+) -> Iterator[str]:
+    """Read the files to scan from a list, such as one a build system writes for a target.
+
+    Nothing is searched, so only the listed files are scanned (without
+    applying any exclusions). Files which aren't Swift or Objective-C files
+    are skipped, as are repeats. The paths are separated by NULs if the list
+    contains any before its first newline, or otherwise by newlines, and are
+    yielded as they are read, so they can be scanned while a build is still
+    writing them to a pipe.
+
+    :param file_list: The path to the list, `-` to read it from stdin, or a binary stream
+    :param Optional[str] root_path: The path relative paths in the list are relative to
+                                    (default: the current directory)
+
+    :returns: An iterator of the listed code files, in the order they are listed
+    """
+
+    if isinstance(file_list, str):
+        if file_list == "-":
+            yield from iter_listed_files(sys.stdin.buffer, root_path=root_path)
+            return
+
+        with open(file_list, "rb") as list_file:
+            yield from iter_listed_files(list_file, root_path=root_path)
+        return
+
+    read = getattr(file_list, "read1", None) or file_list.read
+    separator: Optional[bytes] = None
+    buffered = b""
+    seen: Set[bytes] = set()
+
+    while block := read(_FILE_LIST_BLOCK_SIZE):
+        buffered += block
+
+        if separator is None:
+            # Wait for the end of the first path to know how paths are separated
+            nul, newline = buffered.find(b"\0"), buffered.find(b"\n")
+            if nul < 0 and newline < 0:
+                continue
+            separator = b"\0" if nul >= 0 and (newline < 0 or nul < newline) else b"\n"
+
+        *entries, buffered = buffered.split(separator)
+        yield from _listed_paths(entries, root_path, seen)
+
+    yield from _listed_paths([buffered], root_path, seen)
+
+
 def localizable_files(
     *,
     root_path: str,
     excluded_folders: Optional[List[str]] = None,
     exclusion_file_path: Optional[str] = None,
     use_ripgrep: bool = False,
+    walker: Optional[str] = None,
+    excluded_patterns: Optional[List[str]] = None,
 ) -> List[str]:
     """Find all source files which should be processed.
 
@@ -77,6 +688,17 @@ def localizable_files(
                              If False, the find command will be used.
                              If True, ripgrep will be used if it is available,
                              otherwise the find command will be used.
+                             Ignored when `walker` is set.
+    :param Optional[str] walker: The walker to search with. "python" walks the
+                                 tree in process with os.scandir, "find" and
+                                 "rg" run the respective commands and "auto"
+                                 currently picks "python". Note that ripgrep
+                                 also skips hidden and .gitignore'd files.
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                  files or folders to exclude
+                                                  (e.g. `Pods/`, `*Tests.swift`
+                                                  or `/Vendor/*.m`). Negated
+                                                  patterns are not supported.
 
     :raises ValueError: If neither excluded_folders nor exclusion_file_path is set.
     :raise CalledProcessError: If the find command fails.
@@ -84,53 +706,97 @@ def localizable_files(
     :returns: The list of files which should be processed
     """
 
-    if excluded_folders is None and exclusion_file_path is None:
-        excluded_folders = []
-    elif excluded_folders is not None and exclusion_file_path is not None:
-        raise ValueError("Either excluded_folders or exclusion_file_path should be set")
-    elif exclusion_file_path is not None:
-        with open(exclusion_file_path, encoding="utf-8") as exclusion_file:
-            excluded_folders = list(map(lambda x: x.strip(), exclusion_file.readlines()))
+    return sorted(
+        iter_localizable_files(
+            root_path=root_path,
+            excluded_folders=excluded_folders,
+            exclusion_file_path=exclusion_file_path,
+            use_ripgrep=use_ripgrep,
+            walker=walker,
+            excluded_patterns=excluded_patterns,
+        )
+    )
 
-    assert excluded_folders is not None
 
-    excluded_folders = [
-        os.path.normpath(os.path.join(root_path, folder))
-        for folder in excluded_folders
-        if folder.strip()
-    ]
+def _create_temporary_file(file_path: str) -> Tuple[int, str]:
+    """Create a new temporary file next to a file which is about to be written.
 
-    log.debug("Fetching localizable files")
+    Unlike `tempfile.mkstemp`, which only lets the owner read the file, the
+    file gets the permissions any new file would, so the umask applies without
+    having to read it (which means briefly changing it for every thread).
 
-    if use_ripgrep and _is_ripgrep_available():
-        cmd = _build_ripgrep_command(root_path=root_path, excluded_folders=excluded_folders)
-        log.debug("Using ripgrep command: %s", cmd)
-    else:
-        cmd = _build_find_command(root_path=root_path, excluded_folders=excluded_folders)
-        log.debug("Using find command: %s", cmd)
+    :param str file_path: The path of the file about to be written
 
-    results = []
-    with subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    ) as process:
-        assert process.stdout is not None
+    :raises FileExistsError: If no unused temporary file name could be found
 
-        for line in process.stdout:
-            file_path = line.rstrip("\n")
-            if file_path:
-                if not os.path.isabs(file_path):
-                    file_path = os.path.join(root_path, file_path)
-                results.append(file_path)
+    :returns: The open file descriptor and path of the temporary file
+    """
 
-        return_code = process.wait()
-        if return_code != 0:
-            stderr = ""
-            if process.stderr is not None:
-                stderr = process.stderr.read()
-            raise subprocess.CalledProcessError(return_code, cmd, stderr=stderr)
+    directory, file_name = os.path.split(file_path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
 
-    results.sort()
-    return results
+    for _ in range(tempfile.TMP_MAX):
+        temporary_path = os.path.join(directory, f".{file_name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(temporary_path, flags, 0o666), temporary_path
+        except FileExistsError:
+            continue
+
+    raise FileExistsError(f"No unused temporary file name was found for {file_path}")
+
+
+def write_file_atomically(file_path: str, contents: bytes) -> None:
+    """Write a file so that readers never observe a partially written result.
+
+    The contents are written to a temporary file in the same directory which
+    then replaces the destination in a single rename. An existing file's
+    permissions are kept.
+
+    :param str file_path: The path of the file to write
+    :param bytes contents: The raw contents to write
+
+    :raises BaseException: If the file could not be written (the destination is left untouched)
+    """
+
+    file_path = os.path.abspath(file_path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    file_descriptor, temporary_path = _create_temporary_file(file_path)
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(contents)
+        try:
+            os.chmod(temporary_path, os.stat(file_path).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def write_file_if_changed(file_path: str, contents: bytes) -> bool:
+    """Atomically write a file, unless it already has exactly these contents.
+
+    Leaving unchanged files alone keeps their modification times, so build
+    systems such as Xcode do not treat them as changed.
+
+    :param str file_path: The path of the file to write
+    :param bytes contents: The raw contents to write
+
+    :returns: True if the file was written, False if it was already up to date
+    """
+
+    try:
+        if os.stat(file_path).st_size == len(contents):
+            with open(file_path, "rb") as existing_file:
+                if existing_file.read() == contents:
+                    log.debug(f"{file_path} is unchanged")
+                    return False
+    except FileNotFoundError:
+        pass
+
+    write_file_atomically(file_path, contents)
+    return True
@@ -0,0 +1,137 @@
+"""Output formats for the generated .strings and .stringsdict tables."""
+
+import plistlib
+import re
+from typing import Any, Dict
+
+from localizedstringkit.options import OUTPUT_FORMATS
+
+# An escape sequence in a .strings value: a \U followed by up to 4 hex digits,
+# up to 3 octal digits, or any other escaped character
+_ESCAPE_PATTERN = re.compile(r"\\(U[0-9A-Fa-f]{1,4}|[0-7]{1,3}|.)", re.DOTALL)
+
+# A UTF-16 surrogate, which is left in an unescaped value if it was not escaped as part of a pair
+_SURROGATE_PATTERN = re.compile("[\ud800-\udfff]")
+
+_SIMPLE_ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+
+
+def check_output_format(output_format: str) -> None:
+    """Check that an output format is supported.
+
+    :param output_format: The name of the format
+
+    :raises ValueError: If the format is unknown
+    """
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format: {output_format}. Expected one of {OUTPUT_FORMATS}"
+        )
+
+
+def _unescaped_sequence(match: "re.Match[str]") -> str:
+    """Get the character an escape sequence stands for.
+
+    :param match: The match of `_ESCAPE_PATTERN`
+
+    :returns: The unescaped character
+    """
+
+    sequence = match.group(1)
+
+    if sequence[0] == "U" and len(sequence) > 1:
+        return chr(int(sequence[1:], 16))
+
+    if sequence[0] in "01234567":
+        return chr(int(sequence, 8))
+
+    return _SIMPLE_ESCAPES.get(sequence, sequence)
+
+
+def unescape_strings_value(value: str) -> str:
+    """Unescape a value the way the system does when it loads a text .strings file.
+
+    Values are extracted from the code as they are written in string
+    literals, so they are still escaped. That is fine for text .strings
+    files, which are unescaped as they are loaded, but a binary table has to
+    hold the final string.
+
+    :param value: The value as written in the code
+
+    :returns: The value the text .strings file would load as. Any surrogate which was not
+              escaped as part of a pair is left in it (see `has_unpaired_surrogates`).
+    """
+
+    if "\\" not in value:
+        return value
+
+    unescaped = _ESCAPE_PATTERN.sub(_unescaped_sequence, value)
+    # Characters outside the BMP are escaped as a surrogate pair of \U sequences
+    return unescaped.encode("utf-16", "surrogatepass").decode("utf-16", "surrogatepass")
+
+
+def has_unpaired_surrogates(value: str) -> bool:
+    """Check if an unescaped value has a surrogate which is not part of a pair.
+
+    Such a value can be loaded from a text .strings file, but can't be encoded
+    as UTF-8 or UTF-16.
+
+    :param value: The value, as unescaped by `unescape_strings_value`
+
+    :returns: True if the value has an unpaired surrogate, False otherwise
+    """
+
+    return _SURROGATE_PATTERN.search(value) is not None
+
+
+def binary_strings_contents(values_by_key: Dict[str, str]) -> bytes:
+    """Render a .strings table as a binary property list.
+
+    Binary tables can't hold comments, so only the keys and values are kept.
+
+    :param values_by_key: The value of each key, as written in the code
+
+    :raises ValueError: If a value has an unpaired surrogate escape, which a binary table
+                        can't hold
+
+    :returns: The contents of the .strings file
+    """
+
+    unescaped_values_by_key = {}
+
+    for key, value in values_by_key.items():
+        unescaped_value = unescape_strings_value(value)
+        if has_unpaired_surrogates(unescaped_value):
+            raise ValueError(
+                f"The value of {key} ({value}) has an unpaired surrogate escape, which a "
+                + "binary table can't hold. Use the text output format for this table."
+            )
+        unescaped_values_by_key[key] = unescaped_value
+
+    return plistlib.dumps(
+        unescaped_values_by_key, fmt=plistlib.PlistFormat.FMT_BINARY, sort_keys=True
+    )
+
+
+def stringsdict_contents(entries: Dict[str, Any], output_format: str) -> bytes:
+    """Render a .stringsdict table.
+
+    :param entries: The .stringsdict contents of each key
+    :param output_format: The format to render in, one of `OUTPUT_FORMATS`
+
+    :returns: The contents of the .stringsdict file
+    """
+
+    if output_format == "binary":
+        return plistlib.dumps(entries, fmt=plistlib.PlistFormat.FMT_BINARY, sort_keys=True)
+
+    return plistlib.dumps(entries, sort_keys=True)
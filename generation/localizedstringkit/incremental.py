@@ -0,0 +1,138 @@
+"""Incremental extraction tools for when the changed files are already known."""
+
+import os
+import subprocess
+from typing import Dict, List, Optional
+
+from localizedstringkit import logger
+from localizedstringkit.cache import ExtractionCache, search_description
+from localizedstringkit.files import filter_localizable_files
+
+log = logger.get()
+
+
+def _run_git(root_path: str, arguments: List[str]) -> str:
+    """Run a git command in a folder.
+
+    :param str root_path: The folder to run the command in
+    :param List[str] arguments: The arguments to pass to git
+
+    :raises CalledProcessError: If the command fails
+
+    :returns: The output of the command
+    """
+
+    return subprocess.run(
+        ["git", *arguments],
+        cwd=root_path,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    ).stdout
+
+
+def git_changed_files(root_path: str, base_ref: str) -> List[str]:
+    """Find the files under a folder which differ from the merge base with a ref.
+
+    This covers committed, staged and unstaged changes as well as untracked
+    files. Both sides of a rename are included, so deleted files are listed
+    too (and no longer exist on disk).
+
+    :param str root_path: The folder to look for changes in
+    :param str base_ref: The ref to compare against, e.g. `origin/main`
+
+    :raises CalledProcessError: If git fails, e.g. because the ref is unknown
+
+    :returns: The paths of the changed files, prefixed with the root path
+    """
+
+    merge_base = _run_git(root_path, ["merge-base", base_ref, "HEAD"]).strip()
+
+    changed_files = _run_git(
+        root_path, ["diff", "--name-only", "--no-renames", "--relative", "-z", merge_base]
+    ).split("\0")
+    untracked_files = _run_git(
+        root_path, ["ls-files", "--others", "--exclude-standard", "-z"]
+    ).split("\0")
+
+    return [
+        os.path.join(root_path, file_path)
+        for file_path in dict.fromkeys(changed_files + untracked_files)
+        if file_path
+    ]
+
+
+def incremental_code_files(
+    *,
+    cache: ExtractionCache,
+    root_path: str,
+    changed_files: List[str],
+    excluded_folders: Optional[List[str]] = None,
+    excluded_patterns: Optional[List[str]] = None,
+) -> Optional[List[str]]:
+    """Work out the files to extract from by updating the previous run's list.
+
+    The previous run must have been a search of the same root path with the
+    same exclusions. Otherwise, such as after a run which scanned a list of
+    files or several targets, its list would not be the right starting point.
+
+    Files from the previous run which are not in `changed_files` are marked in
+    the cache as unchanged, so their entries are reused without being checked
+    on disk. Changed files which no longer exist are dropped, and new ones are
+    added if they would not have been excluded. The search is set on the cache,
+    so the result is recorded as its files.
+
+    :param ExtractionCache cache: The cache holding the previous run's results
+    :param str root_path: The path the previous run searched from
+    :param List[str] changed_files: The files which have been added, modified or deleted
+    :param Optional[List[str]] excluded_folders: The paths to any folders to
+                                                 exclude, relative to the root
+    :param Optional[List[str]] excluded_patterns: .gitignore style patterns of
+                                                  paths to exclude
+
+    :returns: The files to extract from, or None if there is no previous run of the same
+              search to update
+    """
+
+    previous_files = cache.previous_files
+    if previous_files is None:
+        return None
+
+    search = search_description(
+        root_path, excluded_folders=excluded_folders, excluded_patterns=excluded_patterns
+    )
+    if cache.previous_search != search:
+        log.debug(
+            "The previous run was not a search of %s with the same exclusions (it was %s)",
+            root_path,
+            cache.previous_search,
+        )
+        return None
+
+    # Compare normalized paths, but keep the spelling the previous run used
+    files_by_path: Dict[str, str] = {os.path.normpath(path): path for path in previous_files}
+
+    for file_path in changed_files:
+        files_by_path.pop(os.path.normpath(file_path), None)
+
+    cache.assume_unchanged(files_by_path.values())
+    cache.set_search(
+        root_path, excluded_folders=excluded_folders, excluded_patterns=excluded_patterns
+    )
+
+    for file_path in filter_localizable_files(
+        changed_files,
+        root_path=root_path,
+        excluded_folders=excluded_folders,
+        excluded_patterns=excluded_patterns,
+    ):
+        files_by_path[os.path.normpath(file_path)] = file_path
+
+    log.debug(
+        "Incremental run: %d changed file(s), %d file(s) in total",
+        len(changed_files),
+        len(files_by_path),
+    )
+
+    return sorted(files_by_path.values())
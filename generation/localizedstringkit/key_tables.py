@@ -0,0 +1,222 @@
+"""Generated source files which map strings to their precomputed keys.
+
+At runtime, the library computes each string's key by hashing its value and
+key extension on every call. A key table lets it look the key up instead.
+The table is either an Objective-C dictionary literal, or a static C array
+sorted for a binary search (which needs no allocations to load). Either
+way, the generated file registers itself with `LSKRegisterKeyLookup` when
+the app loads.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Tuple
+
+from dotstrings import LocalizedString
+
+from localizedstringkit import logger
+from localizedstringkit.formats import has_unpaired_surrogates, unescape_strings_value
+from localizedstringkit.options import KEY_TABLE_FORMATS
+
+log = logger.get()
+
+_HEADER = """// Generated by LocalizedStringKit. Do not edit.
+//
+// The precomputed keys of the strings in {bundle_name}
+
+@import LocalizedStringKit;
+"""
+
+_DICTIONARY_TEMPLATE = """
+static NSString *_Nullable lookUpKey(NSString *_Nonnull value, NSString *_Nullable keyExtension) {{
+  static NSDictionary<NSString *, NSString *> *keys = nil;
+  static dispatch_once_t onceToken;
+  dispatch_once(&onceToken, ^{{
+    keys = @{{
+{entries}
+    }};
+  }});
+
+  NSString *input = keyExtension.length > 0 ? [value stringByAppendingFormat:@":%@", keyExtension] : value;
+  return keys[input];
+}}
+"""
+
+_ARRAY_TEMPLATE = """#include <stdlib.h>
+#include <string.h>
+
+typedef struct {{
+  const char *input;
+  const char *key;
+}} LSKPrecomputedKey;
+
+// Sorted by input, in strcmp order
+static const LSKPrecomputedKey precomputedKeys[] = {{
+{entries}
+}};
+
+static int compareInput(const void *input, const void *entry) {{
+  return strcmp((const char *)input, ((const LSKPrecomputedKey *)entry)->input);
+}}
+
+static NSString *_Nullable lookUpKey(NSString *_Nonnull value, NSString *_Nullable keyExtension) {{
+  NSString *input = keyExtension.length > 0 ? [value stringByAppendingFormat:@":%@", keyExtension] : value;
+  const LSKPrecomputedKey *entry = bsearch(
+    input.UTF8String,
+    precomputedKeys,
+    sizeof(precomputedKeys) / sizeof(precomputedKeys[0]),
+    sizeof(precomputedKeys[0]),
+    compareInput
+  );
+  return entry == NULL ? nil : @(entry->key);
+}}
+"""
+
+# A zero length array isn't valid C, so a table without any keys is a lookup
+# which never finds one
+_EMPTY_ARRAY_TEMPLATE = """
+static NSString *_Nullable lookUpKey(NSString *_Nonnull value, NSString *_Nullable keyExtension) {
+  return nil;
+}
+"""
+
+_REGISTRATION = """
+__attribute__((constructor)) static void registerKeyLookup(void) {{
+  LSKRegisterKeyLookup({bundle_name}, lookUpKey);
+}}
+"""
+
+# Characters which can't appear as they are in a C string literal
+_UNSAFE_CHARACTERS = re.compile(r'[\x00-\x1f\x7f"\\]')
+
+_SIMPLE_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", '"': '\\"', "\\": "\\\\"}
+
+
+def check_key_table_format(key_table_format: str) -> None:
+    """Check that a key table format is supported.
+
+    :param key_table_format: The name of the format
+
+    :raises ValueError: If the format is unknown
+    """
+
+    if key_table_format not in KEY_TABLE_FORMATS:
+        raise ValueError(
+            f"Unknown key table format: {key_table_format}. Expected one of {KEY_TABLE_FORMATS}"
+        )
+
+
+def _c_literal(text: str) -> str:
+    """Quote a string as a C string literal.
+
+    Octal escapes are used for control characters, as they end after at most
+    three digits (unlike hex escapes, which would swallow any hex digits
+    following them).
+
+    :param text: The string to quote
+
+    :returns: The quoted literal
+    """
+
+    escaped = _UNSAFE_CHARACTERS.sub(
+        lambda match: _SIMPLE_ESCAPES.get(match.group(0), f"\\{ord(match.group(0)):03o}"),
+        text,
+    )
+    return f'"{escaped}"'
+
+
+def precomputed_keys(strings: List[LocalizedString]) -> Tuple[Dict[str, str], int]:
+    """Get the key of each string, by the input the library would hash for it.
+
+    The values are extracted as they are written in the code, and their keys
+    are computed from that (with only some escapes interpreted), while the
+    library hashes the compiled string. A string is only included if hashing
+    its compiled form gives the same key, so looking it up is always
+    equivalent to hashing. Any other string is left for the library to hash.
+
+    :param strings: The strings in the bundle
+
+    :returns: The key of each hash input, and the number of strings which were left out
+    """
+
+    keys: Dict[str, str] = {}
+    left_out = 0
+
+    for localized_string in strings:
+        hash_input = unescape_strings_value(localized_string.value)
+        if localized_string.key_extension:
+            hash_input += ":" + unescape_strings_value(localized_string.key_extension)
+
+        # C strings end at the first NUL, and unpaired surrogates can't be encoded,
+        # so such inputs can't be looked up
+        if (
+            "\0" in hash_input
+            or has_unpaired_surrogates(hash_input)
+            or hashlib.md5(hash_input.encode("utf-8")).hexdigest() != localized_string.key
+        ):
+            left_out += 1
+            continue
+
+        keys[hash_input] = localized_string.key
+
+    return keys, left_out
+
+
+def key_table_contents(bundle_name: str, keys: Dict[str, str], key_table_format: str) -> bytes:
+    """Render the key table source file of a bundle.
+
+    :param bundle_name: The bundle name used in code, which the table is registered for
+    :param keys: The key of each hash input (see `precomputed_keys`)
+    :param key_table_format: The form of the table, one of `KEY_TABLE_FORMATS`
+
+    :returns: The contents of the source file
+    """
+
+    # Sorting by the UTF-8 bytes gives the order strcmp compares in
+    inputs = sorted(keys, key=lambda hash_input: hash_input.encode("utf-8"))
+
+    if key_table_format == "array" and not inputs:
+        body = _EMPTY_ARRAY_TEMPLATE
+    elif key_table_format == "array":
+        body = _ARRAY_TEMPLATE.format(
+            entries="\n".join(
+                f"  {{{_c_literal(hash_input)}, {_c_literal(keys[hash_input])}}},"
+                for hash_input in inputs
+            )
+        )
+    else:
+        body = _DICTIONARY_TEMPLATE.format(
+            entries="\n".join(
+                f"      @{_c_literal(hash_input)}: @{_c_literal(keys[hash_input])},"
+                for hash_input in inputs
+            )
+        )
+
+    contents = (
+        _HEADER.format(bundle_name=bundle_name)
+        + body
+        + _REGISTRATION.format(bundle_name="@" + _c_literal(bundle_name))
+    )
+    return contents.encode("utf-8")
+
+
+def bundle_key_table(
+    bundle_name: str, strings: List[LocalizedString], key_table_format: str
+) -> bytes:
+    """Render the key table source file for a bundle's strings.
+
+    :param bundle_name: The bundle name used in code, which the table is registered for
+    :param strings: The bundle's strings
+    :param key_table_format: The form of the table, one of `KEY_TABLE_FORMATS`
+
+    :returns: The contents of the source file
+    """
+
+    keys, left_out = precomputed_keys(strings)
+    if left_out:
+        log.debug(
+            f"{left_out} string(s) in {bundle_name} have escapes which the key can't be "
+            + "precomputed for, so are left out of its key table"
+        )
+
+    return key_table_contents(bundle_name, keys, key_table_format)
@@ -0,0 +1,458 @@
+"""Single pass lexer for finding Localized calls in Swift and Objective-C code.
+
+Unlike the regex detectors, the lexer knows where comments and string literals
+start and end. Calls which are only mentioned in comments or strings are
+ignored, and the arguments of a call may contain any characters the language
+allows in a literal, including parentheses. In Swift the arguments may also be
+raw (`#"..."#`) or multi-line (`\"\"\"`) literals.
+
+The values found are in the same form the regex detectors produce: the source
+text of a single line, non-raw literal (with its escape sequences untouched).
+Raw and multi-line literals are converted to that form.
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# The fields of a detected string, as `detection.StringEntry`
+_Entry = Tuple[str, Optional[str], Optional[str], str]
+
+_DEFAULT_BUNDLE = "LocalizedStringKit.bundle"
+
+# The number of literal arguments each function takes
+_ARGUMENT_COUNTS: Dict[str, int] = {
+    "Localized": 2,
+    "LocalizedWithKeyExtension": 3,
+    "LocalizedWithBundle": 3,
+    "LocalizedWithKeyExtensionAndBundle": 4,
+}
+
+# The next token the lexer needs to look at: a comment, a literal or an
+# identifier which may be a Localized call. Any other code is skipped over
+# without being examined. Each pattern starts with a class of the first
+# characters of its tokens, which lets the regex engine skip ahead quickly.
+_SWIFT_TOKEN: Pattern = re.compile(
+    r'[/#"L](?:(?<=/)[/*]|(?<=#)#*"|(?<=")|(?<=L)(?<![\w$]L)ocalized\w*)'
+)
+_OBJC_TOKEN: Pattern = re.compile(
+    r"""[/@"'L](?:(?<=/)[/*]|(?<=@)"|(?<=["'])|(?<=L)(?<![\w$]L)ocalized\w*)"""
+)
+
+# The start of a literal which can be an argument to a Localized call
+_SWIFT_ARGUMENT_START: Pattern = re.compile(r'#*"')
+_OBJC_ARGUMENT_START: Pattern = re.compile(r'@"')
+
+# Most calls only have plain single line literals as arguments, which can be
+# read in one go. Anything else (comments, interpolations, raw or multi-line
+# literals) falls back to reading the arguments token by token.
+_SIMPLE_ARGUMENT = r'"((?:[^"\\\n]|\\[^(\n])*)"'
+_SWIFT_SIMPLE_ARGUMENTS: Pattern = re.compile(
+    rf"\(\s*{_SIMPLE_ARGUMENT}\s*,\s*{_SIMPLE_ARGUMENT}\s*"
+    rf"(?:,\s*{_SIMPLE_ARGUMENT}\s*)?(?:,\s*{_SIMPLE_ARGUMENT}\s*)?\)"
+)
+_OBJC_SIMPLE_ARGUMENTS: Pattern = re.compile(
+    rf"\(\s*@{_SIMPLE_ARGUMENT}\s*,\s*@{_SIMPLE_ARGUMENT}\s*"
+    rf"(?:,\s*@{_SIMPLE_ARGUMENT}\s*)?(?:,\s*@{_SIMPLE_ARGUMENT}\s*)?\)"
+)
+
+_SPACE: Pattern = re.compile(r"\s*")
+_NESTED_COMMENT_TOKEN: Pattern = re.compile(r"/\*|\*/")
+
+# The characters of a single line literal which need no special handling
+_PLAIN_CHARACTERS: Pattern = re.compile(r'[^"\\\n]*')
+_OBJC_STRING: Pattern = re.compile(r'"(?:[^"\\\n]|\\.)*"')
+_OBJC_CHARACTER: Pattern = re.compile(r"'(?:[^'\\\n]|\\.)*'")
+_MULTILINE_BODY: Pattern = re.compile(r'(?:[^\\"]|\\.|"(?!""))*"""', re.DOTALL)
+_INTERPOLATION_TOKEN: Pattern = re.compile(r'[()\n]|#*"')
+
+# An escape sequence (kept as it is) or a bare quote (which needs escaping)
+_ESCAPE_OR_QUOTE: Pattern = re.compile(r'\\.|"')
+
+
+def _escape_raw_text(text: str, hashes: str) -> str:
+    """Convert the text of a raw literal to the text of the equivalent non-raw literal.
+
+    :param text: The text between the delimiters of the raw literal
+    :param hashes: The hashes the raw literal is delimited with
+
+    :returns: The escaped text
+    """
+
+    # Only a backslash followed by the hashes starts an escape sequence
+    return "\\".join(
+        part.replace("\\", "\\\\").replace('"', '\\"') for part in text.split("\\" + hashes)
+    )
+
+
+def _escape_quotes(text: str) -> str:
+    """Escape the bare quotes in the text of a multi-line literal.
+
+    :param text: The text, possibly with escape sequences
+
+    :returns: The text with every quote escaped
+    """
+
+    return _ESCAPE_OR_QUOTE.sub(
+        lambda match: '\\"' if match.group() == '"' else match.group(), text
+    )
+
+
+def _multiline_value(body: str, hashes: str) -> Optional[str]:
+    """Convert the body of a multi-line literal to the text of the equivalent single line literal.
+
+    The indentation of the closing delimiter is removed from every line, and
+    lines ending in a backslash continue onto the next, as the Swift compiler
+    does.
+
+    :param body: The text between the delimiters of the literal
+    :param hashes: The hashes the literal is delimited with, if it is raw
+
+    :returns: The text, or None if the literal is malformed
+    """
+
+    lines = body.split("\n")
+
+    # The delimiters have to be on lines of their own
+    if len(lines) < 2 or lines[0].strip() or lines[-1].strip():
+        return None
+
+    indentation = lines[-1]
+    continuation = "\\" + hashes
+    text = ""
+
+    for line in lines[1:-1]:
+        line = line.rstrip("\r")
+        if line.startswith(indentation):
+            line = line[len(indentation) :]
+        elif line.strip():
+            return None
+        else:
+            line = ""
+
+        continues = line.endswith(continuation) and not line.endswith("\\" + continuation)
+        if continues:
+            line = line[: -len(continuation)]
+
+        text += _escape_raw_text(line, hashes) if hashes else _escape_quotes(line)
+        if not continues:
+            text += "\\n"
+
+    # The line break before the closing delimiter isn't part of the value
+    return text[:-2] if text.endswith("\\n") else text
+
+
+class _Lexer:
+    """Finds the Localized calls in the contents of a code file.
+
+    :param contents: The contents of the file
+    :param objc: Whether the file is Objective-C rather than Swift
+    """
+
+    contents: str
+    objc: bool
+    token: Pattern
+    argument_start: Pattern
+    simple_arguments: Pattern
+    entries: List[_Entry]
+    invalid_calls: List[str]
+
+    def __init__(self, contents: str, objc: bool) -> None:
+        self.contents = contents
+        self.objc = objc
+        self.token = _OBJC_TOKEN if objc else _SWIFT_TOKEN
+        self.argument_start = _OBJC_ARGUMENT_START if objc else _SWIFT_ARGUMENT_START
+        self.simple_arguments = _OBJC_SIMPLE_ARGUMENTS if objc else _SWIFT_SIMPLE_ARGUMENTS
+        self.entries = []
+        self.invalid_calls = []
+
+    def _line_end(self, position: int) -> int:
+        """Find the end of the line a position is on.
+
+        :param position: The position in the contents
+
+        :returns: The position of the line break ending the line, or the end of the contents
+        """
+
+        line_end = self.contents.find("\n", position)
+        return len(self.contents) if line_end == -1 else line_end
+
+    def _block_comment_end(self, position: int) -> int:
+        """Find the end of a block comment. Swift block comments can be nested.
+
+        :param position: The position of the opening `/*`
+
+        :returns: The position after the comment
+        """
+
+        if self.objc:
+            end = self.contents.find("*/", position + 2)
+            return len(self.contents) if end == -1 else end + 2
+
+        depth = 0
+        for match in _NESTED_COMMENT_TOKEN.finditer(self.contents, position):
+            depth += 1 if match.group() == "/*" else -1
+            if depth == 0:
+                return match.end()
+
+        return len(self.contents)
+
+    def _skip_space(self, position: int) -> int:
+        """Skip over whitespace and comments.
+
+        :param position: The position to start from
+
+        :returns: The position of the next token
+        """
+
+        while True:
+            match = _SPACE.match(self.contents, position)
+            assert match is not None
+            position = match.end()
+
+            if self.contents.startswith("//", position):
+                position = self._line_end(position)
+            elif self.contents.startswith("/*", position):
+                position = self._block_comment_end(position)
+            else:
+                return position
+
+    def _interpolation_end(self, position: int) -> int:
+        """Find the end of an interpolation in a single line Swift literal.
+
+        :param position: The position after the opening `\\(`
+
+        :returns: The position after the closing parenthesis, or -1 if it isn't closed
+        """
+
+        depth = 1
+
+        while True:
+            match = _INTERPOLATION_TOKEN.search(self.contents, position)
+            if match is None or match.group() == "\n":
+                return -1
+
+            token = match.group()
+            if token == "(":
+                depth += 1
+                position = match.end()
+            elif token == ")":
+                depth -= 1
+                position = match.end()
+                if depth == 0:
+                    return position
+            else:
+                position = self._literal_end(match.start())
+                if position == -1:
+                    return -1
+
+    def _swift_literal_end(self, position: int, hashes: str) -> int:
+        """Find the end of a Swift literal.
+
+        :param position: The position of the opening quote, after any hashes
+        :param hashes: The hashes before the opening quote
+
+        :returns: The position after the literal, or -1 if it isn't closed
+        """
+
+        contents = self.contents
+
+        if contents.startswith('"""', position):
+            if hashes:
+                end = contents.find('"""' + hashes, position + 3)
+                return -1 if end == -1 else end + 3 + len(hashes)
+
+            match = _MULTILINE_BODY.match(contents, position + 3)
+            return -1 if match is None else match.end()
+
+        if hashes:
+            end = contents.find('"' + hashes, position + 1)
+            if end == -1 or contents.find("\n", position, end) != -1:
+                return -1
+            return end + 1 + len(hashes)
+
+        return self._single_line_literal_end(position + 1)
+
+    def _single_line_literal_end(self, position: int) -> int:
+        """Find the end of a single line, non-raw Swift literal.
+
+        :param position: The position after the opening quote
+
+        :returns: The position after the literal, or -1 if it isn't closed
+        """
+
+        contents = self.contents
+
+        while True:
+            match = _PLAIN_CHARACTERS.match(contents, position)
+            assert match is not None
+            position = match.end()
+            character = contents[position : position + 1]
+
+            if character == '"':
+                return position + 1
+            if character != "\\":
+                # A line break or the end of the contents
+                return -1
+            if contents.startswith("(", position + 1):
+                position = self._interpolation_end(position + 2)
+                if position == -1:
+                    return -1
+            else:
+                position += 2
+
+    def _literal_end(self, position: int) -> int:
+        """Find the end of a string literal.
+
+        :param position: The position the literal starts at, including any prefix
+
+        :returns: The position after the literal, or -1 if it isn't closed
+        """
+
+        if self.objc:
+            match = _OBJC_STRING.match(self.contents, position + (self.contents[position] == "@"))
+            return -1 if match is None else match.end()
+
+        quote = self.contents.index('"', position)
+        return self._swift_literal_end(quote, self.contents[position:quote])
+
+    def _literal_value(self, start: int, end: int) -> Optional[str]:
+        """Get the value of a string literal, in the form of a single line non-raw literal.
+
+        :param start: The position the literal starts at, including any prefix
+        :param end: The position after the literal
+
+        :returns: The value, or None if the literal is malformed
+        """
+
+        if self.objc:
+            return self.contents[start + 2 : end - 1]
+
+        quote = self.contents.index('"', start)
+        hashes = self.contents[start:quote]
+        body_end = end - len(hashes)
+
+        if self.contents.startswith('"""', quote):
+            return _multiline_value(self.contents[quote + 3 : body_end - 3], hashes)
+
+        body = self.contents[quote + 1 : body_end - 1]
+        return _escape_raw_text(body, hashes) if hashes else body
+
+    def _read_arguments(self, position: int) -> Tuple[Optional[List[str]], int]:
+        """Read the arguments of a call, if they are all string literals.
+
+        :param position: The position after the opening parenthesis
+
+        :returns: The values of the arguments (or None if any isn't a string literal) and the
+                  position after the closing parenthesis
+        """
+
+        arguments: List[str] = []
+
+        while True:
+            position = self._skip_space(position)
+            if self.argument_start.match(self.contents, position) is None:
+                return None, position
+
+            end = self._literal_end(position)
+            value = None if end == -1 else self._literal_value(position, end)
+            if value is None:
+                return None, position
+
+            arguments.append(value)
+            position = self._skip_space(end)
+            character = self.contents[position : position + 1]
+
+            if character == ")":
+                return arguments, position + 1
+            if character != ",":
+                return None, position
+            position += 1
+
+    def _read_call(self, start: int, name_end: int) -> int:
+        """Read a possible Localized call.
+
+        :param start: The position of the function name
+        :param name_end: The position after the function name
+
+        :returns: The position to continue lexing from
+        """
+
+        contents = self.contents
+        argument_count = _ARGUMENT_COUNTS.get(contents[start:name_end])
+        if argument_count is None or not contents.startswith("(", name_end):
+            return name_end
+
+        simple_match = self.simple_arguments.match(contents, name_end)
+        if simple_match is not None:
+            arguments: Optional[List[str]] = [
+                argument for argument in simple_match.groups() if argument is not None
+            ]
+            end = simple_match.end()
+        else:
+            arguments, end = self._read_arguments(name_end + 1)
+
+        if arguments is not None and len(arguments) == argument_count and arguments[0]:
+            value, comment = arguments[0], arguments[1]
+            if argument_count == 4:
+                self.entries.append((value, comment, arguments[2], arguments[3]))
+            elif contents[start:name_end] == "LocalizedWithBundle":
+                self.entries.append((value, comment, None, arguments[2]))
+            elif argument_count == 3:
+                self.entries.append((value, comment, arguments[2], _DEFAULT_BUNDLE))
+            else:
+                self.entries.append((value, comment, None, _DEFAULT_BUNDLE))
+            return end
+
+        # Function definitions look like invalid calls
+        line_start = contents.rfind("\n", 0, start) + 1
+        if not contents[line_start:start].lstrip().startswith("func "):
+            call_end = contents.find(")", name_end)
+            call_end = self._line_end(name_end) if call_end == -1 else call_end + 1
+            self.invalid_calls.append(contents[start:call_end])
+
+        # Carry on inside the arguments, so their literals and comments are skipped properly
+        return name_end + 1
+
+    def run(self) -> None:
+        """Lex the contents, collecting the calls found."""
+
+        contents = self.contents
+        position = 0
+
+        while True:
+            match = self.token.search(contents, position)
+            if match is None:
+                return
+
+            token = match.group()
+            start = match.start()
+
+            if token == "//":
+                position = self._line_end(start)
+            elif token == "/*":
+                position = self._block_comment_end(start)
+            elif token[0] == "L":
+                position = self._read_call(start, match.end())
+            elif token == "'":
+                character = _OBJC_CHARACTER.match(contents, start)
+                position = start + 1 if character is None else character.end()
+            else:
+                position = self._literal_end(start)
+                if position == -1:
+                    # Unterminated literals are left for the compiler to complain about
+                    position = self._line_end(start)
+
+
+def find_entries(contents: str, objc: bool) -> Tuple[List[_Entry], List[str]]:
+    """Find the Localized calls in the contents of a code file.
+
+    :param contents: The contents of the file
+    :param objc: Whether the file is Objective-C rather than Swift
+
+    :returns: The entries of the valid calls, and the source of the invalid calls (which have
+              arguments that aren't string literals)
+    """
+
+    lexer = _Lexer(contents, objc)
+    lexer.run()
+    return lexer.entries, lexer.invalid_calls
@@ -0,0 +1,27 @@
+"""The choices and defaults of the options shared by the library and the command line.
+
+These are kept apart from the modules which use them, so that the command
+line can offer them without importing those modules.
+"""
+
+# The ways of finding the calls in a file: the regex detectors, or the lexer,
+# which understands comments and every kind of string literal
+ENGINES = ("regex", "lexer")
+
+# The available ways of searching for files
+WALKERS = ("auto", "python", "find", "rg")
+
+# The formats tables can be written in: text (the `"key" = "value";` .strings
+# format and XML .stringsdict files), or binary property lists, which are
+# smaller and faster for the system to load
+OUTPUT_FORMATS = ("text", "binary")
+
+# The forms a key table can be generated in
+KEY_TABLE_FORMATS = ("dictionary", "array")
+
+# What to do with a file which runs out of time: scan it again with the lexer,
+# skip it (as if it could not be read), or fail the run
+TIMEOUT_ACTIONS = ("lexer", "skip", "fail")
+
+# Seconds between the daemon's polls of the tree for changes
+DEFAULT_POLL_INTERVAL = 1.0
@@ -0,0 +1,293 @@
+"""Scanning code files in a pool of worker processes.
+
+Starting processes needs `multiprocessing`, which is slow to import, so this
+is only imported once there is enough code to be worth scanning in parallel.
+"""
+
+import collections
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from localizedstringkit import chunking
+from localizedstringkit import logger
+from localizedstringkit.exceptions import InvalidLocalizedCallException, UnsupportedFileTypeError
+from localizedstringkit.stats import Stats
+
+if TYPE_CHECKING:
+    from localizedstringkit.budget import TimeBudget
+    from localizedstringkit.detection import StringEntry, _FileResult
+
+log = logger.get()
+
+# The result of scanning a chunk of files in a worker: the unique entries, and
+# for each file the indices of its entries and whether it was skipped by the
+# prefilter, or None if it could not be processed
+_ChunkResult = Tuple[List["StringEntry"], List[Optional[Tuple[List[int], bool]]]]
+
+
+def initialize_worker(engine: str) -> None:
+    """Prepare a worker process to scan files.
+
+    Workers are started without the parent's compiled patterns (on platforms
+    which spawn rather than fork them), so each compiles them before it is
+    sent any files, rather than while scanning its first chunk.
+
+    :param engine: The extraction engine the worker will use
+    """
+    if engine == "lexer":
+        # The lexer's patterns are compiled as it is imported
+        importlib.import_module("localizedstringkit.lexer")
+    else:
+        # pylint: disable=import-outside-toplevel
+        from localizedstringkit.detection import detection_patterns
+
+        detection_patterns()
+
+
+def start_worker_pool(max_workers: Optional[int], engine: str) -> ProcessPoolExecutor:
+    """Start a pool of worker processes to scan files in.
+
+    :param max_workers: Maximum number of parallel workers (None for CPU count)
+    :param engine: The extraction engine the workers will use
+
+    :returns: The pool of workers
+    """
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        initializer=initialize_worker,
+        initargs=(engine,),
+    )
+
+
+def _process_single_file(
+    file_path: str,
+    engine: str,
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+) -> "_FileResult":
+    """Process a single file for parallel execution.
+
+    :param file_path: The file to scan
+    :param engine: The extraction engine to use
+    :param stats: The stats to time the scan in
+    :param budget: The time the scan may take, if it is limited
+    :returns: The list of found entries and whether the file was skipped by the
+              prefilter, or None if the file could not be processed
+    """
+    # detection imports this module when it is needed, so importing it back up
+    # front would be circular
+    # pylint: disable=import-outside-toplevel
+    from localizedstringkit.detection import _scan_file_within_budget
+
+    try:
+        return _scan_file_within_budget(file_path, engine, stats, budget)
+    except (IOError, InvalidLocalizedCallException, UnsupportedFileTypeError) as exception:
+        log.error("Error processing %s: %s", file_path, exception)
+        return None
+
+
+def process_chunk(
+    file_paths: List[str],
+    engine: str = "regex",
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+) -> _ChunkResult:
+    """Process a chunk of files for parallel execution.
+
+    Common strings appear in many files, so each unique entry is only sent
+    back to the parent process once per chunk. Each file's result refers to
+    the entries by their index.
+
+    :param file_paths: The files to scan
+    :param engine: The extraction engine to use
+    :param stats: The stats to time the scans in
+    :param budget: The time each file's scan may take, if it is limited
+    :returns: The unique entries found in the chunk, and for each file (in order) the indices of
+              its entries and whether it was skipped by the prefilter, or None if it could not be
+              processed
+    """
+
+    entry_indices: Dict[StringEntry, int] = {}
+    file_results: List[Optional[Tuple[List[int], bool]]] = []
+
+    for file_path in file_paths:
+        result = _process_single_file(file_path, engine, stats, budget)
+        if result is None:
+            file_results.append(None)
+            continue
+
+        entries, skipped = result
+        indices = []
+        for entry in entries:
+            index = entry_indices.get(entry)
+            if index is None:
+                index = len(entry_indices)
+                entry_indices[entry] = index
+            indices.append(index)
+        file_results.append((indices, skipped))
+
+    # Interned strings shared between entries are pickled once
+    unique_entries: List[StringEntry] = [
+        tuple(None if field is None else sys.intern(field) for field in entry)  # type: ignore[misc]
+        for entry in entry_indices
+    ]
+
+    return unique_entries, file_results
+
+
+def process_chunk_with_stats(
+    file_paths: List[str],
+    engine: str,
+    slowest_files: int = 0,
+    profile_calls: bool = False,
+    budget: Optional["TimeBudget"] = None,
+) -> Tuple[_ChunkResult, Stats]:
+    """Process a chunk of files for parallel execution, collecting stats in the worker.
+
+    :param file_paths: The files to scan
+    :param engine: The extraction engine to use
+    :param slowest_files: The number of slowest files to report (see `Stats`)
+    :param profile_calls: Whether to run `cProfile` while scanning
+    :param budget: The time each file's scan may take, if it is limited
+    :returns: The result of `process_chunk`, and the stats of the chunk to merge into the
+              parent process's stats
+    """
+
+    stats = Stats(slowest_files=slowest_files, profile_calls=profile_calls)
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    with stats.profiling("workers"):
+        chunk_result = process_chunk(file_paths, engine, stats, budget)
+    stats.record_worker(
+        str(os.getpid()),
+        files=len(file_paths),
+        wall=time.perf_counter() - wall,
+        cpu=time.thread_time() - cpu,
+    )
+    return chunk_result, stats
+
+
+def _unpack_chunk(chunk_result: _ChunkResult) -> Iterator["_FileResult"]:
+    """Expand a chunk result back into the result of each file.
+
+    :param chunk_result: The result of `process_chunk`
+
+    :returns: An iterator of each file's result, in order
+    """
+
+    unique_entries, file_results = chunk_result
+    for file_result in file_results:
+        if file_result is None:
+            yield None
+        else:
+            indices, skipped = file_result
+            yield [unique_entries[index] for index in indices], skipped
+
+
+def _chunk_result(future: Future, stats: Optional[Stats]) -> _ChunkResult:
+    """Get the result of a chunk submitted to the workers.
+
+    :param future: The future of the chunk
+    :param stats: The stats to merge the worker's stats into, if they were collected
+
+    :returns: The result of `process_chunk`
+    """
+
+    if stats is None:
+        return future.result()
+
+    chunk_result, chunk_stats = future.result()
+    stats.merge(chunk_stats)
+    return chunk_result
+
+
+def _scan_chunks(
+    executor: Executor,
+    chunks: Iterable[List[str]],
+    engine: str,
+    stats: Optional[Stats],
+    budget: Optional["TimeBudget"],
+) -> Iterator[Tuple[str, "_FileResult"]]:
+    """Scan chunks of files in a pool of worker processes.
+
+    :param executor: The pool of workers
+    :param chunks: The chunks of files to scan
+    :param engine: The extraction engine to use
+    :param stats: The stats to merge each worker's stats into
+    :param budget: The time each file's scan may take, if it is limited
+
+    :returns: An iterator of each file path with its scan result, in the original order
+    """
+
+    pending: Deque[Tuple[List[str], Future]] = collections.deque()
+
+    for chunk in chunks:
+        if stats is None:
+            pending.append((chunk, executor.submit(process_chunk, chunk, engine, None, budget)))
+        else:
+            future = executor.submit(
+                process_chunk_with_stats,
+                chunk,
+                engine,
+                stats.slowest_files,
+                stats.profile_calls,
+                budget,
+            )
+            pending.append((chunk, future))
+
+        # Results are yielded in submission order, as early as possible
+        while pending and pending[0][1].done():
+            done_chunk, future = pending.popleft()
+            yield from zip(done_chunk, _unpack_chunk(_chunk_result(future, stats)))
+
+    while pending:
+        done_chunk, future = pending.popleft()
+        yield from zip(done_chunk, _unpack_chunk(_chunk_result(future, stats)))
+
+
+def scan_files_in_parallel(
+    sized_files: Iterable[Tuple[str, int]],
+    file_count: Optional[int],
+    max_workers: Optional[int],
+    chunk_size: Optional[int],
+    engine: str,
+    *,
+    stats: Optional[Stats] = None,
+    budget: Optional["TimeBudget"] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[Tuple[str, "_FileResult"]]:
+    """Scan files in a pool of worker processes.
+
+    Chunks are submitted as soon as they are filled, so files can still be
+    being found while the first chunks are scanned.
+
+    :param sized_files: The files to scan, with the size of each
+    :param file_count: The total number of files, or None if they are still being found
+    :param max_workers: Maximum number of parallel workers (None for CPU count)
+    :param chunk_size: Maximum number of files sent to a worker at once (None for automatic)
+    :param engine: The extraction engine to use
+    :param stats: The stats to merge each worker's stats into
+    :param budget: The time each file's scan may take, if it is limited
+    :param executor: The pool of workers to scan in (see `start_worker_pool`), or None to start
+                     one for this scan
+
+    :returns: An iterator of each file path with its scan result, in the original order
+    """
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = chunking.automatic_chunk_size(file_count, workers)
+
+    chunks = chunking.chunk_files(sized_files, chunk_size)
+
+    if executor is not None:
+        yield from _scan_chunks(executor, chunks, engine, stats, budget)
+        return
+
+    with start_worker_pool(workers, engine) as new_executor:
+        yield from _scan_chunks(new_executor, chunks, engine, stats, budget)
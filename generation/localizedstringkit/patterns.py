@@ -0,0 +1,71 @@
+"""The sources of the patterns which detect localized calls.
+
+They are large, so they are only compiled when first used (see
+`detection.detection_patterns`) rather than on every import.
+"""
+
+# The calls the patterns match, with the prefix of their named groups and the
+# names of their arguments after the value
+_CALLS = (
+    ("LocalizedWithKeyExtensionAndBundle", "ext_bundle_", ("comment", "extension", "bundle")),
+    ("LocalizedWithBundle", "bundle_", ("comment", "bundle")),
+    ("LocalizedWithKeyExtension", "ext_", ("comment", "extension")),
+    ("Localized", "basic_", ("comment",)),
+)
+
+# Catches any Localized call that isn't matched as a valid call
+_INVALID = (
+    r"(?P<invalid>Localized(?:WithKeyExtension|WithBundle|WithKeyExtensionAndBundle)?\([^)]+\))"
+)
+
+
+def _combined_source(literal_prefix: str, characters: str) -> str:
+    """Build a pattern which matches both valid and invalid calls.
+
+    Valid calls populate the named groups of their arguments, invalid calls
+    populate the 'invalid' group.
+
+    Each argument is a possessive run of characters and bare quotes, where a
+    bare quote only ends the argument if the next argument (or the end of the
+    call) follows it. Nothing is ever backtracked into, so a line with many
+    quotes and no end to the call is matched in linear time rather than
+    trying every way of splitting it into arguments.
+
+    :param literal_prefix: What precedes the quotes of a string literal ("@" for Objective-C)
+    :param characters: A pattern matching a run of characters of a literal, other than quotes
+
+    :returns: The pattern source
+    """
+
+    alternatives = []
+    for name, group_prefix, other_groups in _CALLS:
+        groups = ("value",) + other_groups
+        arguments = []
+
+        for index, group in enumerate(groups):
+            end = r",\s*" + literal_prefix + '"' if index + 1 < len(groups) else r"\s*\)"
+            # The value can't be empty, the other arguments can
+            repeat = "++" if group == "value" else "*+"
+            arguments.append(
+                f'{literal_prefix}"(?P<{group_prefix}{group}>(?:{characters}|"(?!{end})){repeat})"'
+            )
+
+        alternatives.append(name + r"\(\s*" + r",\s*".join(arguments) + r"\s*\)")
+
+    alternatives.append(_INVALID)
+    return "(?:" + "|".join(alternatives) + ")"
+
+
+# The text patterns are matched after escaped quotes have been replaced (see
+# `detection.Detector`), so any other character can be part of a literal
+_TEXT_CHARACTERS = r'[^"\n]++'
+
+# The bytes patterns scan raw (possibly memory mapped) file contents instead.
+# A backslash takes a following quote with it, so an escaped quote can never
+# end an argument.
+_BYTES_CHARACTERS = r'[^"\\\n]++|\\"?+'
+
+SWIFT_COMBINED = _combined_source("", _TEXT_CHARACTERS)
+OBJC_COMBINED = _combined_source("@", _TEXT_CHARACTERS)
+SWIFT_BYTES = _combined_source("", _BYTES_CHARACTERS).encode("utf-8")
+OBJC_BYTES = _combined_source("@", _BYTES_CHARACTERS).encode("utf-8")
@@ -0,0 +1,174 @@
+"""Scanning code files repeatedly with one long lived pool of worker processes.
+
+Each scan normally starts worker processes when there is enough code to scan
+in parallel, and stops them when it is done. Starting them (and compiling the
+patterns in each) can take longer than a short scan itself, so a process
+which scans many times, such as a build driving the generation of many
+targets, can keep one pool for all of its scans instead.
+"""
+
+import threading
+from concurrent.futures import BrokenExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from dotstrings import LocalizedString
+
+from localizedstringkit import detection
+from localizedstringkit.budget import TimeBudget
+from localizedstringkit.stats import Stats
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from localizedstringkit.cache import ExtractionCache
+    from localizedstringkit.detection import StringEntry
+
+_Result = TypeVar("_Result")
+
+
+class Scanner:
+    """Scans code files for localized strings, reusing its worker processes between scans.
+
+    The workers are started (with the patterns already compiled) the first time
+    there is enough code to scan in parallel, and are kept until the scanner is
+    closed. Use it as a context manager to close it automatically.
+
+    :param Optional[int] max_workers: Maximum number of parallel workers (default: CPU count)
+    :param Optional[int] chunk_size: Maximum number of files sent to a worker at once
+                                     (default: automatic)
+    :param str engine: The extraction engine to use, one of `ENGINES` (default: regex)
+    :param Optional[TimeBudget] budget: The time each file's scan may take, and what to do
+                                        with files which run out of time (default: unlimited)
+
+    :raises ValueError: If the engine is unknown
+    """
+
+    max_workers: Optional[int]
+    chunk_size: Optional[int]
+    engine: str
+    budget: Optional[TimeBudget]
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        engine: str = "regex",
+        budget: Optional[TimeBudget] = None,
+    ) -> None:
+        if engine not in detection.ENGINES:
+            raise ValueError(
+                f"Unknown extraction engine: {engine}. Expected one of {detection.ENGINES}"
+            )
+
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.budget = budget
+        self._executor: Optional["Executor"] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Scanner":
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes, once any scans using them are done.
+
+        The scanner can still be used afterwards, and starts new workers if it
+        needs them.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+    def _worker_pool(self) -> "Executor":
+        """Get the pool of workers, starting it if this is the first parallel scan.
+
+        :returns: The pool of workers
+        """
+
+        with self._lock:
+            if self._executor is None:
+                # pylint: disable=import-outside-toplevel
+                from localizedstringkit import parallel as parallel_scanning
+
+                self._executor = parallel_scanning.start_worker_pool(self.max_workers, self.engine)
+
+            return self._executor
+
+    def _scan(
+        self,
+        function: Callable[..., _Result],
+        code_files: Iterable[str],
+        cache: Optional["ExtractionCache"],
+        stats: Optional[Stats],
+    ) -> _Result:
+        """Scan code files with one of the detection functions, using this scanner's workers.
+
+        :param function: The detection function, which takes the arguments of
+                         `detection.entries_by_code_file`
+        :param code_files: The file paths to scan
+        :param cache: The cache to reuse unchanged files' strings from
+        :param stats: The stats to record timings and counters in
+
+        :raises BrokenExecutor: If a worker process died. The pool is closed, so the next
+                                scan starts new workers.
+
+        :returns: The result of the function
+        """
+
+        try:
+            return function(
+                code_files,
+                max_workers=self.max_workers,
+                cache=cache,
+                chunk_size=self.chunk_size,
+                engine=self.engine,
+                stats=stats,
+                budget=self.budget,
+                worker_pool=self._worker_pool,
+            )
+        except BrokenExecutor:
+            self.close()
+            raise
+
+    def unique_strings(
+        self,
+        code_files: Iterable[str],
+        cache: Optional["ExtractionCache"] = None,
+        *,
+        stats: Optional[Stats] = None,
+    ) -> List[LocalizedString]:
+        """Scan code files for their distinct localized strings.
+
+        :param code_files: The file paths to scan. This may be a lazily evaluated iterable.
+        :param cache: The cache to reuse unchanged files' strings from
+        :param stats: The stats to record timings and counters in
+
+        :returns: The distinct localized strings, as `detection.unique_strings_in_code_files`
+        """
+
+        return self._scan(detection.unique_strings_in_code_files, code_files, cache, stats)
+
+    def entries_by_file(
+        self,
+        code_files: Iterable[str],
+        cache: Optional["ExtractionCache"] = None,
+        *,
+        stats: Optional[Stats] = None,
+    ) -> Dict[str, List["StringEntry"]]:
+        """Scan code files for the entries in each.
+
+        :param code_files: The file paths to scan. This may be a lazily evaluated iterable.
+        :param cache: The cache to reuse unchanged files' strings from
+        :param stats: The stats to record timings and counters in
+
+        :returns: The entries found in each file, as `detection.entries_by_code_file`
+        """
+
+        return self._scan(detection.entries_by_code_file, code_files, cache, stats)
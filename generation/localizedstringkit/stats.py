@@ -0,0 +1,400 @@
+"""Timing and counter collection tools."""
+
+import contextlib
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from localizedstringkit.files import write_file_atomically
+
+_T = TypeVar("_T")
+
+# Version of the JSON report layout, bumped on incompatible changes
+_REPORT_VERSION = 1
+
+
+class _RawProfile:
+    """Profile data collected elsewhere, in the form `pstats` loads from a profiler.
+
+    :param dict stats: The data of a `cProfile.Profile`, after `create_stats`
+    """
+
+    stats: dict
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        """Do nothing, as the stats were already created."""
+
+
+class Stats:
+    """The timings and counters collected during a run.
+
+    Phases are timed in wall clock time and in the CPU time of the thread
+    running them. A phase can be entered many times (e.g. once per file), in
+    which case its times are summed. The stats collected in worker processes
+    are sent back to the parent and merged in with `merge`.
+
+    Profiling is opt in. With `slowest_files`, the read and scan time, size
+    and number of matches of each scanned file are recorded and the slowest
+    are reported. With `profile_calls`, `cProfile` runs in each worker while
+    it scans, and in the parent within `profiling`.
+
+    :param int slowest_files: The number of slowest files to report (default: none)
+    :param bool profile_calls: Whether to collect `cProfile` data (default: False)
+    """
+
+    slowest_files: int
+    profile_calls: bool
+    phases: Dict[str, Dict[str, float]]
+    counters: Dict[str, int]
+    workers: Dict[str, Dict[str, float]]
+    file_profiles: List[Dict[str, Any]]
+    call_profiles: Dict[str, List[dict]]
+
+    _started: float
+    _started_cpu: float
+    _lock: threading.Lock
+
+    def __init__(self, *, slowest_files: int = 0, profile_calls: bool = False) -> None:
+        self.slowest_files = slowest_files
+        self.profile_calls = profile_calls
+        self.phases = {}
+        self.counters = {}
+        self.workers = {}
+        self.file_profiles = []
+        self.call_profiles = {"parent": [], "workers": []}
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        """Add time spent in a phase.
+
+        :param str name: The name of the phase
+        :param float wall: The wall clock time spent, in seconds
+        :param float cpu: The CPU time spent, in seconds
+        :param int calls: The number of times the phase was entered
+        """
+
+        with self._lock:
+            timing = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            timing["wall"] += wall
+            timing["cpu"] += cpu
+            timing["calls"] += calls
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed code as a phase.
+
+        :param str name: The name of the phase
+
+        :returns: A context manager timing its body
+        """
+
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def timed(self, name: str, iterable: Iterable[_T]) -> Iterator[_T]:
+        """Time how long is spent waiting for each item of an iterable.
+
+        This is used for lazily evaluated iterables, such as a file search
+        which is still running, to time what they cost their consumer.
+
+        :param str name: The name of the phase
+        :param iterable: The iterable to time
+
+        :returns: An iterator of the items of the iterable
+        """
+
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def wall_time(self, name: str) -> float:
+        """Get the wall clock time spent in a phase so far.
+
+        :param str name: The name of the phase
+
+        :returns: The time in seconds
+        """
+
+        with self._lock:
+            return self.phases.get(name, {}).get("wall", 0.0)
+
+    def record_file(
+        self, file_path: str, *, size: int, read: float, scan: float, matches: int
+    ) -> None:
+        """Record the profile of a scanned file, if the slowest files are being reported.
+
+        :param str file_path: The path of the file
+        :param int size: The size of the file in bytes
+        :param float read: The time spent reading the file, in seconds
+        :param float scan: The time spent scanning the file, in seconds
+        :param int matches: The number of entries found in the file
+        """
+
+        if self.slowest_files <= 0:
+            return
+
+        with self._lock:
+            self.file_profiles.append(
+                {"path": file_path, "bytes": size, "read": read, "scan": scan, "matches": matches}
+            )
+            # Only the slowest are needed, so trim every so often to bound memory
+            if len(self.file_profiles) >= 2 * self.slowest_files:
+                self.file_profiles = self._slowest_file_profiles()
+
+    def _slowest_file_profiles(self) -> List[Dict[str, Any]]:
+        """Get the profiles of the slowest files, slowest first.
+
+        :returns: Up to `slowest_files` file profiles
+        """
+        return heapq.nlargest(
+            self.slowest_files,
+            self.file_profiles,
+            key=lambda profile: profile["read"] + profile["scan"],
+        )
+
+    @contextlib.contextmanager
+    def profiling(self, kind: str = "parent") -> Iterator[None]:
+        """Run `cProfile` on the enclosed code, if calls are being profiled.
+
+        :param str kind: Whether this is the parent process ("parent") or a worker ("workers")
+
+        :returns: A context manager profiling its body
+        """
+
+        if not self.profile_calls:
+            yield
+            return
+
+        # pylint: disable=import-outside-toplevel
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.create_stats()
+            with self._lock:
+                self.call_profiles[kind].append(profiler.stats)  # type: ignore[attr-defined]
+
+    def write_call_profiles(self, directory: str) -> List[str]:
+        """Write the `cProfile` data of the parent and of all the workers combined.
+
+        The files are written as `parent.prof` and `workers.prof`, which can
+        be loaded with `pstats` or any tool reading its format.
+
+        :param str directory: The directory to write the files to
+
+        :returns: The paths of the files written
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import pstats
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+
+        with self._lock:
+            for kind, profiles in self.call_profiles.items():
+                if not profiles:
+                    continue
+
+                combined = pstats.Stats(_RawProfile(profiles[0]))  # type: ignore[arg-type]
+                for profile in profiles[1:]:
+                    combined.add(_RawProfile(profile))  # type: ignore[arg-type]
+
+                path = os.path.join(directory, f"{kind}.prof")
+                combined.dump_stats(path)
+                paths.append(path)
+
+        return paths
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a counter.
+
+        :param str name: The name of the counter
+        :param int amount: The amount to increment it by
+        """
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_worker(self, worker: str, *, files: int, wall: float, cpu: float) -> None:
+        """Record a chunk of files processed by a worker.
+
+        :param str worker: The identifier of the worker
+        :param int files: The number of files in the chunk
+        :param float wall: The wall clock time spent on the chunk, in seconds
+        :param float cpu: The CPU time spent on the chunk, in seconds
+        """
+
+        with self._lock:
+            totals = self.workers.setdefault(
+                worker, {"chunks": 0, "files": 0, "wall": 0.0, "cpu": 0.0}
+            )
+            totals["chunks"] += 1
+            totals["files"] += files
+            totals["wall"] += wall
+            totals["cpu"] += cpu
+
+    def merge(self, other: "Stats") -> None:
+        """Add the timings and counters collected elsewhere, such as in a worker process.
+
+        :param Stats other: The stats to add
+        """
+
+        for name, timing in other.phases.items():
+            self.add_time(name, timing["wall"], timing["cpu"], int(timing["calls"]))
+
+        for name, value in other.counters.items():
+            self.increment(name, value)
+
+        with self._lock:
+            for worker, worker_totals in other.workers.items():
+                totals = self.workers.setdefault(worker, {})
+                for key, amount in worker_totals.items():
+                    totals[key] = totals.get(key, 0) + amount
+
+            for kind, profiles in other.call_profiles.items():
+                self.call_profiles[kind].extend(profiles)
+
+            if self.slowest_files > 0 and other.file_profiles:
+                self.file_profiles.extend(other.file_profiles)
+                self.file_profiles = self._slowest_file_profiles()
+
+    def report(self) -> Dict[str, Any]:
+        """Get the machine readable report of the stats.
+
+        :returns: The report, which can be serialized as JSON
+        """
+
+        with self._lock:
+            report = {
+                "version": _REPORT_VERSION,
+                "wall": time.perf_counter() - self._started,
+                "cpu": time.process_time() - self._started_cpu,
+                "phases": {name: dict(timing) for name, timing in self.phases.items()},
+                "counters": dict(sorted(self.counters.items())),
+                "workers": {name: dict(totals) for name, totals in self.workers.items()},
+            }
+
+            if self.slowest_files > 0:
+                report["slowest_files"] = [dict(p) for p in self._slowest_file_profiles()]
+
+            return report
+
+    def summary(self) -> str:
+        """Get the human readable summary of the stats.
+
+        :returns: The summary, over multiple lines
+        """
+
+        report = self.report()
+        lines = [f"Total: {_milliseconds(report['wall'])} wall, {_milliseconds(report['cpu'])} CPU"]
+
+        for name, timing in report["phases"].items():
+            lines.append(
+                f"  {name}: {_milliseconds(timing['wall'])} wall, "
+                + f"{_milliseconds(timing['cpu'])} CPU ({int(timing['calls'])} call(s))"
+            )
+
+        for name, value in report["counters"].items():
+            lines.append(f"  {name.replace('_', ' ')}: {value}")
+
+        for worker, totals in sorted(report["workers"].items()):
+            lines.append(
+                f"  worker {worker}: {int(totals['files'])} file(s) in {int(totals['chunks'])} "
+                + f"chunk(s), {_milliseconds(totals['wall'])} wall, "
+                + f"{_milliseconds(totals['cpu'])} CPU"
+            )
+
+        if report.get("slowest_files"):
+            lines.append("  slowest files:")
+
+        for profile in report.get("slowest_files", []):
+            lines.append(
+                f"    {profile['path']}: {_milliseconds(profile['read'] + profile['scan'])} "
+                + f"(read {_milliseconds(profile['read'])}, scan {_milliseconds(profile['scan'])}), "
+                + f"{profile['bytes']} bytes, {profile['matches']} match(es)"
+            )
+
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        """Write the machine readable report to a file.
+
+        :param str path: The path of the file to write
+        """
+
+        contents = json.dumps(self.report(), indent=2, sort_keys=True) + "\n"
+        write_file_atomically(path, contents.encode("utf-8"))
+
+
+def _milliseconds(seconds: float) -> str:
+    """Format a duration for the summary.
+
+    :param float seconds: The duration in seconds
+
+    :returns: The formatted duration
+    """
+    return f"{seconds * 1000:.1f}ms"
+
+
+def phase(stats: Optional[Stats], name: str) -> Any:
+    """Time the enclosed code as a phase, if stats are being collected.
+
+    :param Optional[Stats] stats: The stats to record the time in, or None
+    :param str name: The name of the phase
+
+    :returns: A context manager timing its body
+    """
+
+    if stats is None:
+        return contextlib.nullcontext()
+
+    return stats.phase(name)
+
+
+def timed_call(function: Callable[..., _T], *arguments: Any) -> Tuple[_T, float, float]:
+    """Call a function, timing it.
+
+    This can be submitted to an executor in place of the function, so the
+    time is measured wherever the function runs.
+
+    :param function: The function to call
+    :param arguments: The arguments to call it with
+
+    :returns: The result of the call, with its wall clock and CPU time in seconds
+    """
+
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    result = function(*arguments)
+    return result, time.perf_counter() - wall, time.thread_time() - cpu
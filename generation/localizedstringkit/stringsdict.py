@@ -0,0 +1,75 @@
+"""Merging the generated .stringsdict entries into the existing files."""
+
+import os
+from typing import List
+
+from dotstrings import DotStringsDictEntry, loads_dict
+
+from localizedstringkit.exceptions import StringsDictConflictException
+from localizedstringkit.files import write_file_atomically
+from localizedstringkit.formats import stringsdict_contents
+
+
+def create_or_merge_stringsdict_file(
+    existing_stringsdict_path: str,
+    entries: List[DotStringsDictEntry],
+    output_format: str = "text",
+) -> bool:
+    """Create (if not exists) or merge the local .stringsdict file with entries given.
+
+    The file is only rewritten if the merged result differs from its current contents.
+
+    :param str existing_stringsdict_path: Path to the existing .stringsdict file to merge.
+                                          Will be created if not exists.
+    :param List[DotStringsDictEntry] entries: The list of .stringsdict entries to write.
+    :param str output_format: The format to write the file in, one of `OUTPUT_FORMATS`. The
+                              existing file is read whatever its format.
+
+    :raises StringsDictConflictException: If the .stringsdict file has contradicting
+                                          values/variables with entries. Every conflict
+                                          is reported, not just the first.
+
+    :returns: True if the file was written, False if it was already up to date
+    """
+
+    existing_contents = None
+    existing_entries_by_key = {}
+
+    # Check if .stringsdict for given bundle exists
+    if os.path.exists(existing_stringsdict_path):
+        with open(existing_stringsdict_path, "rb") as stringsdict_file:
+            existing_contents = stringsdict_file.read()
+        existing_entries_by_key = {
+            existing_entry.key: existing_entry for existing_entry in loads_dict(existing_contents)
+        }
+
+    conflicts = []
+    results = {}
+
+    for entry in entries:
+        existing_entry = existing_entries_by_key.get(entry.key)
+
+        if existing_entry is not None:
+            if existing_entry.value != entry.value:
+                conflicts.append(f"{entry.key}: value names are inconsistent")
+                continue
+
+            if sorted(entry.variables.keys()) != sorted(existing_entry.variables.keys()):
+                conflicts.append(f"{entry.key}: variables names are inconsistent")
+                continue
+
+            entry.merge(existing_entry)
+
+        results[entry.key] = entry.stringsdict_format()
+
+    if conflicts:
+        raise StringsDictConflictException(existing_stringsdict_path, conflicts)
+
+    contents = stringsdict_contents(results, output_format)
+
+    if contents == existing_contents:
+        return False
+
+    write_file_atomically(existing_stringsdict_path, contents)
+
+    return True
@@ -0,0 +1,66 @@
+"""Running the generation of each bundle concurrently."""
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from localizedstringkit import logger
+
+log = logger.get()
+
+# Maximum number of threads used to generate bundles concurrently
+_MAXIMUM_BUNDLE_THREADS = 16
+
+# The description, function and arguments of a bundle's generation task
+BundleTask = Tuple[str, Callable[..., Any], tuple]
+
+
+def run_for_bundles(
+    tasks: List[BundleTask], executor: Optional[Executor]
+) -> Tuple[List[Any], Dict[str, BaseException]]:
+    """Run the generation task for each bundle, collecting every failure.
+
+    Bundles are independent, so a failed bundle does not stop the others from
+    being generated. As every file is replaced atomically, the failed bundle's
+    files are either fully updated or left as they were.
+
+    :param tasks: The description, function and arguments of each task
+    :param Optional[Executor] executor: The executor to run the tasks on, or None
+                                        to use a thread pool
+
+    :returns: The result of each task in the order of the tasks (None for those
+              which failed), and the error of each failed task keyed by its
+              description
+    """
+
+    if executor is None and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAXIMUM_BUNDLE_THREADS, len(tasks))) as pool:
+            return run_for_bundles(tasks, pool)
+
+    futures: List[Future] = []
+    for _, function, arguments in tasks:
+        if executor is None:
+            # A single task isn't worth a pool, but report it the same way
+            future: Future = Future()
+            try:
+                future.set_result(function(*arguments))
+            except Exception as ex:  # pylint: disable=broad-except
+                future.set_exception(ex)
+        else:
+            future = executor.submit(function, *arguments)
+        futures.append(future)
+
+    results = []
+    failures = {}
+
+    # Report in task order so the log does not depend on which bundle finished first
+    for (description, _, _), future in zip(tasks, futures):
+        error = future.exception()
+        if error is None:
+            log.debug(f"Generated {description}")
+            results.append(future.result())
+        else:
+            log.error(f"Failed to generate {description}: {error}")
+            failures[description] = error
+            results.append(None)
+
+    return results, failures
@@ -2,9 +2,9 @@
 
 pushd "${VIRTUAL_ENV}/.." > /dev/null
 
-python -m black -l 100 localizedstringkit/*.py tests/*.py
+python -m black -l 100 localizedstringkit/*.py tests/*.py benchmarks/*.py
 
-python -m pylint --rcfile=pylintrc localizedstringkit tests
-python -m mypy --ignore-missing-imports localizedstringkit/ tests/
+python -m pylint --rcfile=pylintrc localizedstringkit tests benchmarks
+python -m mypy --ignore-missing-imports localizedstringkit/ tests/ benchmarks/
 
 popd > /dev/null
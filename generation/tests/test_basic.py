@@ -3,10 +3,14 @@
 import filecmp
 import hashlib
 import os
+import pickle
+import plistlib
 import sys
 import tempfile
 from typing import Any, Dict, List
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # pylint: disable=wrong-import-position
@@ -209,3 +213,299 @@ class BasicTestSuite(unittest.TestCase):
             os.path.join(self.data_path, "objc", "expectation"),
             "ObjC",
         )
+
+    def test_extracted_strings_are_reused(self) -> None:
+        """Test that a single scan can drive both the check and the generation."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        temp_dir = tempfile.mkdtemp()
+
+        with mock.patch.object(localizedstringkit.detection, "strings_in_code_files") as scanner:
+            self.assertTrue(
+                localizedstringkit.has_changes(
+                    localized_string_kit_path=temp_dir,
+                    extracted_strings=extracted_strings,
+                    including_stringsdict_files=False,
+                )
+            )
+            localizedstringkit.generate_files(
+                localized_string_kit_path=temp_dir,
+                generate_stringsdict_files=False,
+                extracted_strings=extracted_strings,
+            )
+            self.assertFalse(
+                localizedstringkit.has_changes(
+                    localized_string_kit_path=temp_dir,
+                    extracted_strings=extracted_strings,
+                    including_stringsdict_files=False,
+                )
+            )
+            scanner.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            localizedstringkit.has_changes(localized_string_kit_path=temp_dir)
+
+    def test_unchanged_files_are_not_rewritten(self) -> None:
+        """Test that regenerating identical output leaves every file untouched."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        temp_dir = tempfile.mkdtemp()
+
+        def modification_times() -> Dict[str, int]:
+            """Get the modification time of each generated file.
+
+            :returns: The modification times keyed by path
+            """
+            return {
+                os.path.join(directory, file_name): os.stat(
+                    os.path.join(directory, file_name)
+                ).st_mtime_ns
+                for directory, _, file_names in os.walk(temp_dir)
+                for file_name in file_names
+            }
+
+        localizedstringkit.generate_files(
+            localized_string_kit_path=temp_dir,
+            generate_stringsdict_files=False,
+            extracted_strings=extracted_strings,
+        )
+        before = modification_times()
+
+        with mock.patch.object(localizedstringkit.files, "write_file_atomically") as writer:
+            localizedstringkit.generate_files(
+                localized_string_kit_path=temp_dir,
+                generate_stringsdict_files=False,
+                extracted_strings=extracted_strings,
+            )
+            writer.assert_not_called()
+
+        self.assertEqual(modification_times(), before)
+
+    def test_generated_file_permissions(self) -> None:
+        """Test that new files follow the umask and rewritten files keep their permissions."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        temp_dir = tempfile.mkdtemp()
+        strings_path = os.path.join(
+            temp_dir, "LocalizedStringKit.bundle", "en.lproj", "LocalizedStringKit.strings"
+        )
+        previous_umask = os.umask(0o027)
+
+        try:
+            # Reading the umask would change it for every bundle thread
+            with mock.patch("os.umask") as umask:
+                localizedstringkit.generate_files(
+                    localized_string_kit_path=temp_dir,
+                    generate_stringsdict_files=False,
+                    extracted_strings=extracted_strings,
+                )
+                self.assertEqual(os.stat(strings_path).st_mode & 0o777, 0o640)
+
+                os.chmod(strings_path, 0o600)
+                localizedstringkit.generate_files(
+                    localized_string_kit_path=temp_dir,
+                    generate_stringsdict_files=False,
+                    extracted_strings=extracted_strings,
+                    output_format="binary",
+                )
+                self.assertEqual(os.stat(strings_path).st_mode & 0o777, 0o600)
+
+                umask.assert_not_called()
+        finally:
+            os.umask(previous_umask)
+
+    def test_bundle_failures_are_aggregated(self) -> None:
+        """Test that a failing bundle is reported without stopping the others."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        temp_dir = tempfile.mkdtemp()
+        # pylint: disable=protected-access
+        write_strings_file = localizedstringkit._write_strings_file
+
+        def failing_writer(
+            output_directory: str, strings: List[Any], output_format: str = "text"
+        ) -> bool:
+            """Fail for the info bundle only.
+
+            :param output_directory: The directory to write to
+            :param strings: The strings to write
+            :param output_format: The format to write in
+
+            :raises OSError: For the info bundle
+
+            :returns: Whether any file was written
+            """
+            if output_directory.endswith("info.bundle"):
+                raise OSError("Disk full")
+            return write_strings_file(output_directory, strings, output_format)
+
+        with mock.patch.object(localizedstringkit, "_write_strings_file", failing_writer):
+            with self.assertRaises(localizedstringkit.BundleGenerationException) as context:
+                localizedstringkit.generate_files(
+                    localized_string_kit_path=temp_dir,
+                    generate_stringsdict_files=False,
+                    extracted_strings=extracted_strings,
+                )
+
+        self.assertEqual(list(context.exception.failures.keys()), ["info.bundle"])
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    temp_dir, "LocalizedStringKit.bundle", "en.lproj", "LocalizedStringKit.strings"
+                )
+            )
+        )
+
+    def test_generate_in_processes(self) -> None:
+        """Test that bundles generated in other processes match those generated in threads."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        thread_dir = tempfile.mkdtemp()
+        process_dir = tempfile.mkdtemp()
+
+        localizedstringkit.generate_files(
+            localized_string_kit_path=thread_dir,
+            generate_stringsdict_files=True,
+            extracted_strings=extracted_strings,
+        )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            localizedstringkit.generate_files(
+                localized_string_kit_path=process_dir,
+                generate_stringsdict_files=True,
+                extracted_strings=extracted_strings,
+                executor=executor,
+            )
+
+        def contents(root: str) -> Dict[str, bytes]:
+            """Read every generated file.
+
+            :param root: The folder the files were generated in
+
+            :returns: The contents of each file keyed by relative path
+            """
+            results = {}
+            for directory, _, file_names in os.walk(root):
+                for file_name in file_names:
+                    with open(os.path.join(directory, file_name), "rb") as generated_file:
+                        results[os.path.relpath(generated_file.name, root)] = generated_file.read()
+            return results
+
+        self.assertEqual(contents(process_dir), contents(thread_dir))
+
+    def test_generate_in_processes_reports_conflicts(self) -> None:
+        """Test that a bundle failing in another process is reported like one in a thread."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        extracted_strings = localizedstringkit.extract_strings([code_file])
+        temp_dir = tempfile.mkdtemp()
+
+        key = hashlib.md5(b"%#@firstValue@ and %#@secondValue@").hexdigest()
+        variable = {
+            "NSStringFormatSpecTypeKey": "NSStringPluralRuleType",
+            "NSStringFormatValueTypeKey": "d",
+            "other": "%d",
+        }
+        # An existing entry for the same key whose value no longer matches the code
+        stringsdict_path = os.path.join(
+            temp_dir, "info.bundle", "en.lproj", "LocalizedStringKit.stringsdict"
+        )
+        os.makedirs(os.path.dirname(stringsdict_path))
+        with open(stringsdict_path, "wb") as stringsdict_file:
+            plistlib.dump(
+                {
+                    key: {
+                        "NSStringLocalizedFormatKey": "%#@firstValue@ or %#@secondValue@",
+                        "firstValue": variable,
+                        "secondValue": variable,
+                    }
+                },
+                stringsdict_file,
+            )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            with self.assertRaises(localizedstringkit.BundleGenerationException) as context:
+                localizedstringkit.generate_files(
+                    localized_string_kit_path=temp_dir,
+                    generate_stringsdict_files=True,
+                    extracted_strings=extracted_strings,
+                    executor=executor,
+                )
+
+        failures = list(context.exception.failures.values())
+        self.assertEqual(len(failures), 1)
+        self.assertIsInstance(failures[0], localizedstringkit.StringsDictConflictException)
+        self.assertIn("value names are inconsistent", str(failures[0]))
+
+        # The exceptions can be sent back from a process as a whole, too
+        self.assertEqual(
+            pickle.loads(pickle.dumps(context.exception)).failures.keys(),
+            context.exception.failures.keys(),
+        )
+
+    def test_generate_code_strings_file(self) -> None:
+        """Test that each bundle's strings are written to their own new temporary file."""
+
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        paths, _ = localizedstringkit.generate_code_strings_file([code_file], False)
+
+        try:
+            self.assertEqual(sorted(paths), ["LocalizedStringKit.bundle", "info.bundle"])
+            self.assertEqual(len(set(paths.values())), 2)
+            with open(paths["info.bundle"], encoding="utf-8") as source_file:
+                self.assertEqual(source_file.read().count("NSLocalizedString"), 3)
+        finally:
+            for path in paths.values():
+                os.remove(path)
+
+    def test_prefilter_skips_files_without_calls(self) -> None:
+        """Test that files which can't contain a Localized call are not pattern matched."""
+
+        with tempfile.NamedTemporaryFile("w", suffix=".swift", delete=False) as code_file:
+            code_file.write('let title = String(format: "%d items", count)\n')
+
+        try:
+            with mock.patch.object(localizedstringkit.detection, "_collect_entries") as collector:
+                self.assertEqual(
+                    localizedstringkit.detection.strings_in_code_files([code_file.name]), []
+                )
+                collector.assert_not_called()
+        finally:
+            os.remove(code_file.name)
+
+    def test_bytes_scanning_matches_detectors(self) -> None:
+        """Test that scanning raw or memory mapped bytes finds what the detectors find."""
+
+        # pylint: disable=protected-access
+        detection = localizedstringkit.detection
+
+        for language, file_name in [("swift", "sample.swift"), ("objc", "sample.m")]:
+            code_file = os.path.join(self.data_path, language, file_name)
+            expected = detection._detector_class(code_file)(code_file).find_entries()
+
+            for minimum_size in [detection._MMAP_MINIMUM_BYTES, 0]:
+                with self.subTest(file=file_name, minimum_size=minimum_size):
+                    with mock.patch.object(detection, "_MMAP_MINIMUM_BYTES", minimum_size):
+                        self.assertEqual(detection._scan_file(code_file), (expected, False))
+
+    def test_escaped_quotes_in_bytes_scanning(self) -> None:
+        """Test that escaped quotes don't end an argument when scanning bytes."""
+
+        with tempfile.NamedTemporaryFile("w", suffix=".swift", delete=False) as code_file:
+            code_file.write('Localized("Say \\"hi\\"", "A \\\\ comment \\"quoted\\"")\n')
+
+        try:
+            self.assertEqual(
+                [
+                    (string.value, string.comment)
+                    for string in localizedstringkit.detection.strings_in_code_file(code_file.name)
+                ],
+                [('Say \\"hi\\"', 'A \\\\ comment \\"quoted\\"')],
+            )
+        finally:
+            os.remove(code_file.name)
@@ -0,0 +1,166 @@
+"""Test extracting the strings of several targets in one run."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import batch
+
+# pylint: enable=wrong-import-position
+
+_TOML_CONFIG = """
+[[targets]]
+name = "App"
+roots = ["App", "Shared"]
+localized_string_kit_path = "App/LocalizedStringKit"
+
+[[targets]]
+name = "Widget"
+roots = ["Widget", "Shared"]
+localized_string_kit_path = "Widget/LocalizedStringKit"
+exclude = ["Shared/Debug"]
+exclude_patterns = ["*Tests.swift"]
+"""
+
+
+class BatchTestSuite(unittest.TestCase):
+    """Batch test cases."""
+
+    def setUp(self) -> None:
+        self.root_path = tempfile.mkdtemp()
+
+        for relative_path, value in [
+            ("App/AppDelegate.swift", "App"),
+            ("Widget/Widget.swift", "Widget"),
+            ("Shared/Shared.swift", "Shared"),
+            ("Shared/Debug/Debug.swift", "Debug"),
+            ("Shared/SharedTests.swift", "Tests"),
+        ]:
+            path = os.path.join(self.root_path, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as code_file:
+                code_file.write(f'Localized("{value}", "Comment")\n')
+
+        self.config_path = os.path.join(self.root_path, "batch.toml")
+        with open(self.config_path, "w", encoding="utf-8") as config_file:
+            config_file.write(_TOML_CONFIG)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root_path)
+
+    def write_json_config(self, config: Any) -> str:
+        """Write a JSON config.
+
+        :param config: The config to write
+
+        :returns: The path to the config
+        """
+
+        config_path = os.path.join(self.root_path, "batch.json")
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump(config, config_file)
+        return config_path
+
+    def test_toml_and_json_configs(self) -> None:
+        """Test that both formats are loaded the same, with paths relative to the config."""
+        json_path = self.write_json_config(
+            {
+                "targets": [
+                    {
+                        "name": "Widget",
+                        "roots": ["Widget", "Shared"],
+                        "localized_string_kit_path": "Widget/LocalizedStringKit",
+                        "exclude": ["Shared/Debug"],
+                        "exclude_patterns": ["*Tests.swift"],
+                    }
+                ]
+            }
+        )
+
+        toml_target = batch.load_targets(self.config_path)[1]
+        json_target = batch.load_targets(json_path)[0]
+
+        self.assertEqual(vars(toml_target), vars(json_target))
+        self.assertEqual(
+            toml_target.roots,
+            [os.path.join(self.root_path, "Widget"), os.path.join(self.root_path, "Shared")],
+        )
+        self.assertEqual(
+            toml_target.excluded_folders, [os.path.join(self.root_path, "Shared", "Debug")]
+        )
+
+    def test_invalid_configs(self) -> None:
+        """Test that configs with missing, unknown or conflicting settings are rejected."""
+        target: Dict[str, Any] = {"name": "App", "roots": ["App"], "localized_string_kit_path": "L"}
+
+        for config in [
+            [target],
+            {"targets": []},
+            {"targets": [{**target, "root": "App"}]},
+            {"targets": [{**target, "roots": []}]},
+            {"targets": [{**target, "roots": "App"}]},
+            {"targets": [{**target, "localized_string_kit_path": None}]},
+            {"targets": [target, target]},
+        ]:
+            with self.subTest(config=config):
+                with self.assertRaises(ValueError):
+                    batch.load_targets(self.write_json_config(config))
+
+    def test_shared_files_are_scanned_once(self) -> None:
+        """Test that each target gets the strings of its own files, from a single scan."""
+        targets = batch.load_targets(self.config_path)
+        stats = localizedstringkit.Stats()
+
+        with mock.patch.object(
+            localizedstringkit,
+            "iter_localizable_files",
+            wraps=localizedstringkit.iter_localizable_files,
+        ) as search:
+            strings_by_target = batch.extract_strings(targets, stats=stats)
+
+        self.assertEqual(
+            {
+                name: sorted(string.value for string in extracted_strings.localized_strings)
+                for name, extracted_strings in strings_by_target.items()
+            },
+            {"App": ["App", "Debug", "Shared", "Tests"], "Widget": ["Shared", "Widget"]},
+        )
+        # Shared is searched with different exclusions for each target, but scanned once
+        self.assertEqual(search.call_count, 4)
+        self.assertEqual(stats.counters["files_scanned"], 5)
+
+    def test_generation(self) -> None:
+        """Test that each target's strings can be generated and checked, with a scanner."""
+        targets = batch.load_targets(self.config_path)
+
+        with localizedstringkit.Scanner(max_workers=1) as scanner:
+            strings_by_target = batch.extract_strings(targets, scanner=scanner)
+
+        for target in targets:
+            localizedstringkit.generate_files(
+                localized_string_kit_path=target.localized_string_kit_path,
+                generate_stringsdict_files=False,
+                extracted_strings=strings_by_target[target.name],
+            )
+
+        for target in targets:
+            with self.subTest(target=target.name):
+                self.assertFalse(
+                    localizedstringkit.has_changes(
+                        localized_string_kit_path=target.localized_string_kit_path,
+                        extracted_strings=strings_by_target[target.name],
+                    )
+                )
+                self.assertTrue(
+                    os.path.isfile(
+                        os.path.join(target.localized_string_kit_path, "LocalizedStringKit.m")
+                    )
+                )
@@ -0,0 +1,141 @@
+"""Test the per-file scan time budgets."""
+
+# pylint: disable=protected-access
+
+import os
+import pickle
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import detection
+from localizedstringkit import parallel as parallel_scanning
+
+# pylint: enable=wrong-import-position
+
+
+def stuck_matching(*arguments: Any) -> None:
+    """Stand in for a pattern which backtracks for far longer than any budget.
+
+    :param arguments: The arguments of the matching, which are ignored
+    """
+    del arguments
+    time.sleep(60)
+
+
+class TimeBudgetTestSuite(unittest.TestCase):
+    """Time budget test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.code_file = os.path.join(self.temporary_directory, "Budget.swift")
+        with open(self.code_file, "w", encoding="utf-8") as output_file:
+            output_file.write('Localized("Value", "Comment")\n')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def test_invalid_budgets(self) -> None:
+        """Test that budgets which can't be enforced are rejected."""
+        for seconds, on_timeout in [(0, "lexer"), (-1, "skip"), (1, "retry")]:
+            with self.subTest(seconds=seconds, on_timeout=on_timeout):
+                with self.assertRaises(ValueError):
+                    localizedstringkit.TimeBudget(seconds, on_timeout)
+
+    def test_lexer_fallback(self) -> None:
+        """Test that a file which runs out of time is scanned again with the lexer."""
+        stats = localizedstringkit.Stats()
+        budget = localizedstringkit.TimeBudget(0.05)
+
+        with mock.patch.object(detection, "_collect_entries", side_effect=stuck_matching):
+            strings = detection.strings_in_code_files(
+                [self.code_file], parallel=False, stats=stats, budget=budget
+            )
+
+        self.assertEqual([string.value for string in strings], ["Value"])
+        self.assertEqual(stats.counters["files_timed_out"], 1)
+        self.assertEqual(stats.counters["files_failed"], 0)
+
+    def test_skip(self) -> None:
+        """Test that a file which runs out of time can be skipped, in workers too."""
+        budget = localizedstringkit.TimeBudget(0.05, on_timeout="skip")
+
+        with mock.patch.object(detection, "_collect_entries", side_effect=stuck_matching):
+            stats = localizedstringkit.Stats()
+            strings = detection.strings_in_code_files(
+                [self.code_file], parallel=False, stats=stats, budget=budget
+            )
+            unique_entries, file_results = parallel_scanning.process_chunk(
+                [self.code_file], "regex", None, budget
+            )
+
+        self.assertEqual(strings, [])
+        self.assertEqual(stats.counters["files_failed"], 1)
+        self.assertEqual((unique_entries, file_results), ([], [None]))
+
+    def test_fail(self) -> None:
+        """Test that a file which runs out of time can fail the scan."""
+        budget = localizedstringkit.TimeBudget(0.05, on_timeout="fail")
+
+        with mock.patch.object(detection, "_collect_entries", side_effect=stuck_matching):
+            with self.assertRaises(localizedstringkit.ScanTimeoutException) as context:
+                parallel_scanning.process_chunk([self.code_file], "regex", None, budget)
+
+        # Timeouts in workers are sent back to the parent process
+        exception = pickle.loads(pickle.dumps(context.exception))
+        self.assertEqual((exception.file_path, exception.seconds), (self.code_file, 0.05))
+        self.assertEqual(str(exception), str(context.exception))
+
+    def test_previous_timer_is_restored(self) -> None:
+        """Test that a timer running before the scan is resumed afterwards."""
+        budget = localizedstringkit.TimeBudget(0.05)
+        previous_handler = signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        signal.setitimer(signal.ITIMER_REAL, 100)
+
+        try:
+            with budget.limit(self.code_file):
+                pass
+
+            remaining, _ = signal.getitimer(signal.ITIMER_REAL)
+            self.assertGreater(remaining, 50)
+            self.assertEqual(signal.getsignal(signal.SIGALRM), signal.SIG_IGN)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    def test_other_threads_are_not_limited(self) -> None:
+        """Test that a budget is not enforced outside the main thread, where it can't be."""
+        budget = localizedstringkit.TimeBudget(0.01, on_timeout="fail")
+        errors = []
+
+        def scan() -> None:
+            try:
+                with budget.limit(self.code_file):
+                    time.sleep(0.05)
+            except Exception as exception:  # pylint: disable=broad-except
+                errors.append(exception)
+
+        thread = threading.Thread(target=scan)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_unterminated_calls_scan_quickly(self) -> None:
+        """Test that the patterns don't backtrack on calls with many arguments and no end."""
+        with open(self.code_file, "w", encoding="utf-8") as output_file:
+            output_file.write('LocalizedWithKeyExtensionAndBundle("' + 'a", "' * 20000 + "\n")
+
+        # Any backtracking would take minutes, so this would fail on the budget
+        budget = localizedstringkit.TimeBudget(2, on_timeout="fail")
+        strings = detection.strings_in_code_files([self.code_file], parallel=False, budget=budget)
+        self.assertEqual(strings, [])
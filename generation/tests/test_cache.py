@@ -0,0 +1,232 @@
+"""Test the per-file extraction cache and the digest manifest."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import detection
+from localizedstringkit.cache import DigestManifest, ExtractionCache
+
+# pylint: enable=wrong-import-position
+
+
+class ExtractionCacheTestSuite(unittest.TestCase):
+    """Extraction cache test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.temporary_directory, "cache")
+        self.code_file = os.path.join(self.temporary_directory, "sample.swift")
+        self.write_code('Localized("Calendar", "The name of the calendar tab.")\n')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def write_code(self, contents: str, age: float = 60.0) -> None:
+        """Write the code file with a modification time in the past.
+
+        :param contents: The contents to write
+        :param age: How many seconds ago the file should appear to be modified
+        """
+        with open(self.code_file, "w", encoding="utf-8") as code_file:
+            code_file.write(contents)
+        modification_time = time.time() - age
+        os.utime(self.code_file, (modification_time, modification_time))
+
+    def scan(self, verify_contents: bool = False) -> list:
+        """Scan the code file through a freshly loaded cache.
+
+        :param verify_contents: Whether the cache should validate by content digest
+
+        :returns: The detected strings
+        """
+        cache = ExtractionCache(self.cache_directory, verify_contents=verify_contents)
+        return detection.strings_in_code_files([self.code_file], cache=cache)
+
+    def test_unchanged_file_is_not_scanned(self) -> None:
+        """Test that a cached file is not read again."""
+        expected = self.scan()
+
+        with mock.patch.object(detection, "_scan_file") as scanner:
+            self.assertEqual(self.scan(), expected)
+            scanner.assert_not_called()
+
+    def test_changed_file_is_scanned(self) -> None:
+        """Test that editing a file invalidates its entry."""
+        self.scan()
+        self.write_code('Localized("Email", "Some email label")\n', age=30.0)
+
+        strings = self.scan()
+        self.assertEqual([string.value for string in strings], ["Email"])
+
+    def test_recently_modified_file_is_not_cached(self) -> None:
+        """Test that files inside the timestamp race window are always scanned."""
+        self.write_code('Localized("Email", "Some email label")\n', age=0.0)
+        self.scan()
+
+        with mock.patch.object(detection, "_scan_file", return_value=([], False)) as scanner:
+            self.scan()
+            scanner.assert_called_once()
+
+    def test_verify_contents_survives_touch(self) -> None:
+        """Test that content verification reuses entries for touched files."""
+        expected = self.scan(verify_contents=True)
+        os.utime(self.code_file, (time.time() - 10, time.time() - 10))
+
+        with mock.patch.object(detection, "_scan_file") as scanner:
+            self.assertEqual(self.scan(verify_contents=True), expected)
+            scanner.assert_not_called()
+
+    def test_out_of_date_cache_is_ignored(self) -> None:
+        """Test that a cache written by another version is discarded."""
+        self.scan()
+
+        cache_path = ExtractionCache(self.cache_directory).path
+        with open(cache_path, encoding="utf-8") as cache_file:
+            contents = json.load(cache_file)
+        contents["version"] = "old"
+        with open(cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump(contents, cache_file)
+
+        with mock.patch.object(detection, "_scan_file", return_value=([], False)) as scanner:
+            self.scan()
+            scanner.assert_called_once()
+
+    def test_deleted_file_is_dropped(self) -> None:
+        """Test that the entries of files which are no longer scanned are not kept."""
+        other_file = os.path.join(self.temporary_directory, "other.swift")
+        with open(other_file, "w", encoding="utf-8") as code_file:
+            code_file.write('Localized("Email", "Some email label")\n')
+        modification_time = time.time() - 60
+        os.utime(other_file, (modification_time, modification_time))
+
+        cache = ExtractionCache(self.cache_directory)
+        cache.set_search(self.temporary_directory)
+        detection.strings_in_code_files([self.code_file, other_file], cache=cache)
+
+        os.remove(other_file)
+        cache = ExtractionCache(self.cache_directory)
+        cache.set_search(self.temporary_directory)
+        detection.strings_in_code_files([self.code_file], cache=cache)
+
+        with open(cache.path, encoding="utf-8") as cache_file:
+            contents = json.load(cache_file)
+        self.assertEqual(list(contents["entries"]), [self.code_file])
+        self.assertEqual(contents["files"], [self.code_file])
+
+    def test_listed_files_are_not_recorded(self) -> None:
+        """Test that scanning files which weren't found by a search keeps every other entry."""
+        other_file = os.path.join(self.temporary_directory, "other.swift")
+        with open(other_file, "w", encoding="utf-8") as code_file:
+            code_file.write('Localized("Email", "Some email label")\n')
+        modification_time = time.time() - 60
+        os.utime(other_file, (modification_time, modification_time))
+
+        cache = ExtractionCache(self.cache_directory)
+        cache.set_search(self.temporary_directory)
+        detection.strings_in_code_files([self.code_file, other_file], cache=cache)
+
+        cache = ExtractionCache(self.cache_directory)
+        detection.strings_in_code_files([other_file], cache=cache)
+
+        cache = ExtractionCache(self.cache_directory)
+        self.assertEqual(cache.previous_files, [self.code_file, other_file])
+        with mock.patch.object(detection, "_scan_file") as scanner:
+            detection.strings_in_code_files([self.code_file], cache=cache)
+            scanner.assert_not_called()
+
+
+class DigestManifestTestSuite(unittest.TestCase):
+    """Digest manifest test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.localized_string_kit_path = os.path.join(
+            self.temporary_directory, "LocalizedStringKit"
+        )
+        self.cache_directory = os.path.join(self.temporary_directory, "cache")
+        tests_path = os.path.abspath(os.path.dirname(__file__))
+        self.code_file = os.path.join(tests_path, "data", "swift", "sample.swift")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def has_changes(self) -> bool:
+        """Check for changes with a freshly loaded manifest.
+
+        :returns: True if there are changes, False otherwise
+        """
+        return localizedstringkit.has_changes(
+            localized_string_kit_path=self.localized_string_kit_path,
+            code_files=[self.code_file],
+            digest_manifest=DigestManifest(self.cache_directory),
+        )
+
+    def generate(self) -> None:
+        """Generate the files, recording their digests."""
+        localizedstringkit.generate_files(
+            code_files=[self.code_file],
+            localized_string_kit_path=self.localized_string_kit_path,
+            generate_stringsdict_files=False,
+            digest_manifest=DigestManifest(self.cache_directory),
+        )
+
+    def age_tracking_files(self) -> None:
+        """Date the generated files in the past, outside the timestamp race window."""
+        modification_time = time.time() - 60
+        for file_name in os.listdir(self.localized_string_kit_path):
+            file_path = os.path.join(self.localized_string_kit_path, file_name)
+            os.utime(file_path, (modification_time, modification_time))
+
+    def test_tracking_files_are_not_read(self) -> None:
+        """Test that recorded digests are used instead of reading the tracking files."""
+        self.generate()
+        self.age_tracking_files()
+        self.generate()
+
+        with mock.patch("hashlib.file_digest") as file_digest:
+            self.assertFalse(self.has_changes())
+            file_digest.assert_not_called()
+
+    def test_edited_tracking_file_is_detected(self) -> None:
+        """Test that stored digests are not trusted once a tracking file changes."""
+        self.generate()
+        self.age_tracking_files()
+        self.generate()
+
+        tracking_file = os.path.join(self.localized_string_kit_path, "LocalizedStringKit.m")
+        with open(tracking_file, "a", encoding="utf-8") as source_file:
+            source_file.write("// Edited\n")
+
+        self.assertTrue(self.has_changes())
+
+    def test_recently_written_tracking_file_is_detected(self) -> None:
+        """Test that a rewrite with the same size and mtime as the generated file is detected."""
+        self.generate()
+
+        tracking_file = os.path.join(self.localized_string_kit_path, "LocalizedStringKit.m")
+        stat_result = os.stat(tracking_file)
+        with open(tracking_file, "rb") as source_file:
+            contents = source_file.read()
+        with open(tracking_file, "wb") as source_file:
+            source_file.write(contents.replace(b"Localized", b"Localizer"))
+        os.utime(tracking_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+
+        self.assertEqual(os.stat(tracking_file).st_size, stat_result.st_size)
+        self.assertTrue(self.has_changes())
+
+    def test_check_does_not_write_the_manifest(self) -> None:
+        """Test that only generating the files saves the manifest."""
+        self.generate()
+        self.age_tracking_files()
+
+        self.assertFalse(self.has_changes())
+        self.assertFalse(os.path.exists(self.cache_directory))
@@ -0,0 +1,158 @@
+"""Test the daemon which keeps the strings index in memory."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+from localizedstringkit import daemon
+from localizedstringkit.exceptions import DaemonException, InvalidLocalizedCallException
+
+# pylint: enable=wrong-import-position
+
+
+class DaemonTestSuite(unittest.TestCase):
+    """Daemon test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.root_path = os.path.join(self.temporary_directory, "project")
+        self.localized_string_kit_path = os.path.join(
+            self.temporary_directory, "LocalizedStringKit"
+        )
+        self.socket_path = os.path.join(self.temporary_directory, "daemon.sock")
+        os.makedirs(self.localized_string_kit_path)
+
+        self.write_code("App/Calendar.swift", "Calendar")
+        self.write_code("App/Email.swift", "Email")
+        self.index = daemon.StringIndex(self.root_path, walker="python")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def write_code(self, relative_path: str, value: str) -> None:
+        """Write a code file containing a single string, dated in the past.
+
+        :param relative_path: The path relative to the project root
+        :param value: The value of the string
+        """
+        path = os.path.join(self.root_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as code_file:
+            code_file.write(f'let label = Localized("{value}", "A label")\n')
+
+        # Old enough for the index to trust the modification time
+        past = time.time() - 60
+        os.utime(path, (past, past))
+
+    def values(self) -> List[str]:
+        """Get the values currently in the index.
+
+        :returns: The sorted values
+        """
+        return sorted(string.value for string in self.index.extracted_strings().localized_strings)
+
+    def request(self, command: str, **arguments: Any) -> Dict[str, Any]:
+        """Send a request to the daemon.
+
+        :param command: The command to send
+        :param arguments: The other fields of the request
+
+        :returns: The response
+        """
+        return daemon.send_request(
+            self.socket_path,
+            {
+                "command": command,
+                "root_path": self.root_path,
+                "localized_string_kit_path": self.localized_string_kit_path,
+                **arguments,
+            },
+            timeout=30,
+        )
+
+    def test_refresh_only_scans_changes(self) -> None:
+        """Test that refreshing picks up new, edited and deleted files."""
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.values(), ["Calendar", "Email"])
+        self.assertEqual(self.index.refresh(), 0)
+
+        self.write_code("App/Email.swift", "Inbox")
+        self.write_code("App/Mail.swift", "Mail")
+        os.remove(os.path.join(self.root_path, "App", "Calendar.swift"))
+
+        self.assertEqual(self.index.refresh(), 3)
+        self.assertEqual(self.values(), ["Inbox", "Mail"])
+
+    def test_invalid_calls(self) -> None:
+        """Test that the strings aren't available while a file has an invalid call."""
+        self.index.refresh()
+
+        invalid_path = os.path.join(self.root_path, "App", "Invalid.swift")
+        with open(invalid_path, "w", encoding="utf-8") as code_file:
+            code_file.write('let label = Localized(value, "A label")\n')
+        past = time.time() - 60
+        os.utime(invalid_path, (past, past))
+
+        self.index.refresh()
+        with self.assertRaisesRegex(InvalidLocalizedCallException, "Invalid.swift"):
+            self.index.extracted_strings()
+
+        self.write_code("App/Invalid.swift", "Fixed")
+        self.index.refresh()
+        self.assertEqual(self.values(), ["Calendar", "Email", "Fixed"])
+
+    def test_existing_files_are_not_removed(self) -> None:
+        """Test that the daemon won't replace a file which isn't a socket."""
+        with open(self.socket_path, "w", encoding="utf-8") as existing_file:
+            existing_file.write("Not a socket\n")
+
+        with self.assertRaisesRegex(DaemonException, "not a socket"):
+            daemon._remove_stale_socket(self.socket_path)  # pylint: disable=protected-access
+
+        self.assertTrue(os.path.isfile(self.socket_path))
+
+    def test_requests(self) -> None:
+        """Test checking and generating through the socket."""
+        ready = threading.Event()
+        server = threading.Thread(
+            target=daemon.serve, args=(self.socket_path, self.index, 0.05, ready)
+        )
+        server.start()
+
+        try:
+            self.assertTrue(ready.wait(30))
+
+            response = self.request("check")
+            self.assertEqual((response["strings"], response["changes"]), (2, True))
+
+            response = self.request("generate")
+            self.assertEqual((response["changes"], response["generated"]), (True, True))
+            self.assertFalse(self.request("check")["changes"])
+
+            self.write_code("App/Mail.swift", "Mail")
+            response = self.request("check")
+            self.assertEqual((response["strings"], response["changes"]), (3, True))
+
+            with self.assertRaises(DaemonException):
+                self.request("check", root_path=self.temporary_directory)
+
+            with open(
+                os.path.join(self.root_path, "App", "Mail.swift"), "w", encoding="utf-8"
+            ) as code_file:
+                code_file.write('let label = Localized(value, "A label")\n')
+            for command in ["check", "generate"]:
+                with self.assertRaisesRegex(DaemonException, "invalid calls"):
+                    self.request(command)
+        finally:
+            daemon.send_request(self.socket_path, {"command": "shutdown"}, timeout=30)
+            server.join(30)
+
+        self.assertFalse(server.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
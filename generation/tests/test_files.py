@@ -0,0 +1,216 @@
+"""Test finding the code files to scan."""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+
+# pylint: enable=wrong-import-position
+
+
+class WalkerTestSuite(unittest.TestCase):
+    """File walker test cases."""
+
+    def setUp(self) -> None:
+        self.root_path = tempfile.mkdtemp()
+
+        for relative_path in [
+            "App/AppDelegate.swift",
+            "App/Views/Calendar.swift",
+            "App/Views/Legacy.m",
+            "App/Views/Legacy.h",
+            "App/README.md",
+            "App/CalendarTests.swift",
+            "Pods/Library/Library.m",
+            "Vendor/Kit/Kit.swift",
+            "Vendor/Kit.m",
+            "Main.swift",
+        ]:
+            path = os.path.join(self.root_path, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as code_file:
+                code_file.write("\n")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root_path)
+
+    def find(self, walker: str, **kwargs) -> list:
+        """Find the files with a walker, relative to the root.
+
+        :param walker: The walker to use
+        :param kwargs: Any other arguments for localizable_files
+
+        :returns: The sorted relative paths which were found
+        """
+        return sorted(
+            os.path.relpath(path, self.root_path)
+            for path in localizedstringkit.localizable_files(
+                root_path=self.root_path, walker=walker, **kwargs
+            )
+        )
+
+    def test_python_walker_matches_find(self) -> None:
+        """Test that the Python walker finds the same files as find."""
+        for kwargs in [
+            {},
+            {"excluded_folders": ["Pods", "Vendor/Kit/"]},
+            {"excluded_patterns": ["Pods/", "*Tests.swift"]},
+            {"excluded_patterns": ["/Vendor/*.m", "Views"]},
+        ]:
+            with self.subTest(**kwargs):
+                self.assertEqual(self.find("python", **kwargs), self.find("find", **kwargs))
+
+    def test_wildcards_do_not_match_slashes(self) -> None:
+        """Test that every walker matches patterns one name at a time, like .gitignore files."""
+        walkers = ["python", "find"] + (["rg"] if shutil.which("rg") else [])
+        app = ["App/AppDelegate.swift", "App/CalendarTests.swift"]
+        views = ["App/Views/Calendar.swift", "App/Views/Legacy.m"]
+        vendor = ["Vendor/Kit.m", "Vendor/Kit/Kit.swift"]
+
+        for excluded_patterns, expected in [
+            (["App/*.swift"], views + ["Main.swift", "Pods/Library/Library.m"] + vendor),
+            (
+                ["App/*/Legacy.m", "/*.swift"],
+                app + ["App/Views/Calendar.swift", "Pods/Library/Library.m"] + vendor,
+            ),
+            (["**/Kit.swift", "**/Library"], app + views + ["Main.swift", "Vendor/Kit.m"]),
+            (
+                ["Vendor/**/*.swift", "**/Views/"],
+                app + ["Main.swift", "Pods/Library/Library.m", "Vendor/Kit.m"],
+            ),
+            (
+                ["Vendor/**", "App/**/*.m"],
+                app + ["App/Views/Calendar.swift", "Main.swift", "Pods/Library/Library.m"],
+            ),
+        ]:
+            for walker in walkers:
+                with self.subTest(excluded_patterns=excluded_patterns, walker=walker):
+                    self.assertEqual(
+                        self.find(walker, excluded_patterns=excluded_patterns),
+                        [os.path.join(*path.split("/")) for path in expected],
+                    )
+
+    def test_excluded_folders_are_pruned(self) -> None:
+        """Test that excluded folders are not descended into."""
+        self.assertEqual(
+            self.find("python", excluded_folders=["App", "Vendor"]),
+            ["Main.swift", os.path.join("Pods", "Library", "Library.m")],
+        )
+
+    def test_directory_patterns_only_match_folders(self) -> None:
+        """Test that patterns with a trailing slash do not exclude files."""
+        self.assertIn(
+            os.path.join("Vendor", "Kit.m"), self.find("python", excluded_patterns=["Kit.m/"])
+        )
+        self.assertNotIn(
+            os.path.join("Vendor", "Kit", "Kit.swift"),
+            self.find("python", excluded_patterns=["Kit/"]),
+        )
+
+    def test_relative_root(self) -> None:
+        """Test that exclusions apply when the root path is relative."""
+        current_directory = os.getcwd()
+        os.chdir(self.root_path)
+        try:
+            for walker in ["python", "find"]:
+                with self.subTest(walker=walker):
+                    files = localizedstringkit.localizable_files(
+                        root_path=".", excluded_folders=["App", "Pods", "Vendor"], walker=walker
+                    )
+                    self.assertEqual(files, [os.path.join(".", "Main.swift")])
+        finally:
+            os.chdir(current_directory)
+
+    def test_negated_patterns_are_rejected(self) -> None:
+        """Test that negated patterns raise rather than being silently ignored."""
+        with self.assertRaises(ValueError):
+            self.find("python", excluded_patterns=["!Main.swift"])
+
+
+class BlockReader:
+    """A stream which returns its blocks one read at a time, like a pipe being written to.
+
+    :param blocks: The blocks to return
+    """
+
+    def __init__(self, blocks: List[bytes]) -> None:
+        self.blocks = blocks
+        self.reads = 0
+
+    def read1(self, size: int) -> bytes:
+        """Return the next block.
+
+        :param size: The most to return, which the blocks are smaller than
+
+        :returns: The next block, or nothing once they have all been read
+        """
+        del size
+        self.reads += 1
+        return self.blocks.pop(0) if self.blocks else b""
+
+
+class FileListTestSuite(unittest.TestCase):
+    """File list test cases."""
+
+    def setUp(self) -> None:
+        self.root_path = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root_path)
+
+    def test_newline_separated(self) -> None:
+        """Test that code files are read from each line, in order and without repeats."""
+        file_list = io.BytesIO(
+            b"App/Main.swift\r\n\nApp/Legacy.m\nApp/Legacy.h\nApp/Main.swift\n/abs/My View.swift"
+        )
+
+        self.assertEqual(
+            list(localizedstringkit.iter_listed_files(file_list, root_path="Root")),
+            [
+                os.path.join("Root", "App", "Main.swift"),
+                os.path.join("Root", "App", "Legacy.m"),
+                "/abs/My View.swift",
+            ],
+        )
+
+    def test_nul_separated(self) -> None:
+        """Test that lists separated by NULs can hold paths with newlines."""
+        file_list = io.BytesIO(b"Main.swift\0Odd\nName.m\0Caf\xc3\xa9.swift\0")
+
+        self.assertEqual(
+            list(localizedstringkit.iter_listed_files(file_list)),
+            ["Main.swift", "Odd\nName.m", "Café.swift"],
+        )
+
+    def test_paths_are_streamed(self) -> None:
+        """Test that each path is yielded as soon as it is read."""
+        reader = BlockReader([b"Fir", b"st.swift\0Sec", b"ond.swift\0", b"Third.m"])
+        files = localizedstringkit.iter_listed_files(reader)  # type: ignore[arg-type]
+
+        self.assertEqual(next(files), "First.swift")
+        self.assertEqual(reader.reads, 2)
+        self.assertEqual(list(files), ["Second.swift", "Third.m"])
+
+    def test_standard_input(self) -> None:
+        """Test that the list is read from stdin for '-', and that the files can be scanned."""
+        code_file = os.path.join(self.root_path, "Listed.swift")
+        with open(code_file, "w", encoding="utf-8") as output_file:
+            output_file.write('Localized("Listed", "Comment")\n')
+
+        stdin = io.TextIOWrapper(io.BytesIO(b"Listed.swift\nREADME.md\n"))
+        with mock.patch.object(sys, "stdin", stdin):
+            extracted_strings = localizedstringkit.extract_strings(
+                localizedstringkit.iter_listed_files("-", root_path=self.root_path)
+            )
+
+        self.assertEqual(
+            [string.value for string in extracted_strings.localized_strings], ["Listed"]
+        )
@@ -0,0 +1,146 @@
+"""Test the output formats of the generated tables."""
+
+import os
+import plistlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+import dotstrings
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import formats
+
+# pylint: enable=wrong-import-position
+
+
+class OutputFormatTestSuite(unittest.TestCase):
+    """Output format test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        data_path = os.path.join(os.path.abspath(os.path.dirname(__file__)), "data")
+        self.extracted_strings = localizedstringkit.extract_strings(
+            [os.path.join(data_path, "swift", "sample.swift")]
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def generate(self, output_format: str, generate_stringsdict_files: bool = True) -> str:
+        """Generate the files for the sample strings.
+
+        :param output_format: The format to write the tables in
+        :param generate_stringsdict_files: Whether to generate .stringsdict files
+
+        :returns: The path the files were generated in
+        """
+
+        path = os.path.join(self.temporary_directory, output_format)
+        localizedstringkit.generate_files(
+            localized_string_kit_path=path,
+            generate_stringsdict_files=generate_stringsdict_files,
+            extracted_strings=self.extracted_strings,
+            output_format=output_format,
+        )
+        return path
+
+    def test_unescaping(self) -> None:
+        """Test that values are unescaped as a text .strings file would be."""
+        for value, expected in [
+            ("Plain", "Plain"),
+            ('Send \\"%@\\"?', 'Send "%@"?'),
+            ("Line\\nbreak\\tand tab", "Line\nbreak\tand tab"),
+            ("Back\\\\slash", "Back\\slash"),
+            ("\\U00e9t\\351", "été"),
+            ("\\UD83D\\UDE00", "\U0001F600"),
+            ("Lone \\UD83D", "Lone \ud83d"),
+            ("Unknown \\q", "Unknown q"),
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(formats.unescape_strings_value(value), expected)
+
+    def test_binary_tables_match_text(self) -> None:
+        """Test that binary tables hold what the text tables load as, with the same tracking."""
+        text_path = self.generate("text")
+        binary_path = self.generate("binary")
+
+        for bundle in ["LocalizedStringKit.bundle", "info.bundle"]:
+            strings_path = os.path.join(bundle, "en.lproj", "LocalizedStringKit.strings")
+            with self.subTest(bundle=bundle):
+                text_entries = dotstrings.load(os.path.join(text_path, strings_path))
+                with open(os.path.join(binary_path, strings_path), "rb") as strings_file:
+                    self.assertTrue(strings_file.read().startswith(b"bplist00"))
+                    strings_file.seek(0)
+                    binary_entries = plistlib.load(strings_file)
+
+                self.assertEqual(
+                    binary_entries,
+                    {
+                        entry.key: formats.unescape_strings_value(entry.value)
+                        for entry in text_entries
+                    },
+                )
+
+                stringsdict_path = os.path.join(
+                    bundle, "en.lproj", "LocalizedStringKit.stringsdict"
+                )
+                with open(os.path.join(text_path, stringsdict_path), "rb") as text_file:
+                    with open(os.path.join(binary_path, stringsdict_path), "rb") as binary_file:
+                        self.assertEqual(plistlib.load(binary_file), plistlib.load(text_file))
+
+                tracking_file = bundle.replace(".bundle", ".m")
+                with open(os.path.join(text_path, tracking_file), "rb") as text_file:
+                    with open(os.path.join(binary_path, tracking_file), "rb") as binary_file:
+                        self.assertEqual(binary_file.read(), text_file.read())
+
+    def test_binary_tables_are_not_changes(self) -> None:
+        """Test that the output format doesn't affect the check for changes."""
+        text_path = self.generate("text", generate_stringsdict_files=False)
+        shutil.copytree(text_path, os.path.join(self.temporary_directory, "binary"))
+        binary_path = self.generate("binary", generate_stringsdict_files=False)
+
+        self.assertFalse(
+            localizedstringkit.has_changes(
+                localized_string_kit_path=binary_path,
+                extracted_strings=self.extracted_strings,
+            )
+        )
+
+    def test_unpaired_surrogates(self) -> None:
+        """Test that a value a binary table can't hold fails its bundle with a clear error."""
+        with tempfile.NamedTemporaryFile("w", suffix=".swift", delete=False) as code_file:
+            code_file.write('Localized("Lone \\UD83D", "Comment")\n')
+        self.addCleanup(os.remove, code_file.name)
+        extracted_strings = localizedstringkit.extract_strings([code_file.name])
+
+        with self.assertRaises(localizedstringkit.BundleGenerationException) as context:
+            localizedstringkit.generate_files(
+                localized_string_kit_path=os.path.join(self.temporary_directory, "binary"),
+                generate_stringsdict_files=False,
+                extracted_strings=extracted_strings,
+                output_format="binary",
+            )
+
+        error = context.exception.failures["LocalizedStringKit.bundle"]
+        self.assertIsInstance(error, ValueError)
+        self.assertIn(extracted_strings.localized_strings[0].key, str(error))
+        self.assertIn("unpaired surrogate", str(error))
+
+        # The text table holds the escape as it is written
+        localizedstringkit.generate_files(
+            localized_string_kit_path=os.path.join(self.temporary_directory, "text"),
+            generate_stringsdict_files=False,
+            extracted_strings=extracted_strings,
+            key_table_format="array",
+        )
+
+    def test_unknown_format(self) -> None:
+        """Test that an unknown output format is rejected before anything is written."""
+        with self.assertRaises(ValueError):
+            self.generate("xml")
+
+        self.assertFalse(os.path.exists(os.path.join(self.temporary_directory, "xml")))
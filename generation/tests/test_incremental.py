@@ -0,0 +1,196 @@
+"""Test incremental extraction from a known set of changed files."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import detection
+
+# pylint: enable=wrong-import-position
+
+
+class IncrementalTestSuite(unittest.TestCase):
+    """Incremental extraction test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.root_path = os.path.join(self.temporary_directory, "project")
+        self.cache_directory = os.path.join(self.temporary_directory, "cache")
+
+        self.write_code("App/Calendar.swift", "Calendar")
+        self.write_code("App/Email.swift", "Email")
+        self.write_code("Pods/Library.swift", "Library")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def path(self, relative_path: str) -> str:
+        """Get the path of a file in the project.
+
+        :param relative_path: The path relative to the project root
+
+        :returns: The full path
+        """
+        return os.path.join(self.root_path, relative_path)
+
+    def write_code(self, relative_path: str, value: str) -> None:
+        """Write a code file containing a single string, dated in the past.
+
+        :param relative_path: The path relative to the project root
+        :param value: The value of the string
+        """
+        path = self.path(relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as code_file:
+            code_file.write(f'Localized("{value}", "A comment")\n')
+        modification_time = time.time() - 60
+        os.utime(path, (modification_time, modification_time))
+
+    def extract(self, changed_files: Optional[List[str]] = None) -> list:
+        """Extract the strings, incrementally if the changed files are given.
+
+        :param Optional[List[str]] changed_files: The files which have changed since the last run
+
+        :returns: The sorted string values
+        """
+        cache = localizedstringkit.ExtractionCache(self.cache_directory)
+        code_files = None
+
+        if changed_files is not None:
+            code_files = localizedstringkit.incremental_code_files(
+                cache=cache,
+                root_path=self.root_path,
+                changed_files=[self.path(file_path) for file_path in changed_files],
+                excluded_folders=["Pods"],
+            )
+
+        if code_files is None:
+            cache.set_search(self.root_path, excluded_folders=["Pods"])
+            code_files = localizedstringkit.localizable_files(
+                root_path=self.root_path, excluded_folders=["Pods"], walker="python"
+            )
+
+        extracted = localizedstringkit.extract_strings(code_files, cache=cache)
+        return sorted(string.value for string in extracted.localized_strings)
+
+    def test_without_previous_run(self) -> None:
+        """Test that an incremental run needs a previous run to start from."""
+        cache = localizedstringkit.ExtractionCache(self.cache_directory)
+        self.assertIsNone(
+            localizedstringkit.incremental_code_files(
+                cache=cache, root_path=self.root_path, changed_files=[]
+            )
+        )
+
+    def test_only_changed_files_are_read(self) -> None:
+        """Test that unchanged files are neither scanned nor checked on disk."""
+        self.extract()
+        self.write_code("App/Email.swift", "Inbox")
+        self.write_code("App/New.swift", "New")
+
+        # pylint: disable=protected-access
+        with mock.patch.object(detection, "_scan_file", wraps=detection._scan_file) as scanner:
+            with mock.patch("os.stat", wraps=os.stat) as stat:
+                strings = self.extract(["App/Email.swift", "App/New.swift"])
+
+        self.assertEqual(strings, ["Calendar", "Inbox", "New"])
+        scanned = sorted(call.args[0] for call in scanner.call_args_list)
+        self.assertEqual(scanned, [self.path("App/Email.swift"), self.path("App/New.swift")])
+        self.assertNotIn(
+            self.path("App/Calendar.swift"), [call.args[0] for call in stat.call_args_list]
+        )
+
+    def test_deleted_and_excluded_files(self) -> None:
+        """Test that deleted files are dropped and excluded files are not added."""
+        self.extract()
+        os.remove(self.path("App/Email.swift"))
+        self.write_code("Pods/Other.swift", "Other")
+
+        self.assertEqual(self.extract(["App/Email.swift", "Pods/Other.swift"]), ["Calendar"])
+
+        # The updated file list is the starting point for the next run
+        self.assertEqual(self.extract([]), ["Calendar"])
+
+    def test_other_searches_are_not_updated(self) -> None:
+        """Test that only a previous search of the same root with the same exclusions is used."""
+        self.extract()
+
+        for root_path, excluded_folders in [
+            (self.root_path, None),
+            (self.root_path, ["Pods", "App"]),
+            (os.path.join(self.root_path, "App"), ["Pods"]),
+        ]:
+            with self.subTest(root_path=root_path, excluded_folders=excluded_folders):
+                self.assertIsNone(
+                    localizedstringkit.incremental_code_files(
+                        cache=localizedstringkit.ExtractionCache(self.cache_directory),
+                        root_path=root_path,
+                        changed_files=[],
+                        excluded_folders=excluded_folders,
+                    )
+                )
+
+        # Spelling the same search differently doesn't matter
+        self.assertEqual(
+            localizedstringkit.incremental_code_files(
+                cache=localizedstringkit.ExtractionCache(self.cache_directory),
+                root_path=os.path.join(self.root_path, "App", ".."),
+                changed_files=[],
+                excluded_folders=["./Pods/"],
+            ),
+            [self.path("App/Calendar.swift"), self.path("App/Email.swift")],
+        )
+
+        # Scanning files which weren't found by a search leaves the previous search alone
+        cache = localizedstringkit.ExtractionCache(self.cache_directory)
+        localizedstringkit.extract_strings([self.path("Pods/Library.swift")], cache=cache)
+        self.assertEqual(
+            localizedstringkit.incremental_code_files(
+                cache=localizedstringkit.ExtractionCache(self.cache_directory),
+                root_path=self.root_path,
+                changed_files=[],
+                excluded_folders=["Pods"],
+            ),
+            [self.path("App/Calendar.swift"), self.path("App/Email.swift")],
+        )
+
+    def test_git_changed_files(self) -> None:
+        """Test finding the changed files with git."""
+
+        def git(*arguments: str) -> None:
+            subprocess.run(
+                ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *arguments],
+                cwd=self.root_path,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+        git("init", "-q")
+        git("add", ".")
+        git("commit", "-q", "-m", "Initial")
+        git("tag", "base")
+
+        self.write_code("App/Email.swift", "Email inbox")
+        git("mv", "App/Calendar.swift", "App/Schedule.swift")
+        git("commit", "-q", "-m", "Rename")
+        self.write_code("App/New.swift", "New")
+
+        self.assertEqual(
+            sorted(localizedstringkit.git_changed_files(self.root_path, "base")),
+            [
+                self.path("App/Calendar.swift"),
+                self.path("App/Email.swift"),
+                self.path("App/New.swift"),
+                self.path("App/Schedule.swift"),
+            ],
+        )
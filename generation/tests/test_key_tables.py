@@ -0,0 +1,269 @@
+"""Test the generated precomputed key tables."""
+
+import ast
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import Optional
+
+from dotstrings import LocalizedString
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import detection, key_tables
+
+# pylint: enable=wrong-import-position
+
+_LIBRARY_SOURCE = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "..",
+        "Sources",
+        "LocalizedStringKit",
+        "LocalizedStringKit.m",
+    )
+)
+
+# The library's hashing code, with CommonCrypto's MD5 swapped for OpenSSL's
+_HASHING_PROGRAM = """
+#include <stdio.h>
+#include <string.h>
+#include <openssl/md5.h>
+
+#define CC_MD5_DIGEST_LENGTH MD5_DIGEST_LENGTH
+#define CC_MD5 MD5
+typedef unsigned int CC_LONG;
+
+int main(int argc, char **argv) {{
+{hashing_code}
+
+  for (int idx = 0; idx < CC_MD5_DIGEST_LENGTH; idx++) {{
+    printf("%02x", outputCharacterArray[idx]);
+  }}
+  return 0;
+}}
+"""
+
+
+def localized_string(value: str, key_extension: Optional[str] = None) -> LocalizedString:
+    """Create a string the way the detection does.
+
+    :param value: The value as written in the code
+    :param key_extension: The key extension as written in the code
+
+    :returns: The localized string
+    """
+
+    return detection.localized_string_from_entry(
+        (value, "Comment", key_extension, "LocalizedStringKit")
+    )
+
+
+class KeyTableTestSuite(unittest.TestCase):
+    """Key table test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.localized_string_kit_path = os.path.join(self.temporary_directory, "output")
+        code_file = os.path.join(self.temporary_directory, "KeyTables.swift")
+        with open(code_file, "w", encoding="utf-8") as output_file:
+            output_file.write('Localized("Plain", "Comment")\n')
+            output_file.write('LocalizedWithKeyExtension("Schedule", "Comment", "Verb")\n')
+            output_file.write('LocalizedWithBundle("Info", "Comment", "info")\n')
+        self.extracted_strings = localizedstringkit.extract_strings([code_file])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def generate(self, key_table_format: str = "array") -> None:
+        """Generate the files for the strings, with key tables.
+
+        :param key_table_format: The form of the key tables
+        """
+
+        localizedstringkit.generate_files(
+            localized_string_kit_path=self.localized_string_kit_path,
+            generate_stringsdict_files=False,
+            extracted_strings=self.extracted_strings,
+            key_table_format=key_table_format,
+        )
+
+    def has_changes(self, key_table_format: str = "array") -> bool:
+        """Check the generated files for changes.
+
+        :param key_table_format: The form of the key tables
+
+        :returns: Whether there are changes
+        """
+
+        return localizedstringkit.has_changes(
+            localized_string_kit_path=self.localized_string_kit_path,
+            extracted_strings=self.extracted_strings,
+            key_table_format=key_table_format,
+        )
+
+    def test_only_equivalent_keys_are_precomputed(self) -> None:
+        """Test that strings are only in the table if the key is that of the compiled string."""
+        keys, left_out = key_tables.precomputed_keys(
+            [
+                localized_string("Plain"),
+                localized_string("Schedule", "Verb"),
+                localized_string('Send \\"%@\\"?'),
+                localized_string("Line\\nbreak"),
+                localized_string("Tab\\tseparated"),
+                localized_string("Nul\\0"),
+                localized_string("Lone \\UD83D"),
+            ]
+        )
+
+        self.assertEqual(sorted(keys), ["Line\nbreak", "Plain", "Schedule:Verb", 'Send "%@"?'])
+        self.assertEqual(left_out, 3)
+        for hash_input, key in keys.items():
+            self.assertEqual(hashlib.md5(hash_input.encode("utf-8")).hexdigest(), key)
+
+    def test_array_table(self) -> None:
+        """Test that the array table is sorted, and that its literals hold the hash inputs."""
+        strings = [
+            localized_string(value)
+            for value in ["Zebra", "apple", "Été", 'Say \\"hi\\"', "Two\\nlines", "Back\\\\"]
+        ]
+        keys, left_out = key_tables.precomputed_keys(strings)
+        contents = key_tables.key_table_contents("LocalizedStringKit", keys, "array").decode()
+
+        entries = re.findall(r'^  \{("(?:[^"\\]|\\.)*"), "([0-9a-f]{32})"\},$', contents, re.M)
+        # C and Python agree on the escapes used, so the literals can be read back in Python
+        inputs = [ast.literal_eval(literal) for literal, _ in entries]
+
+        # The key of an escaped backslash is computed from the escape, not the compiled string
+        self.assertEqual((len(entries), left_out), (len(strings) - 1, 1))
+        self.assertEqual(inputs, sorted(inputs, key=lambda hash_input: hash_input.encode()))
+        for hash_input, (_, key) in zip(inputs, entries):
+            self.assertEqual(hashlib.md5(hash_input.encode("utf-8")).hexdigest(), key)
+        self.assertIn('LSKRegisterKeyLookup(@"LocalizedStringKit", lookUpKey);', contents)
+
+    def test_keys_match_the_library(self) -> None:
+        """Test that the library's hashing gives the keys in the table, for long inputs too."""
+        compiler = shutil.which("cc")
+        if compiler is None:
+            self.skipTest("No C compiler is available")
+
+        with open(_LIBRARY_SOURCE, encoding="utf-8") as source_file:
+            match = re.search(
+                r"^ *const char \*inputCharacterArray = \[hashInput UTF8String\];$.*?^ *CC_MD5\(.*?\);$",
+                source_file.read(),
+                re.M | re.S,
+            )
+        assert match is not None
+        hashing_code = match.group(0).replace("[hashInput UTF8String]", "argv[1]")
+
+        program_path = os.path.join(self.temporary_directory, "hash")
+        result = subprocess.run(
+            [
+                compiler,
+                "-x",
+                "c",
+                "-o",
+                program_path,
+                "-",
+                "-lcrypto",
+                "-Wno-deprecated-declarations",
+            ],
+            input=_HASHING_PROGRAM.format(hashing_code=hashing_code),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            self.skipTest(f"The hashing code could not be built with OpenSSL: {result.stderr}")
+
+        keys, _ = key_tables.precomputed_keys(
+            [
+                localized_string("Plain"),
+                localized_string("A string longer than a pointer"),
+                localized_string("Schedule", "Verb"),
+                localized_string("Été\\n"),
+            ]
+        )
+        self.assertEqual(len(keys), 4)
+
+        for hash_input, key in keys.items():
+            with self.subTest(hash_input=hash_input):
+                output = subprocess.run(
+                    [program_path, hash_input], capture_output=True, check=True, text=True
+                ).stdout
+                self.assertEqual(output, key)
+
+    def test_empty_array_table(self) -> None:
+        """Test that an array table without any keys doesn't declare a zero length array."""
+        contents = key_tables.key_table_contents("LocalizedStringKit", {}, "array").decode()
+
+        self.assertNotIn("precomputedKeys[]", contents)
+        self.assertIn("return nil;", contents)
+        self.assertIn('LSKRegisterKeyLookup(@"LocalizedStringKit", lookUpKey);', contents)
+
+    def test_bundle_names_sharing_a_table(self) -> None:
+        """Test that bundles which would share a key table file are rejected."""
+        code_file = os.path.join(self.temporary_directory, "Bundles.swift")
+        with open(code_file, "w", encoding="utf-8") as output_file:
+            output_file.write('LocalizedWithBundle("Info", "Comment", "info")\n')
+            output_file.write('LocalizedWithBundle("More", "Comment", "info.bundle")\n')
+        self.extracted_strings = localizedstringkit.extract_strings([code_file])
+
+        with self.assertRaisesRegex(ValueError, "infoKeys.m"):
+            self.generate()
+        with self.assertRaisesRegex(ValueError, "infoKeys.m"):
+            self.has_changes()
+        self.assertFalse(os.path.exists(self.localized_string_kit_path))
+
+    def test_generated_files(self) -> None:
+        """Test that a key table is generated for each bundle, in either form."""
+        for key_table_format in ["dictionary", "array"]:
+            with self.subTest(key_table_format=key_table_format):
+                self.generate(key_table_format)
+
+                with open(
+                    os.path.join(self.localized_string_kit_path, "infoKeys.m"), encoding="utf-8"
+                ) as key_table_file:
+                    contents = key_table_file.read()
+
+                key = hashlib.md5(b"Info").hexdigest()
+                if key_table_format == "dictionary":
+                    self.assertIn(f'@"Info": @"{key}",', contents)
+                else:
+                    self.assertIn(f'{{"Info", "{key}"}},', contents)
+                self.assertIn('LSKRegisterKeyLookup(@"info", lookUpKey);', contents)
+                self.assertTrue(
+                    os.path.exists(
+                        os.path.join(self.localized_string_kit_path, "LocalizedStringKitKeys.m")
+                    )
+                )
+
+    def test_has_changes(self) -> None:
+        """Test that missing or out of date key tables are reported as changes."""
+        localizedstringkit.generate_files(
+            localized_string_kit_path=self.localized_string_kit_path,
+            generate_stringsdict_files=False,
+            extracted_strings=self.extracted_strings,
+        )
+        self.assertTrue(self.has_changes())
+
+        self.generate()
+        self.assertFalse(self.has_changes())
+        self.assertTrue(self.has_changes("dictionary"))
+
+        os.remove(os.path.join(self.localized_string_kit_path, "infoKeys.m"))
+        self.assertTrue(self.has_changes())
+
+    def test_unknown_format(self) -> None:
+        """Test that unknown key table formats are rejected."""
+        with self.assertRaises(ValueError):
+            self.generate("hash")
+        with self.assertRaises(ValueError):
+            self.has_changes("hash")
@@ -0,0 +1,166 @@
+"""Test the lexer extraction engine."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+from localizedstringkit import detection, lexer
+from localizedstringkit.cache import ExtractionCache
+from localizedstringkit.exceptions import InvalidLocalizedCallException
+
+# pylint: enable=wrong-import-position
+
+
+_BUNDLE = "LocalizedStringKit.bundle"
+
+
+class LexerTestSuite(unittest.TestCase):
+    """Lexer engine test cases."""
+
+    def setUp(self) -> None:
+        tests_path = os.path.abspath(os.path.dirname(__file__))
+        self.data_path = os.path.join(tests_path, "data")
+        self.temporary_directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def test_matches_regex_engine(self) -> None:
+        """Test that both engines find the same strings, or both reject the file."""
+        for language in ["swift", "objc"]:
+            folder = os.path.join(self.data_path, language)
+            for file_name in sorted(os.listdir(folder)):
+                code_file = os.path.join(folder, file_name)
+                if not os.path.isfile(code_file):
+                    continue
+
+                with self.subTest(file=file_name):
+                    try:
+                        expected = detection.strings_in_code_file(code_file)
+                    except InvalidLocalizedCallException:
+                        with self.assertRaises(InvalidLocalizedCallException):
+                            detection.strings_in_code_file(code_file, engine="lexer")
+                        continue
+
+                    self.assertEqual(
+                        detection.strings_in_code_file(code_file, engine="lexer"), expected
+                    )
+
+    def test_comments_and_strings_are_ignored(self) -> None:
+        """Test that calls mentioned in comments or other literals are not extracted."""
+        entries, invalid_calls = lexer.find_entries(
+            "// Localized(value, comment)\n"
+            + '/* Localized("A", "B") /* nested */ Localized("C", "D") */\n'
+            + 'let text = "Localized(\\"E\\", \\"F\\")"\n'
+            + 'let label = Localized("G", "H")\n',
+            objc=False,
+        )
+
+        self.assertEqual(entries, [("G", "H", None, _BUNDLE)])
+        self.assertEqual(invalid_calls, [])
+
+    def test_literals_with_parentheses(self) -> None:
+        """Test that literals can contain parentheses, escaped quotes and interpolations."""
+        entries, _ = lexer.find_entries(
+            'Localized("Delete (%d)", "Button")\n'
+            + 'Localized("Say \\"hi\\" to \\(name(for: "me"))", "Greeting")\n',
+            objc=False,
+        )
+
+        self.assertEqual(
+            entries,
+            [
+                ("Delete (%d)", "Button", None, _BUNDLE),
+                ('Say \\"hi\\" to \\(name(for: "me"))', "Greeting", None, _BUNDLE),
+            ],
+        )
+
+    def test_raw_literals(self) -> None:
+        """Test that raw literals are converted to the form of a normal literal."""
+        entries, _ = lexer.find_entries(
+            'LocalizedWithKeyExtension(#"Say "hi" to \\#(name) at C:\\Users"#, "Greeting", "k")',
+            objc=False,
+        )
+
+        self.assertEqual(
+            entries, [('Say \\"hi\\" to \\(name) at C:\\\\Users', "Greeting", "k", _BUNDLE)]
+        )
+
+    def test_multiline_literals(self) -> None:
+        """Test that multi-line literals are dedented and joined with escaped line breaks."""
+        entries, _ = lexer.find_entries(
+            "    let text = Localized(\n"
+            + '        """\n'
+            + '        First "line"\n'
+            + "          Indented \\\n"
+            + "        continued\n"
+            + '        """,\n'
+            + '        "Some comment"\n'
+            + "    )\n",
+            objc=False,
+        )
+
+        self.assertEqual(
+            entries,
+            [('First \\"line\\"\\n  Indented continued', "Some comment", None, _BUNDLE)],
+        )
+
+    def test_objc_literals(self) -> None:
+        """Test Objective-C literals, character literals and C strings."""
+        entries, invalid_calls = lexer.find_entries(
+            "char quote = '\"';\n"
+            + 'const char *text = "Localized(@\\"A\\", @\\"B\\")";\n'
+            + 'NSString *a = LocalizedWithBundle(@"Open (%@)", @"C", @"Other");\n'
+            + 'NSString *b = Localized("C string", @"D");\n',
+            objc=True,
+        )
+
+        self.assertEqual(entries, [("Open (%@)", "C", None, "Other")])
+        self.assertEqual(invalid_calls, ['Localized("C string", @"D")'])
+
+    def test_invalid_calls(self) -> None:
+        """Test that non-literal and wrongly counted arguments are reported."""
+        _, invalid_calls = lexer.find_entries(
+            'Localized(name, "A")\n'
+            + 'Localized("B", "C", "D")\n'
+            + 'Localized("", "E")\n'
+            + 'Localized("F" + suffix, "G")\n'
+            + 'func Localized(_ value: String, _ comment: String) -> String { "" }\n'
+            + "isLocalized(value)\n",
+            objc=False,
+        )
+
+        self.assertEqual(
+            invalid_calls,
+            [
+                'Localized(name, "A")',
+                'Localized("B", "C", "D")',
+                'Localized("", "E")',
+                'Localized("F" + suffix, "G")',
+            ],
+        )
+
+    def test_unknown_engine(self) -> None:
+        """Test that an unknown engine is rejected."""
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        with self.assertRaises(ValueError):
+            detection.strings_in_code_file(code_file, engine="parser")
+
+    def test_cache_is_per_engine(self) -> None:
+        """Test that a cache is only used with the engine it holds results for."""
+        code_file = os.path.join(self.data_path, "swift", "sample.swift")
+        cache = ExtractionCache(self.temporary_directory, engine="lexer")
+
+        with self.assertRaises(ValueError):
+            detection.strings_in_code_files([code_file], cache=cache)
+
+        strings = detection.strings_in_code_files([code_file], cache=cache, engine="lexer")
+        self.assertEqual(strings, detection.strings_in_code_file(code_file))
+
+        # The regex engine doesn't reuse the lexer's results
+        regex_cache = ExtractionCache(self.temporary_directory)
+        self.assertIsNone(regex_cache.previous_files)
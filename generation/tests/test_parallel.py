@@ -0,0 +1,99 @@
+"""Test the parallel scanning of code files."""
+
+# pylint: disable=protected-access
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+from localizedstringkit import chunking, detection
+from localizedstringkit import parallel as parallel_scanning
+
+# pylint: enable=wrong-import-position
+
+
+class ParallelScanTestSuite(unittest.TestCase):
+    """Parallel scanning test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.code_files = []
+
+        for index in range(12):
+            code_file = os.path.join(self.temporary_directory, f"file_{index:02}.swift")
+            with open(code_file, "w", encoding="utf-8") as output_file:
+                output_file.write(f'Localized("String {index}", "Comment {index}")\n' * (index % 3))
+            self.code_files.append(code_file)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def test_chunks_respect_file_limit(self) -> None:
+        """Test that chunks never exceed the requested number of files."""
+        sizes = [10] * len(self.code_files)
+        chunks = list(chunking.chunk_files(zip(self.code_files, sizes), 5))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 5, 2])
+        self.assertEqual([path for chunk in chunks for path in chunk], self.code_files)
+
+    def test_chunks_respect_byte_limit(self) -> None:
+        """Test that large files close a chunk early."""
+        sizes = [1] * len(self.code_files)
+        sizes[3] = 64 * 1024 * 1024
+        chunks = list(chunking.chunk_files(zip(self.code_files, sizes), 3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 1, 3, 3, 2])
+
+    def test_small_scans_are_sequential(self) -> None:
+        """Test that small amounts of code are not worth starting workers for."""
+        self.assertFalse(chunking.should_scan_in_parallel(1000, 1000 * 1024, max_workers=None))
+        self.assertFalse(chunking.should_scan_in_parallel(1000, 1000 * 1024 * 1024, max_workers=1))
+
+    def test_parallel_results_match_sequential(self) -> None:
+        """Test that parallel scanning returns the same strings in the same order."""
+        sequential = detection.strings_in_code_files(self.code_files, parallel=False)
+
+        with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+            parallel = detection.strings_in_code_files(self.code_files, max_workers=3, chunk_size=2)
+
+        self.assertEqual(len(sequential), 12)
+        self.assertEqual(parallel, sequential)
+
+    def test_streamed_files_are_sorted(self) -> None:
+        """Test that lazily found files are scanned in parallel and returned in sorted order."""
+        sequential = detection.strings_in_code_files(self.code_files, parallel=False)
+
+        with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+            streamed = detection.strings_in_code_files(
+                iter(reversed(self.code_files)), max_workers=2
+            )
+
+        self.assertEqual(streamed, sequential)
+
+    def test_chunk_results_are_deduplicated(self) -> None:
+        """Test that entries repeated within a chunk are only sent back once."""
+        unique_entries, file_results = parallel_scanning.process_chunk(
+            [self.code_files[2], self.code_files[5], self.code_files[2]]
+        )
+
+        self.assertEqual(
+            unique_entries,
+            [
+                ("String 2", "Comment 2", None, "LocalizedStringKit.bundle"),
+                ("String 5", "Comment 5", None, "LocalizedStringKit.bundle"),
+            ],
+        )
+        self.assertEqual(file_results, [([0, 0], False), ([1, 1], False), ([0, 0], False)])
+
+    def test_unique_strings_match_deduplicated_strings(self) -> None:
+        """Test that unique strings are the distinct strings in order of first appearance."""
+        strings = detection.strings_in_code_files(self.code_files * 2, parallel=False)
+        unique_strings = detection.unique_strings_in_code_files(self.code_files * 2, parallel=False)
+
+        self.assertEqual(unique_strings, list(dict.fromkeys(strings)))
+        self.assertEqual(len(unique_strings), 8)
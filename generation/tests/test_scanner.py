@@ -0,0 +1,129 @@
+"""Test scanning with a long lived pool of workers."""
+
+# pylint: disable=protected-access
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import BrokenExecutor
+from typing import List, Set
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import chunking, detection
+from localizedstringkit import parallel as parallel_scanning
+
+# pylint: enable=wrong-import-position
+
+
+class ScannerTestSuite(unittest.TestCase):
+    """Scanner test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.localized_string_kit_path = os.path.join(self.temporary_directory, "output")
+        self.code_files: List[str] = []
+
+        for index in range(8):
+            code_file = os.path.join(self.temporary_directory, f"scanner_{index}.swift")
+            with open(code_file, "w", encoding="utf-8") as output_file:
+                output_file.write(f'Localized("Value {index % 5}", "Comment")\n')
+            self.code_files.append(code_file)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def worker_ids(self, scanner: localizedstringkit.Scanner) -> Set[str]:
+        """Scan the code files in parallel, checking the strings found.
+
+        :param scanner: The scanner to scan with
+
+        :returns: The process IDs of the workers which scanned the files
+        """
+
+        stats = localizedstringkit.Stats()
+        with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+            strings = scanner.unique_strings(self.code_files, stats=stats)
+
+        self.assertEqual([string.value for string in strings], [f"Value {i}" for i in range(5)])
+        return set(stats.workers)
+
+    def test_workers_are_reused(self) -> None:
+        """Test that every scan uses the same workers, until the scanner is closed."""
+        with localizedstringkit.Scanner(max_workers=2, chunk_size=2) as scanner:
+            first_ids = self.worker_ids(scanner)
+            executor = scanner._executor
+            second_ids = self.worker_ids(scanner)
+
+            self.assertIs(scanner._executor, executor)
+            self.assertLessEqual(len(first_ids | second_ids), 2)
+
+        self.assertIsNone(scanner._executor)
+
+        # A closed scanner starts new workers if it is used again
+        try:
+            self.assertTrue(self.worker_ids(scanner).isdisjoint(first_ids | second_ids))
+        finally:
+            scanner.close()
+
+    def test_small_scans_start_no_workers(self) -> None:
+        """Test that workers are only started once there is enough code to scan in parallel."""
+        with localizedstringkit.Scanner() as scanner:
+            strings = scanner.unique_strings(self.code_files)
+            self.assertEqual(len(strings), 5)
+            self.assertIsNone(scanner._executor)
+
+    def test_generation(self) -> None:
+        """Test that the generation and the check can scan with a scanner."""
+        with localizedstringkit.Scanner(max_workers=2) as scanner:
+            normal_strings, _ = localizedstringkit.get_strings(
+                self.code_files, False, scanner=scanner
+            )
+            self.assertEqual(len(normal_strings["LocalizedStringKit.bundle"]), 5)
+
+            with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+                localizedstringkit.generate_files(
+                    code_files=self.code_files,
+                    localized_string_kit_path=self.localized_string_kit_path,
+                    generate_stringsdict_files=False,
+                    scanner=scanner,
+                )
+                self.assertFalse(
+                    localizedstringkit.has_changes(
+                        code_files=self.code_files,
+                        localized_string_kit_path=self.localized_string_kit_path,
+                        scanner=scanner,
+                    )
+                )
+
+            self.assertIsNotNone(scanner._executor)
+
+    def test_broken_pool_is_replaced(self) -> None:
+        """Test that a pool whose worker died is closed, so the next scan starts a new one."""
+        scanner = localizedstringkit.Scanner(max_workers=2)
+        self.worker_ids(scanner)
+
+        with mock.patch.object(
+            detection, "unique_strings_in_code_files", side_effect=BrokenExecutor
+        ):
+            with self.assertRaises(BrokenExecutor):
+                scanner.unique_strings(self.code_files)
+
+        self.assertIsNone(scanner._executor)
+
+    def test_worker_initializer(self) -> None:
+        """Test that workers compile the patterns before they are sent any files."""
+        detection._compiled.cache_clear()
+        parallel_scanning.initialize_worker("regex")
+        self.assertEqual(
+            detection._compiled.cache_info().currsize, len(detection.detection_pattern_sources())
+        )
+
+    def test_unknown_engine(self) -> None:
+        """Test that unknown engines are rejected up front."""
+        with self.assertRaises(ValueError):
+            localizedstringkit.Scanner(engine="ast")
@@ -0,0 +1,93 @@
+"""Test the start up cost of the command line entry point."""
+
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict
+
+# Modules which are only needed by some commands, so must not be imported eagerly
+_DEFERRED_MODULES = [
+    "importlib.metadata",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "socketserver",
+    "localizedstringkit.daemon",
+    "localizedstringkit.lexer",
+    "localizedstringkit.parallel",
+    "localizedstringkit.batch",
+    "tomllib",
+    "concurrent.futures",
+    "dotstrings",
+    "localizedstringkit.cache",
+    "localizedstringkit.detection",
+    "localizedstringkit.files",
+    "localizedstringkit.formats",
+    "localizedstringkit.key_tables",
+    "localizedstringkit.scanner",
+    "localizedstringkit.stats",
+]
+
+# Importing the entry point takes under twice as long as importing argparse and
+# logging, which it can't start without. Importing the scanning and generation
+# modules up front takes it to over three times as long.
+_IMPORT_TIME_RATIO = 2.5
+
+# Import times vary from run to run, so the fastest of a few runs is compared
+_IMPORT_TIME_RUNS = 3
+
+
+class StartupTestSuite(unittest.TestCase):
+    """Start up test cases."""
+
+    def import_times(
+        self, statement: str = "import localizedstringkit.command_line"
+    ) -> Dict[str, int]:
+        """Run an import statement in a new interpreter and time each import.
+
+        :param statement: The import statement to run (default: import the entry point)
+
+        :returns: The cumulative import time of each module in microseconds
+        """
+
+        package_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=package_path,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(cumulative)
+
+        return times
+
+    def test_deferred_imports(self) -> None:
+        """Test that modules only some commands need are not imported up front."""
+        times = self.import_times()
+        self.assertIn("localizedstringkit.command_line", times)
+
+        for module in _DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, times)
+
+    def test_import_time_budget(self) -> None:
+        """Test that importing the entry point costs little more than its dependencies."""
+        entry_point_time = min(
+            self.import_times()["localizedstringkit.command_line"] for _ in range(_IMPORT_TIME_RUNS)
+        )
+        dependencies_time = min(
+            sum(
+                self.import_times("import argparse, logging")[module]
+                for module in ["argparse", "logging"]
+            )
+            for _ in range(_IMPORT_TIME_RUNS)
+        )
+
+        self.assertLess(entry_point_time, dependencies_time * _IMPORT_TIME_RATIO)
@@ -0,0 +1,166 @@
+"""Test the collection of timings and counters."""
+
+import json
+import os
+import pickle
+import pstats
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit import chunking, detection
+
+# pylint: enable=wrong-import-position
+
+
+class StatsTestSuite(unittest.TestCase):
+    """Stats test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.localized_string_kit_path = os.path.join(self.temporary_directory, "output")
+        self.code_files = []
+
+        # A third of the files have no strings, the rest repeat one or two
+        for index in range(12):
+            code_file = os.path.join(self.temporary_directory, f"stats_{index:02}.swift")
+            with open(code_file, "w", encoding="utf-8") as output_file:
+                output_file.write(f'Localized("Value {index}", "Comment")\n' * (index % 3))
+            self.code_files.append(code_file)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def test_extraction_counters(self) -> None:
+        """Test the counters and phases recorded while extracting strings."""
+        stats = localizedstringkit.Stats()
+        extracted_strings = localizedstringkit.extract_strings(
+            iter(self.code_files), max_workers=1, stats=stats
+        )
+
+        self.assertEqual(len(extracted_strings.localized_strings), 8)
+        self.assertEqual(
+            stats.counters,
+            {
+                "bytes_read": sum(os.path.getsize(path) for path in self.code_files),
+                "duplicates": 4,
+                "files_cached": 0,
+                "files_failed": 0,
+                "files_prefiltered": 4,
+                "files_scanned": 12,
+                "matches": 12,
+                "strings": 8,
+            },
+        )
+        self.assertEqual(stats.phases["read"]["calls"], 12)
+        self.assertEqual(stats.phases["prefilter"]["calls"], 12)
+        self.assertEqual(stats.phases["match"]["calls"], 8)
+        self.assertEqual(stats.phases["discovery"]["calls"], 13)
+        self.assertIn("dedup", stats.phases)
+        self.assertEqual(stats.workers, {})
+
+    def test_worker_stats_are_merged(self) -> None:
+        """Test that the stats collected in worker processes reach the parent."""
+        stats = localizedstringkit.Stats()
+
+        with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+            detection.strings_in_code_files(
+                self.code_files, max_workers=2, chunk_size=5, stats=stats
+            )
+
+        self.assertEqual(stats.counters["files_scanned"], 12)
+        self.assertEqual(stats.phases["read"]["calls"], 12)
+        self.assertEqual(sum(worker["files"] for worker in stats.workers.values()), 12)
+        self.assertEqual(sum(worker["chunks"] for worker in stats.workers.values()), 3)
+
+    def test_generation_counters(self) -> None:
+        """Test that written and unchanged bundles are counted and timed."""
+        extracted_strings = localizedstringkit.extract_strings(self.code_files)
+
+        for expected_counter in ["bundles_written", "bundles_skipped"]:
+            stats = localizedstringkit.Stats()
+            localizedstringkit.generate_files(
+                localized_string_kit_path=self.localized_string_kit_path,
+                generate_stringsdict_files=False,
+                extracted_strings=extracted_strings,
+                stats=stats,
+            )
+            localizedstringkit.has_changes(
+                localized_string_kit_path=self.localized_string_kit_path,
+                extracted_strings=extracted_strings,
+                stats=stats,
+            )
+
+            self.assertEqual(stats.counters, {expected_counter: 1})
+            self.assertEqual(sorted(stats.phases), ["check", "write:LocalizedStringKit.bundle"])
+
+    def test_report(self) -> None:
+        """Test the JSON report, and that stats survive being sent between processes."""
+        stats = localizedstringkit.Stats()
+        with stats.phase("discovery"):
+            stats.increment("files_scanned", 3)
+        stats.record_worker("1", files=3, wall=0.5, cpu=0.25)
+
+        merged = localizedstringkit.Stats()
+        merged.merge(pickle.loads(pickle.dumps(stats)))
+        merged.merge(stats)
+
+        report_path = os.path.join(self.temporary_directory, "stats.json")
+        merged.write_json(report_path)
+        with open(report_path, encoding="utf-8") as report_file:
+            report = json.load(report_file)
+
+        self.assertEqual(report["counters"], {"files_scanned": 6})
+        self.assertEqual(report["phases"]["discovery"]["calls"], 2)
+        self.assertEqual(
+            report["workers"], {"1": {"chunks": 2, "files": 6, "wall": 1.0, "cpu": 0.5}}
+        )
+        self.assertIn("worker 1: 6 file(s) in 2 chunk(s)", merged.summary())
+
+    def test_slowest_files(self) -> None:
+        """Test that the slowest files are profiled, in sequential and parallel scans."""
+        for parallel in [False, True]:
+            stats = localizedstringkit.Stats(slowest_files=3)
+
+            with mock.patch.object(chunking, "should_scan_in_parallel", return_value=parallel):
+                detection.strings_in_code_files(
+                    self.code_files, max_workers=2, chunk_size=2, stats=stats
+                )
+
+            with self.subTest(parallel=parallel):
+                slowest_files = stats.report()["slowest_files"]
+                self.assertEqual(len(slowest_files), 3)
+
+                times = [profile["read"] + profile["scan"] for profile in slowest_files]
+                self.assertEqual(times, sorted(times, reverse=True))
+
+                for profile in slowest_files:
+                    self.assertEqual(profile["bytes"], os.path.getsize(profile["path"]))
+                    self.assertEqual(profile["matches"], int(profile["path"][-8:-6]) % 3)
+
+    def test_call_profiles(self) -> None:
+        """Test that the parent and worker profiles are written."""
+        stats = localizedstringkit.Stats(profile_calls=True)
+
+        with stats.profiling():
+            with mock.patch.object(chunking, "should_scan_in_parallel", return_value=True):
+                detection.strings_in_code_files(
+                    self.code_files, max_workers=2, chunk_size=4, stats=stats
+                )
+
+        self.assertEqual(len(stats.call_profiles["workers"]), 3)
+
+        profile_directory = os.path.join(self.temporary_directory, "profiles")
+        paths = stats.write_call_profiles(profile_directory)
+
+        self.assertEqual(
+            paths,
+            [os.path.join(profile_directory, name) for name in ["parent.prof", "workers.prof"]],
+        )
+        worker_profile = pstats.Stats(paths[1]).get_stats_profile()
+        self.assertIn("process_chunk", worker_profile.func_profiles)
@@ -0,0 +1,144 @@
+"""Test merging .stringsdict files."""
+
+import os
+import plistlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+from dotstrings import DotStringsDictEntry, Variable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# pylint: disable=wrong-import-position
+import localizedstringkit
+from localizedstringkit.exceptions import StringsDictConflictException
+
+# pylint: enable=wrong-import-position
+
+
+def _entry(key: str, value: str, *variables: str) -> DotStringsDictEntry:
+    """Create a .stringsdict entry as the generator does.
+
+    :param str key: The key of the entry
+    :param str value: The value of the entry
+    :param str variables: The names of the variables in the value
+
+    :returns: The entry
+    """
+    return DotStringsDictEntry(key, value, {variable: Variable() for variable in variables})
+
+
+class StringsDictTestSuite(unittest.TestCase):
+    """Stringsdict merge test cases."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.temporary_directory, "LocalizedStringKit.stringsdict")
+
+        existing = {
+            "first": {
+                "NSStringLocalizedFormatKey": "%#@count@ files",
+                "count": {
+                    "NSStringFormatSpecTypeKey": "NSStringPluralRuleType",
+                    "NSStringFormatValueTypeKey": "d",
+                    "one": "%d file",
+                    "other": "%d files",
+                },
+            },
+            "second": {
+                "NSStringLocalizedFormatKey": "%#@count@ folders",
+                "count": {
+                    "NSStringFormatSpecTypeKey": "NSStringPluralRuleType",
+                    "NSStringFormatValueTypeKey": "d",
+                    "other": "%d folders",
+                },
+            },
+        }
+
+        with open(self.path, "wb") as stringsdict_file:
+            plistlib.dump(existing, stringsdict_file, sort_keys=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temporary_directory)
+
+    def test_merge_keeps_existing_variables(self) -> None:
+        """Test that existing plural rules are kept and new entries are added."""
+        written = localizedstringkit.create_or_merge_stringsdict_file(
+            self.path,
+            [
+                _entry("first", "%#@count@ files", "count"),
+                _entry("third", "%#@count@ mails", "count"),
+            ],
+        )
+        self.assertTrue(written)
+
+        with open(self.path, "rb") as stringsdict_file:
+            contents = plistlib.load(stringsdict_file)
+
+        self.assertEqual(sorted(contents.keys()), ["first", "third"])
+        self.assertEqual(contents["first"]["count"]["one"], "%d file")
+
+    def test_unchanged_file_is_not_rewritten(self) -> None:
+        """Test that the file is left alone when the merge does not change it."""
+        entries = [
+            _entry("first", "%#@count@ files", "count"),
+            _entry("second", "%#@count@ folders", "count"),
+        ]
+        localizedstringkit.create_or_merge_stringsdict_file(self.path, entries)
+        modification_time = os.stat(self.path).st_mtime_ns
+
+        entries = [
+            _entry("first", "%#@count@ files", "count"),
+            _entry("second", "%#@count@ folders", "count"),
+        ]
+        self.assertFalse(localizedstringkit.create_or_merge_stringsdict_file(self.path, entries))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, modification_time)
+
+    def test_binary_output(self) -> None:
+        """Test that the merged file can be written as a binary property list."""
+        entries = [
+            _entry("first", "%#@count@ files", "count"),
+            _entry("second", "%#@count@ folders", "count"),
+        ]
+        with open(self.path, "rb") as stringsdict_file:
+            text_contents = plistlib.load(stringsdict_file)
+
+        self.assertTrue(
+            localizedstringkit.create_or_merge_stringsdict_file(self.path, entries, "binary")
+        )
+
+        with open(self.path, "rb") as stringsdict_file:
+            self.assertTrue(stringsdict_file.read().startswith(b"bplist00"))
+            stringsdict_file.seek(0)
+            self.assertEqual(plistlib.load(stringsdict_file), text_contents)
+
+        # The existing binary file is merged like a text one
+        self.assertFalse(
+            localizedstringkit.create_or_merge_stringsdict_file(self.path, entries, "binary")
+        )
+
+    def test_conflicts_are_reported_together(self) -> None:
+        """Test that every conflicting entry is reported at once."""
+        with open(self.path, "rb") as stringsdict_file:
+            original_contents = stringsdict_file.read()
+
+        with self.assertRaises(StringsDictConflictException) as context:
+            localizedstringkit.create_or_merge_stringsdict_file(
+                self.path,
+                [
+                    _entry("first", "%#@count@ other files", "count"),
+                    _entry("second", "%#@count@ folders", "count", "extra"),
+                ],
+            )
+
+        self.assertEqual(
+            context.exception.conflicts,
+            [
+                "first: value names are inconsistent",
+                "second: variables names are inconsistent",
+            ],
+        )
+
+        with open(self.path, "rb") as stringsdict_file:
+            self.assertEqual(stringsdict_file.read(), original_contents)